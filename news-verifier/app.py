@@ -12,7 +12,12 @@ from modules.searcher import buscar_noticias
 from modules.filters import filtrar_busca, filtrar_scraping
 from modules.scraper import scrape_noticias
 from modules.semantic_analyzer import analisar_semantica
+from modules.dedup import colapsar_duplicatas, expandir_duplicatas
 from modules.scorer import calcular_veracidade
+from modules.cache_janitor import iniciar_janitor
+from modules.cache_warmer import iniciar_aquecedor
+from modules.memory_cache import estatisticas_caches_memoria
+from modules.cache_refresh import obter_revalidador
 from modules.text_validator import validar_qualidade_texto, validar_url              
 import sys
 
@@ -54,6 +59,9 @@ def log_info(message: str = ""):
                                      
 app.config.from_object(Config)
 
+iniciar_janitor()
+iniciar_aquecedor()
+
 
 @app.route('/api/verificar', methods=['POST'])
 def verificar_noticia():
@@ -222,7 +230,14 @@ def verificar_noticia():
 
                                                                          
         log_info(f"Analisando similaridade semântica com IA...")
-        resultado_analise = analisar_semantica(texto_para_analise, resultado_scraping_filtrado)
+        grupos_duplicatas = []
+        conteudos_para_analise = resultado_scraping_filtrado
+        if Config.ENABLE_DEDUP:
+            conteudos_para_analise, grupos_duplicatas = colapsar_duplicatas(resultado_scraping_filtrado)
+            if grupos_duplicatas:
+                log_info(f"   - Cópias quase idênticas colapsadas: {sum(len(g[2]) for g in grupos_duplicatas)}")
+        resultado_analise = analisar_semantica(texto_para_analise, conteudos_para_analise)
+        resultado_analise = expandir_duplicatas(resultado_analise, grupos_duplicatas)
 
         log_info(f"Análise semântica concluída:")
         
@@ -313,7 +328,8 @@ def verificar_noticia():
                 "confirmam_forte": meta_analise['confirmam_forte'],
                 "confirmam_parcial": meta_analise['confirmam_parcial'],
                 "apenas_mencionam": meta_analise['apenas_mencionam'],
-                "nao_relacionados": meta_analise['nao_relacionados']
+                "nao_relacionados": meta_analise['nao_relacionados'],
+                "duplicatas_colapsadas": meta_analise.get('duplicatas_colapsadas', 0)
             },
             "fontes_consultadas": fontes_consultadas[:10],
             "metadata": {
@@ -372,7 +388,9 @@ def health_check():
             "semantic_analyzer (com detecção de contradição)",
             "scorer (com penalidade por contradição)",
             "text_validator (validação de qualidade)"         
-        ]
+        ],
+        "cache_memoria": estatisticas_caches_memoria(),
+        "revalidacao_cache": obter_revalidador().estatisticas()
     }), 200
 
 
@@ -118,6 +118,30 @@ class Config:
     
                                                   
     RETRY_DELAY = 2            
+
+    RETRY_BACKOFF_BASE = 0.5
+
+    RETRY_BACKOFF_MAX = RETRY_DELAY * 2
+
+    MAX_HTML_BYTES = int(os.getenv('MAX_HTML_BYTES', 2_000_000))
+
+    HTML_CONTENT_TYPES = ['text/html', 'application/xhtml+xml']
+
+    ENABLE_PARSE_POOL = os.getenv('ENABLE_PARSE_POOL', 'True').lower() == 'true'
+
+    # Com 1-2 CPUs um único worker serializaria o parsing que as threads de
+    # scraping fazem em paralelo; nesse caso o padrão é extrair na thread (0)
+    PARSE_WORKERS = int(os.getenv(
+        'PARSE_WORKERS', (os.cpu_count() or 1) - 1 if (os.cpu_count() or 1) > 2 else 0
+    ))
+
+    SCRAPE_MAX_WORKERS = int(os.getenv('SCRAPE_MAX_WORKERS', 10))
+
+    SCRAPE_MAX_PER_HOST = int(os.getenv('SCRAPE_MAX_PER_HOST', 2))
+
+    SCRAPE_HOST_LIMITS = {}
+
+    SCRAPE_HOST_MIN_INTERVAL = float(os.getenv('SCRAPE_HOST_MIN_INTERVAL', 0.5))
     
     
                                                                               
@@ -148,6 +172,76 @@ class Config:
     
                                                                  
     SENTENCE_TRANSFORMER_MODEL = "paraphrase-multilingual-mpnet-base-v2"
+
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 32))
+
+    EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'pytorch')
+
+    EMBEDDING_MAX_SEQ_LENGTH = 128
+
+    ONNX_MODEL_DIR = os.path.join('cache', 'onnx')
+
+    ONNX_INTRA_OP_THREADS = int(os.getenv('ONNX_INTRA_OP_THREADS', 0))
+
+    EMBEDDING_SERVER_SOCKET = os.getenv('EMBEDDING_SERVER_SOCKET', '')
+
+    ENABLE_INFERENCE_BATCHER = os.getenv('ENABLE_INFERENCE_BATCHER', 'True').lower() == 'true'
+
+    INFERENCE_BATCH_WAIT_MS = float(os.getenv('INFERENCE_BATCH_WAIT_MS', 5))
+
+    INFERENCE_MAX_BATCH = int(os.getenv('INFERENCE_MAX_BATCH', 64))
+
+    TORCH_NUM_THREADS = int(os.getenv('TORCH_NUM_THREADS', 0))
+
+    TORCH_INTEROP_THREADS = int(os.getenv('TORCH_INTEROP_THREADS', 0))
+
+    ENABLE_EVIDENCE_INDEX = os.getenv('ENABLE_EVIDENCE_INDEX', 'True').lower() == 'true'
+
+    ENABLE_LOCAL_EVIDENCE = os.getenv('ENABLE_LOCAL_EVIDENCE', 'False').lower() == 'true'
+
+    EVIDENCE_INDEX_DIR = os.path.join('cache', 'evidencias')
+
+    EVIDENCE_INDEX_TOP_K = 5
+
+    EVIDENCE_INDEX_MIN_SIMILARITY = 0.45
+
+    EVIDENCE_INDEX_HNSW_M = 16
+
+    EVIDENCE_INDEX_EF_CONSTRUCTION = 200
+
+    EVIDENCE_INDEX_EF_SEARCH = 64
+
+    EVIDENCE_INDEX_SAVE_EVERY = 200
+
+    ENABLE_EMBEDDING_CASCADE = os.getenv('ENABLE_EMBEDDING_CASCADE', 'False').lower() == 'true'
+
+    CASCADE_SMALL_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+    # Cortes na escala do modelo pequeno (a distribuição de similaridades
+    # do MiniLM difere da do mpnet): abaixo de LOW ele decide "não
+    # relacionado", a partir de HIGH decide "confirma forte", e o que fica
+    # entre os dois é pontuado de novo pelo modelo grande.
+    # Com ENABLE_PASSAGE_SCORING ligado a cascata é ignorada (a pontuação por
+    # passagens usa só o modelo grande) e o modelo pequeno nem é carregado.
+    CASCADE_SMALL_LOW = float(os.getenv('CASCADE_SMALL_LOW', 0.20))
+
+    CASCADE_SMALL_HIGH = float(os.getenv('CASCADE_SMALL_HIGH', 0.85))
+
+    ENABLE_PASSAGE_SCORING = os.getenv('ENABLE_PASSAGE_SCORING', 'False').lower() == 'true'
+
+    PASSAGE_MAX_CHARS = 600
+
+    PASSAGES_PER_ARTICLE = 8
+
+    PASSAGE_BUDGET = int(os.getenv('PASSAGE_BUDGET', 96))
+
+    PASSAGE_TOP_K = 2
+
+    ENABLE_DEDUP = os.getenv('ENABLE_DEDUP', 'True').lower() == 'true'
+
+    DEDUP_HAMMING_THRESHOLD = 3
+
+    DEDUP_MIN_WORDS = 40
     
                                                                    
                                                       
@@ -212,7 +306,93 @@ class Config:
     
                               
     CACHE_DB_NAME = 'news_verifier_cache'
-    
+
+    SCRAPE_CACHE_DIR = 'cache_scraping'
+
+    SEARCH_CACHE_DIR = os.path.join('.cache', 'search')
+
+    EMBEDDING_CACHE_DIR = os.path.join('cache', 'embeddings')
+
+    SCRAPE_CACHE_MAX_BYTES = int(os.getenv('SCRAPE_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+
+    SEARCH_CACHE_MAX_BYTES = int(os.getenv('SEARCH_CACHE_MAX_BYTES', 20 * 1024 * 1024))
+
+    EMBEDDING_CACHE_MAX_BYTES = int(os.getenv('EMBEDDING_CACHE_MAX_BYTES', 300 * 1024 * 1024))
+
+    EVIDENCE_INDEX_MAX_BYTES = int(os.getenv('EVIDENCE_INDEX_MAX_BYTES', 100 * 1024 * 1024))
+
+    EMBEDDING_STORE_DTYPE = os.getenv('EMBEDDING_STORE_DTYPE', 'float16')
+
+    URL_ALIASES_FILE = os.path.join('cache', 'url_aliases.json')
+
+    URL_ALIASES_MAX = int(os.getenv('URL_ALIASES_MAX', 20000))
+
+    ENABLE_MEMORY_CACHE = os.getenv('ENABLE_MEMORY_CACHE', 'True').lower() == 'true'
+
+    MEMORY_CACHE_MAX_ENTRIES = int(os.getenv('MEMORY_CACHE_MAX_ENTRIES', 512))
+
+    MEMORY_CACHE_MAX_BYTES = int(os.getenv('MEMORY_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+    ENABLE_CACHE_JANITOR = os.getenv('ENABLE_CACHE_JANITOR', 'True').lower() == 'true'
+
+    CACHE_JANITOR_INTERVAL = int(os.getenv('CACHE_JANITOR_INTERVAL', 600))
+
+    ENABLE_STALE_WHILE_REVALIDATE = os.getenv('ENABLE_STALE_WHILE_REVALIDATE', 'True').lower() == 'true'
+
+    CACHE_STALE_GRACE = int(os.getenv('CACHE_STALE_GRACE', 1800))
+
+    CACHE_REFRESH_PRIORITY = 100
+
+    ENABLE_CACHE_WARMER = os.getenv('ENABLE_CACHE_WARMER', 'False').lower() == 'true'
+
+    CACHE_WARMER_INTERVAL = int(os.getenv('CACHE_WARMER_INTERVAL', 900))
+
+    CACHE_WARMER_BUDGET = int(os.getenv('CACHE_WARMER_BUDGET', 40))
+
+    CACHE_WARMER_MAX_PER_SOURCE = 8
+
+    CACHE_WARMER_PRIORITY = 200
+
+    CACHE_WARMER_EMBEDDINGS = True
+
+
+    ENABLE_EXTRACTION_TEMPLATES = os.getenv('ENABLE_EXTRACTION_TEMPLATES', 'True').lower() == 'true'
+
+    EXTRACTION_TEMPLATES_DIR = os.path.join('cache', 'templates')
+
+    TEMPLATE_MIN_WORDS = 80
+
+    TEMPLATE_MAX_FAILURES = 3
+
+    TEMPLATE_MAX_PER_DOMAIN = 8
+
+    STRUCTURED_DATA_MIN_WORDS = 80
+
+    ENABLE_PAYWALL_STRUCTURED_DATA = os.getenv('ENABLE_PAYWALL_STRUCTURED_DATA', 'True').lower() == 'true'
+
+    SCRAPE_CACHE_COMPRESSION = os.getenv('SCRAPE_CACHE_COMPRESSION', 'zstd')
+
+    SCRAPE_CACHE_COMPRESSION_LEVEL = 10
+
+    ENABLE_ARTICLE_FEATURES = os.getenv('ENABLE_ARTICLE_FEATURES', 'True').lower() == 'true'
+
+    ENABLE_NEGATIVE_CACHE = os.getenv('ENABLE_NEGATIVE_CACHE', 'True').lower() == 'true'
+
+    NEGATIVE_CACHE_TTL = {
+        'http_404': 6 * 3600,
+        'http_410': 24 * 3600,
+        'http_429': 120,
+        'http_4xx': 3600,
+        'http_5xx': 600,
+        'nao_html': 24 * 3600,
+        'url_invalida': 24 * 3600,
+        'dns': 3600,
+        'extracao': 2 * 3600,
+        'timeout': 300,
+        'conexao': 300,
+        'outro': 600,
+    }
+
     
                                                                               
                                              
@@ -435,6 +615,9 @@ def validate_config():
                                         
     if not (0 <= Config.SIMILARITY_THRESHOLD_LOW < Config.SIMILARITY_THRESHOLD_MEDIUM < Config.SIMILARITY_THRESHOLD_HIGH <= 1):
         errors.append("Thresholds de similaridade devem estar em ordem crescente entre 0-1")
+
+    if not (0 < Config.CASCADE_SMALL_LOW < Config.CASCADE_SMALL_HIGH <= 1):
+        errors.append("CASCADE_SMALL_LOW e CASCADE_SMALL_HIGH devem estar em ordem crescente entre 0-1")
     
                                
     if len(Config.TRUSTED_SOURCES) == 0:
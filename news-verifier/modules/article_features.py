@@ -0,0 +1,280 @@
+"""
+article_features.py - Características Pré-computadas das Matérias
+
+Responsabilidade:
+    Cada vez que uma matéria em cache era reutilizada, a análise semântica
+    refazia tudo o que deriva só do texto dela: minúsculas, extração de
+    números, busca dos padrões de desmentido, posições das palavras de
+    negação e a leitura do embedding (.pkl por MD5 do texto).
+
+    Aqui essas características são calculadas uma vez, quando a matéria é
+    salva no cache de scraping, e gravadas ao lado dela (endereçadas pelo
+    mesmo SHA-256 do texto usado em cache_storage.py). Na primeira análise
+    (o modelo só é carregado nessa etapa) o registro ganha a referência do
+    embedding - id do modelo + MD5 no embedding_store.py -, e não uma cópia
+    do vetor.
+
+Estrutura:
+    <SCRAPE_CACHE_DIR>/features/<2 primeiros hex>/<sha256>.json.gz
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import gzip
+import json
+import os
+import re
+import tempfile
+import threading
+
+from config import Config
+from modules.cache_storage import hash_conteudo, marcar_uso
+from modules.memory_cache import obter_cache_memoria
+
+
+VERSAO_FEATURES = 1
+
+
+STRONG_NEGATION_WORDS = [
+    'não', 'nao', 'nunca', 'jamais', 'nenhum', 'nenhuma',
+    'falso', 'falsa', 'mentira', 'fake', 'desmentido', 'desmente',
+    'incorreto', 'incorreta', 'errado', 'errada',
+    'boato', 'desinformação', 'fake news'
+]
+
+
+STRONG_DEBUNK_PATTERNS = [
+    r'é\s+falso\s+que',
+    r'não\s+é\s+verdade\s+que',
+    r'checagem.*conclu[ií].*falso',
+    r'fact.*check.*falso',
+    r'desmente.*completamente',
+    r'totalmente\s+falso',
+    r'não\s+há\s+nenhuma\s+evidência',
+    r'completamente\s+sem\s+fundamento',
+    r'boato\s+que\s+circula'
+]
+
+_PADROES_DESMENTIDO = [re.compile(padrao) for padrao in STRONG_DEBUNK_PATTERNS]
+
+_EXTENSAO = '.json.gz'
+
+
+def extrair_numeros(texto):
+    """
+    Extrai números do texto para comparação.
+    Exemplo: "R$ 1.631" → 1631.0
+    """
+
+    numeros = re.findall(r'[\d]+[.,]?[\d]*', texto.replace('.', '').replace(',', '.'))
+    return [float(n.replace(',', '.')) for n in numeros if n]
+
+
+def posicoes_termo(texto, termo):
+    """
+    Todas as posições (inclusive sobrepostas) de `termo` em `texto`.
+
+    Returns:
+        list: Índices de início
+    """
+    posicoes = []
+    inicio = texto.find(termo)
+    while inicio != -1:
+        posicoes.append(inicio)
+        inicio = texto.find(termo, inicio + 1)
+    return posicoes
+
+
+def calcular_features(texto):
+    """
+    Características de uma matéria que dependem apenas do seu texto.
+
+    Args:
+        texto (str): Texto da matéria
+
+    Returns:
+        dict: versao, texto_normalizado, numeros, desmentidos (primeiro
+              trecho de cada padrão encontrado, na ordem dos padrões),
+              negacoes (palavra → posições no texto normalizado) e
+              embedding (referência, None até a primeira análise)
+    """
+    texto = texto or ''
+    normalizado = texto.lower()
+
+    desmentidos = []
+    for padrao in _PADROES_DESMENTIDO:
+        encontrado = padrao.search(normalizado)
+        if encontrado:
+            desmentidos.append(encontrado.group(0))
+
+    negacoes = {}
+    for negacao in STRONG_NEGATION_WORDS:
+        posicoes = posicoes_termo(normalizado, negacao)
+        if posicoes:
+            negacoes[negacao] = posicoes
+
+    return {
+        'versao': VERSAO_FEATURES,
+        'texto_normalizado': normalizado,
+        'numeros': extrair_numeros(texto),
+        'desmentidos': desmentidos,
+        'negacoes': negacoes,
+        'embedding': None
+    }
+
+
+def referencia_embedding(features, modelo):
+    """
+    Returns:
+        bytes ou None: Chave do embedding de `modelo` no embedding_store.py
+            (registros antigos, com o vetor embutido, não têm referência)
+    """
+    dados = (features or {}).get('embedding')
+    if not dados or dados.get('modelo') != modelo or not dados.get('chave'):
+        return None
+    return bytes.fromhex(dados['chave'])
+
+
+class ArmazenamentoFeatures:
+    """
+    Registros de características (JSON comprimido) endereçados pelo
+    SHA-256 do texto, com uma camada LRU em memória na frente do disco.
+    """
+
+    def __init__(self, diretorio=None):
+        """
+        Args:
+            diretorio (str): Pasta dos registros (padrão <SCRAPE_CACHE_DIR>/features)
+        """
+        self.diretorio = diretorio or os.path.join(Config.SCRAPE_CACHE_DIR, 'features')
+        self.memoria = obter_cache_memoria(os.path.abspath(self.diretorio))
+
+
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave[:2], f"{chave}{_EXTENSAO}")
+
+
+    def obter(self, chave):
+        """
+        Returns:
+            dict ou None: Registro da matéria (None se ausente ou de outra versão)
+        """
+        if self.memoria:
+            features = self.memoria.obter(chave)
+            if features is not None:
+                return features
+
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, 'rb') as f:
+                features = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+
+        if features.get('versao') != VERSAO_FEATURES:
+            return None
+        marcar_uso(caminho)
+        if self.memoria:
+            self.memoria.guardar(chave, features)
+        return features
+
+
+    def guardar(self, chave, features):
+        """Grava (ou substitui) um registro com escrita atômica."""
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'wb') as f:
+                f.write(gzip.compress(json.dumps(features, ensure_ascii=False).encode('utf-8'), compresslevel=6))
+            os.replace(temporario, caminho)
+        except Exception:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        if self.memoria:
+            self.memoria.guardar(chave, features)
+
+
+    def calcular_se_ausente(self, texto, chave=None):
+        """
+        Registro de um texto, calculando e gravando se ainda não existir.
+
+        Args:
+            texto (str): Texto da matéria
+            chave (str): hash_conteudo(texto), se já conhecido
+
+        Returns:
+            tuple: (chave, features)
+        """
+        chave = chave or hash_conteudo(texto)
+        features = self.obter(chave)
+        if features is None:
+            features = calcular_features(texto)
+            self.guardar(chave, features)
+        return chave, features
+
+
+    def anexar_embedding(self, chave, features, chave_embedding, modelo):
+        """
+        Grava no registro a referência do embedding (feito na primeira
+        análise da matéria; o vetor fica só no embedding_store.py).
+
+        Args:
+            chave (str): Hash do registro
+            features (dict): Registro atual
+            chave_embedding (bytes): embedding_store.chave_embedding() do texto
+            modelo (str): Id do espaço de embeddings
+
+        Returns:
+            dict: Registro atualizado
+        """
+        features = dict(features)
+        features['embedding'] = {'modelo': modelo, 'chave': chave_embedding.hex()}
+        self.guardar(chave, features)
+        return features
+
+
+    def remover(self, chave):
+        """Apaga um registro."""
+        if self.memoria:
+            self.memoria.invalidar(chave)
+        try:
+            os.remove(self._caminho(chave))
+        except FileNotFoundError:
+            pass
+
+
+    def listar(self):
+        """
+        Yields:
+            tuple: (hash, caminho)
+        """
+        if not os.path.isdir(self.diretorio):
+            return
+        for prefixo in os.listdir(self.diretorio):
+            pasta = os.path.join(self.diretorio, prefixo)
+            if not os.path.isdir(pasta):
+                continue
+            for nome in os.listdir(pasta):
+                if nome.endswith(_EXTENSAO):
+                    yield nome[:-len(_EXTENSAO)], os.path.join(pasta, nome)
+
+
+
+
+_armazenamento = None
+_armazenamento_lock = threading.Lock()
+
+
+def obter_armazenamento_features():
+    """Retorna o armazenamento de características do cache de scraping."""
+    global _armazenamento
+
+    if _armazenamento is None:
+        with _armazenamento_lock:
+            if _armazenamento is None:
+                _armazenamento = ArmazenamentoFeatures()
+
+    return _armazenamento
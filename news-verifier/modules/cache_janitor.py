@@ -0,0 +1,469 @@
+"""
+cache_janitor.py - Limpeza e Orçamento de Disco dos Caches
+
+Responsabilidade:
+    Os caches em disco (scraping, busca, embeddings e o índice de
+    evidências) só ignoravam entradas
+    vencidas na leitura; nada era apagado e os diretórios cresciam sem
+    limite em servidores de longa duração. Este módulo:
+    - Remove entradas expiradas
+    - Remove objetos de conteúdo (e registros de características) que
+      nenhuma URL referencia mais
+    - Aplica um orçamento de bytes por diretório, despejando as entradas
+      usadas há mais tempo (LRU pelo mtime, atualizado em cada leitura)
+    - Compacta o índice de evidências, tirando as matérias que já saíram
+      do cache de scraping
+    - Roda periodicamente numa thread em segundo plano
+    - Oferece uma CLI para inspecionar e compactar os caches
+
+Uso (CLI):
+    python -m modules.cache_janitor status
+    python -m modules.cache_janitor limpar --cache scraping
+    python -m modules.cache_janitor compactar --max-bytes 50000000
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config import Config
+from modules.cache_storage import ArmazenamentoConteudo
+from modules.article_features import ArmazenamentoFeatures
+from modules.embedding_store import listar_armazenamentos
+from modules.evidence_index import listar_indices
+from modules.cache_refresh import expiracao_definitiva
+
+
+CARENCIA_SEGUNDOS = 60
+
+# Arquivos de entrada de cada tipo de cache ('embeddings': pickles legados;
+# as matrizes de embedding_store.py são tratadas à parte)
+_EXTENSOES = {
+    'json': '.json',
+    'embeddings': '.pkl',
+    'evidencias': None,
+}
+
+
+def caches_configurados():
+    """
+    Caches conhecidos e seus orçamentos.
+
+    Returns:
+        dict: nome → {'diretorio', 'max_bytes', 'tipo'}
+    """
+    return {
+        'scraping': {
+            'diretorio': Config.SCRAPE_CACHE_DIR,
+            'max_bytes': Config.SCRAPE_CACHE_MAX_BYTES,
+            'tipo': 'json'
+        },
+        'busca': {
+            'diretorio': Config.SEARCH_CACHE_DIR,
+            'max_bytes': Config.SEARCH_CACHE_MAX_BYTES,
+            'tipo': 'json'
+        },
+        'embeddings': {
+            'diretorio': Config.EMBEDDING_CACHE_DIR,
+            'max_bytes': Config.EMBEDDING_CACHE_MAX_BYTES,
+            'tipo': 'embeddings'
+        },
+        'evidencias': {
+            'diretorio': Config.EVIDENCE_INDEX_DIR,
+            'max_bytes': Config.EVIDENCE_INDEX_MAX_BYTES,
+            'tipo': 'evidencias'
+        },
+    }
+
+
+def _ler_json(caminho):
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _expirado(dados, agora):
+    """
+    Aplica as regras de validade dos três formatos de entrada JSON.
+    Entradas com timestamp só saem após a janela de stale-while-revalidate.
+    """
+    if not isinstance(dados, dict):
+        return True
+    if 'expira_em' in dados:
+        return agora >= dados['expira_em']
+    criado = dados.get('timestamp', dados.get('_ts'))
+    if criado is None:
+        return False
+    return (agora - criado) > expiracao_definitiva()
+
+
+def _no_cache_scraping(item, agora):
+    """
+    Matéria do índice de evidências que ainda tem entrada no cache de
+    scraping (mesma chave de ScraperCache._gerar_chave) ou foi indexada
+    há pouco.
+    """
+    if agora - item.get('timestamp', 0) <= CARENCIA_SEGUNDOS:
+        return True
+    nome = hashlib.md5(item['chave'].encode()).hexdigest() + '.json'
+    return os.path.exists(os.path.join(Config.SCRAPE_CACHE_DIR, nome))
+
+
+def _remover(caminho):
+    try:
+        os.remove(caminho)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class CacheEmDisco:
+    """
+    Visão de manutenção sobre um diretório de cache.
+    No tipo 'json' as entradas carregam validade; no tipo 'embeddings' os
+    .pkl legados só saem por LRU, e as matrizes de embedding_store.py são
+    compactadas mantendo os vetores mais recentes quando o orçamento estoura.
+    No tipo 'evidencias' os índices de evidence_index.py perdem as matérias
+    que saíram do cache de scraping e, se preciso, as mais antigas.
+    """
+
+    def __init__(self, nome, diretorio, max_bytes, tipo='json'):
+        """
+        Args:
+            nome (str): Nome do cache (para relatórios)
+            diretorio (str): Pasta do cache
+            max_bytes (int): Orçamento de disco (0 = sem limite)
+            tipo (str): 'json' (scraping, busca), 'embeddings' ou 'evidencias'
+        """
+        self.nome = nome
+        self.diretorio = diretorio
+        self.max_bytes = max_bytes
+        self.tipo = tipo
+        self.extensao = _EXTENSOES[tipo]
+        self.objetos = ArmazenamentoConteudo(os.path.join(diretorio, 'objetos'))
+        self.features = ArmazenamentoFeatures(os.path.join(diretorio, 'features'))
+
+
+    def _entradas(self):
+        """
+        Lista as entradas (índices e cache negativo, sem os objetos).
+
+        Returns:
+            list: [(caminho, bytes, mtime)]
+        """
+        entradas = []
+        if self.extensao is None:
+            return entradas
+        for pasta in (self.diretorio, os.path.join(self.diretorio, 'falhas')):
+            if not os.path.isdir(pasta):
+                continue
+            for nome in os.listdir(pasta):
+                caminho = os.path.join(pasta, nome)
+                if not nome.endswith(self.extensao) or not os.path.isfile(caminho):
+                    continue
+                try:
+                    info = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+                entradas.append((caminho, info.st_size, info.st_mtime))
+        return entradas
+
+
+    def _objetos(self, armazenamento=None):
+        """
+        Args:
+            armazenamento: self.objetos (padrão) ou self.features
+
+        Returns:
+            dict: hash → (caminho, bytes, mtime)
+        """
+        objetos = {}
+        for chave, caminho in (armazenamento or self.objetos).listar():
+            try:
+                info = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            objetos[chave] = (caminho, info.st_size, info.st_mtime)
+        return objetos
+
+
+    def _temporarios(self):
+        """Arquivos .tmp esquecidos por gravações interrompidas."""
+        encontrados = []
+        for raiz, _, nomes in os.walk(self.diretorio):
+            encontrados.extend(os.path.join(raiz, n) for n in nomes if n.endswith('.tmp'))
+        return encontrados
+
+
+    def status(self):
+        """
+        Resumo do cache sem alterar nada.
+
+        Returns:
+            dict: entradas, expiradas, objetos, órfãos, bytes e orçamento
+        """
+        agora = time.time()
+        entradas = self._entradas()
+        objetos = self._objetos()
+        referencias = set()
+        expiradas = 0
+        legadas = 0
+
+        for caminho, _, _ in entradas:
+            if self.tipo != 'json':
+                continue
+            dados = _ler_json(caminho)
+            if _expirado(dados, agora):
+                expiradas += 1
+            elif isinstance(dados, dict):
+                if dados.get('texto_ref'):
+                    referencias.add(dados['texto_ref'])
+                elif (dados.get('conteudo') or {}).get('texto'):
+                    legadas += 1
+
+        bytes_matrizes = 0
+        if self.tipo == 'embeddings':
+            bytes_matrizes = sum(a.tamanho_bytes() for a in listar_armazenamentos(self.diretorio))
+        itens_indice = 0
+        if self.tipo == 'evidencias':
+            indices = listar_indices(self.diretorio)
+            bytes_matrizes = sum(i.tamanho_bytes() for i in indices)
+            itens_indice = sum(len(i) for i in indices)
+
+        mtimes = [mtime for _, _, mtime in entradas]
+        return {
+            'cache': self.nome,
+            'diretorio': self.diretorio,
+            'entradas': len(entradas) + itens_indice,
+            'expiradas': expiradas,
+            'legadas': legadas,
+            'objetos': len(objetos),
+            'orfaos': len(set(objetos) - referencias) if self.tipo == 'json' else 0,
+            'bytes': sum(b for _, b, _ in entradas) + sum(o[1] for o in objetos.values()) + bytes_matrizes,
+            'max_bytes': self.max_bytes,
+            'mais_antiga': min(mtimes) if mtimes else None,
+            'mais_recente': max(mtimes) if mtimes else None
+        }
+
+
+    def limpar(self, max_bytes=None):
+        """
+        Remove expirados e órfãos e aplica o orçamento de bytes (LRU).
+
+        Args:
+            max_bytes (int): Sobrescreve o orçamento configurado
+
+        Returns:
+            dict: Contadores da limpeza
+        """
+        orcamento = self.max_bytes if max_bytes is None else max_bytes
+        agora = time.time()
+        relatorio = {'cache': self.nome, 'expiradas': 0, 'lru': 0, 'orfaos': 0, 'temporarios': 0}
+
+        for caminho in self._temporarios():
+            if agora - os.path.getmtime(caminho) > 3600 and _remover(caminho):
+                relatorio['temporarios'] += 1
+
+        vivas = []
+        referencias = {}
+        for caminho, tamanho, mtime in self._entradas():
+            referencia = None
+            if self.tipo == 'json':
+                dados = _ler_json(caminho)
+                if agora - mtime > CARENCIA_SEGUNDOS and _expirado(dados, agora):
+                    if _remover(caminho):
+                        relatorio['expiradas'] += 1
+                    continue
+                referencia = (dados or {}).get('texto_ref')
+                if referencia:
+                    referencias[referencia] = referencias.get(referencia, 0) + 1
+            vivas.append((mtime, caminho, tamanho, referencia))
+
+        objetos = self._objetos()
+        features = self._objetos(self.features)
+        if self.tipo == 'json':
+            for armazenamento, arquivos in ((self.objetos, objetos), (self.features, features)):
+                for chave in set(arquivos) - set(referencias):
+                    if agora - arquivos[chave][2] <= CARENCIA_SEGUNDOS:
+                        continue
+                    armazenamento.remover(chave)
+                    arquivos.pop(chave)
+                    relatorio['orfaos'] += 1
+
+        total = (sum(t for _, _, t, _ in vivas) + sum(o[1] for o in objetos.values())
+                 + sum(f[1] for f in features.values()))
+        matrizes = listar_armazenamentos(self.diretorio) if self.tipo == 'embeddings' else []
+        total += sum(a.tamanho_bytes() for a in matrizes)
+
+        if self.tipo == 'evidencias':
+            indices = listar_indices(self.diretorio)
+            total += sum(i.tamanho_bytes() for i in indices)
+            for indice in indices:
+                antes = indice.tamanho_bytes()
+                limite = max(antes - (total - orcamento), 0) if orcamento and total > orcamento else None
+                compactado = indice.compactar(
+                    manter=(lambda item: _no_cache_scraping(item, agora)) if Config.ENABLE_CACHE else None,
+                    max_bytes=limite
+                )
+                relatorio['orfaos'] += compactado['removidos']
+                relatorio['lru'] += compactado['lru']
+                total -= antes - compactado['bytes']
+
+        if orcamento:
+            vivas.sort()
+            for _, caminho, tamanho, referencia in vivas:
+                if total <= orcamento:
+                    break
+                if not _remover(caminho):
+                    continue
+                relatorio['lru'] += 1
+                total -= tamanho
+                if referencia:
+                    referencias[referencia] -= 1
+                    if referencias[referencia] <= 0 and referencia in objetos:
+                        self.objetos.remover(referencia)
+                        total -= objetos.pop(referencia)[1]
+                    if referencias[referencia] <= 0 and referencia in features:
+                        self.features.remover(referencia)
+                        total -= features.pop(referencia)[1]
+
+            for armazenamento in matrizes:
+                if total <= orcamento:
+                    break
+                antes = armazenamento.tamanho_bytes()
+                compactado = armazenamento.compactar(max(antes - (total - orcamento), 0))
+                relatorio['lru'] += compactado['removidos']
+                total -= antes - compactado['bytes']
+
+        relatorio['bytes'] = total
+        return relatorio
+
+
+    def compactar(self, max_bytes=None):
+        """
+        Migra entradas legadas (texto embutido no JSON) para objetos
+        comprimidos e depois executa limpar().
+
+        Returns:
+            dict: Relatório de limpar() com o campo 'migradas'
+        """
+        migradas = 0
+        if self.tipo == 'json':
+            for caminho, _, mtime in self._entradas():
+                dados = _ler_json(caminho)
+                conteudo = (dados or {}).get('conteudo') or {}
+                if not conteudo.get('texto') or dados.get('texto_ref'):
+                    continue
+                dados['texto_ref'] = self.objetos.guardar(conteudo.pop('texto'))
+                temporario = caminho + '.tmp'
+                with open(temporario, 'w', encoding='utf-8') as f:
+                    json.dump(dados, f, ensure_ascii=False)
+                os.replace(temporario, caminho)
+                os.utime(caminho, (mtime, mtime))
+                migradas += 1
+
+        relatorio = self.limpar(max_bytes)
+        relatorio['migradas'] = migradas
+        return relatorio
+
+
+
+
+def obter_caches(nome=None):
+    """
+    Args:
+        nome (str): 'scraping', 'busca', 'embeddings', 'evidencias' ou None/'todos'
+
+    Returns:
+        list: Instâncias de CacheEmDisco
+    """
+    configurados = caches_configurados()
+    nomes = list(configurados) if nome in (None, 'todos') else [nome]
+    return [CacheEmDisco(n, **configurados[n]) for n in nomes]
+
+
+def limpar_caches():
+    """Executa limpar() em todos os caches configurados."""
+    relatorios = []
+    for cache in obter_caches():
+        try:
+            relatorios.append(cache.limpar())
+        except Exception as e:
+            print(f"  Erro na limpeza do cache {cache.nome}: {e}")
+    return relatorios
+
+
+_janitor = None
+_janitor_lock = threading.Lock()
+
+
+def _executar_janitor(intervalo, parar):
+    while not parar.wait(intervalo):
+        limpar_caches()
+
+
+def iniciar_janitor(intervalo=None):
+    """
+    Inicia (uma vez por processo) a thread que limpa os caches a cada
+    Config.CACHE_JANITOR_INTERVAL segundos.
+
+    Returns:
+        threading.Event ou None: Evento para parar a thread (None se desativado)
+    """
+    global _janitor
+
+    if not Config.ENABLE_CACHE_JANITOR:
+        return None
+
+    with _janitor_lock:
+        if _janitor is None:
+            parar = threading.Event()
+            thread = threading.Thread(
+                target=_executar_janitor,
+                args=(intervalo or Config.CACHE_JANITOR_INTERVAL, parar),
+                name="cache-janitor",
+                daemon=True
+            )
+            thread.start()
+            _janitor = parar
+
+    return _janitor
+
+
+def _formatar_bytes(valor):
+    for unidade in ('B', 'KB', 'MB', 'GB'):
+        if valor < 1024 or unidade == 'GB':
+            return f"{valor:.1f} {unidade}" if unidade != 'B' else f"{valor} B"
+        valor /= 1024
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspeciona e compacta os caches em disco.")
+    parser.add_argument('acao', choices=['status', 'limpar', 'compactar'])
+    parser.add_argument('--cache', default='todos', choices=['todos', *caches_configurados()])
+    parser.add_argument('--max-bytes', type=int, default=None,
+                        help="Orçamento de bytes desta execução (padrão: Config)")
+    args = parser.parse_args(argv)
+
+    for cache in obter_caches(args.cache):
+        if args.acao == 'status':
+            info = cache.status()
+            print(f"{info['cache']:<11} {info['diretorio']}")
+            print(f"   entradas: {info['entradas']} ({info['expiradas']} expiradas, {info['legadas']} legadas)")
+            print(f"   objetos:  {info['objetos']} ({info['orfaos']} órfãos)")
+            print(f"   disco:    {_formatar_bytes(info['bytes'])} / {_formatar_bytes(info['max_bytes'])}")
+        else:
+            relatorio = cache.compactar(args.max_bytes) if args.acao == 'compactar' else cache.limpar(args.max_bytes)
+            print(f"{cache.nome:<11} {relatorio}")
+
+
+if __name__ == "__main__":
+    main()
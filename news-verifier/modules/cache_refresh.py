@@ -0,0 +1,140 @@
+"""
+cache_refresh.py - Revalidação em Segundo Plano (stale-while-revalidate)
+
+Responsabilidade:
+    Quando uma entrada de cache (busca ou scraping) passa de
+    Config.CACHE_EXPIRATION mas ainda está dentro de Config.CACHE_STALE_GRACE,
+    o chamador recebe o valor antigo na hora e a atualização é feita em
+    segundo plano. Só entradas além da janela de tolerância bloqueiam.
+
+    As atualizações vão para o agendador global de scraping com prioridade
+    baixa (nunca passam na frente de uma verificação em andamento) e são
+    deduplicadas por chave: várias leituras da mesma entrada antiga geram
+    uma única atualização.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import threading
+
+from config import Config
+from modules.scrape_scheduler import obter_scrape_scheduler
+
+
+def dentro_da_tolerancia(idade):
+    """
+    Indica se uma entrada vencida ainda pode ser servida.
+
+    Args:
+        idade (float): Segundos desde a gravação
+
+    Returns:
+        bool: True se idade está entre CACHE_EXPIRATION e
+              CACHE_EXPIRATION + CACHE_STALE_GRACE
+    """
+    if not Config.ENABLE_STALE_WHILE_REVALIDATE:
+        return False
+    return Config.CACHE_EXPIRATION < idade <= Config.CACHE_EXPIRATION + Config.CACHE_STALE_GRACE
+
+
+def expiracao_definitiva():
+    """Idade (s) a partir da qual a entrada não serve mais para nada."""
+    if not Config.ENABLE_STALE_WHILE_REVALIDATE:
+        return Config.CACHE_EXPIRATION
+    return Config.CACHE_EXPIRATION + Config.CACHE_STALE_GRACE
+
+
+class Revalidador:
+    """
+    Agenda atualizações de cache sem repetir chaves já em andamento.
+    """
+
+    def __init__(self, scheduler=None, prioridade=None):
+        """
+        Args:
+            scheduler (ScrapeScheduler): Onde executar (padrão: agendador global)
+            prioridade (int): Prioridade das atualizações (padrão Config.CACHE_REFRESH_PRIORITY)
+        """
+        self.scheduler = scheduler
+        self.prioridade = Config.CACHE_REFRESH_PRIORITY if prioridade is None else prioridade
+        self._em_andamento = set()
+        self._lock = threading.Lock()
+        self.agendadas = 0
+        self.ignoradas = 0
+        self.falhas = 0
+
+
+    def agendar(self, chave, funcao, host=None):
+        """
+        Agenda `funcao()` para atualizar a entrada `chave`.
+
+        Args:
+            chave (str): Identificador da entrada (deduplicação)
+            funcao (callable): Atualização (sem argumentos)
+            host (str): Host para a cortesia/limite do agendador
+
+        Returns:
+            bool: True se agendou; False se a chave já estava em andamento
+        """
+        with self._lock:
+            if chave in self._em_andamento:
+                self.ignoradas += 1
+                return False
+            self._em_andamento.add(chave)
+            self.agendadas += 1
+
+        scheduler = self.scheduler or obter_scrape_scheduler()
+        try:
+            futuro = scheduler.submeter(funcao, host=host, prioridade=self.prioridade)
+        except RuntimeError:
+            self._concluir(chave, None)
+            return False
+
+        futuro.add_done_callback(lambda f: self._concluir(chave, f))
+        return True
+
+
+    def _concluir(self, chave, futuro):
+        with self._lock:
+            self._em_andamento.discard(chave)
+            if futuro is not None and not futuro.cancelled() and futuro.exception() is not None:
+                self.falhas += 1
+                print(f"  Falha ao revalidar cache ({chave[:40]}): {futuro.exception()}")
+
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: em_andamento, agendadas, ignoradas (deduplicadas), falhas
+        """
+        with self._lock:
+            return {
+                'em_andamento': len(self._em_andamento),
+                'agendadas': self.agendadas,
+                'ignoradas': self.ignoradas,
+                'falhas': self.falhas
+            }
+
+
+
+
+_revalidador = None
+_revalidador_lock = threading.Lock()
+
+
+def obter_revalidador():
+    """Retorna o revalidador compartilhado do processo."""
+    global _revalidador
+
+    if _revalidador is None:
+        with _revalidador_lock:
+            if _revalidador is None:
+                _revalidador = Revalidador()
+
+    return _revalidador
+
+
+def agendar_revalidacao(chave, funcao, host=None):
+    """Atalho para obter_revalidador().agendar()."""
+    return obter_revalidador().agendar(chave, funcao, host=host)
@@ -0,0 +1,186 @@
+"""
+cache_storage.py - Armazenamento Comprimido e Endereçado por Conteúdo
+
+Responsabilidade:
+    Guardar os textos das notícias extraídas uma única vez, identificados
+    pelo SHA-256 do próprio conteúdo. Matérias sindicalizadas (a mesma
+    reportagem publicada em várias URLs) passam a ocupar um só arquivo,
+    referenciado pelas várias entradas de URL do ScraperCache.
+
+    Os objetos são comprimidos com zstd (pacote `zstandard`) ou, na falta
+    dele, gzip. A extensão do arquivo indica o codec, então objetos antigos
+    continuam legíveis se a configuração mudar.
+
+Estrutura:
+    <diretorio>/<2 primeiros hex>/<sha256>.zst | .gz
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+
+from config import Config
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+_EXTENSOES = {'zstd': '.zst', 'gzip': '.gz'}
+
+
+def hash_conteudo(texto):
+    """
+    Endereço de um conteúdo (SHA-256 hex do texto em UTF-8).
+
+    Args:
+        texto (str): Conteúdo
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+def marcar_uso(*caminhos):
+    """
+    Atualiza o mtime dos arquivos lidos. O cache_janitor usa o mtime como
+    "último uso" para o despejo LRU.
+    """
+    for caminho in caminhos:
+        try:
+            os.utime(caminho)
+        except OSError:
+            pass
+
+
+def _comprimir(dados, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=Config.SCRAPE_CACHE_COMPRESSION_LEVEL).compress(dados)
+    return gzip.compress(dados, compresslevel=6)
+
+
+def _descomprimir(dados, extensao):
+    if extensao == '.zst':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("objeto zstd no cache, mas o pacote zstandard não está instalado")
+        return zstandard.ZstdDecompressor().decompress(dados)
+    return gzip.decompress(dados)
+
+
+class ArmazenamentoConteudo:
+    """
+    Repositório de textos comprimidos endereçados pelo SHA-256.
+    Gravações são atômicas (arquivo temporário + os.replace), então pode
+    ser usado por várias threads e processos ao mesmo tempo.
+    """
+
+    def __init__(self, diretorio, compressao=None):
+        """
+        Args:
+            diretorio (str): Pasta dos objetos
+            compressao (str): 'zstd' ou 'gzip' (padrão Config.SCRAPE_CACHE_COMPRESSION;
+                zstd cai para gzip se o pacote não estiver instalado)
+        """
+        self.diretorio = diretorio
+        codec = (compressao or Config.SCRAPE_CACHE_COMPRESSION).lower()
+        if codec not in _EXTENSOES or (codec == 'zstd' and not ZSTD_AVAILABLE):
+            codec = 'gzip'
+        self.codec = codec
+
+
+    def _caminho(self, chave, extensao):
+        return os.path.join(self.diretorio, chave[:2], f"{chave}{extensao}")
+
+
+    def localizar(self, chave):
+        """
+        Returns:
+            str ou None: Caminho do objeto (qualquer codec) ou None
+        """
+        for extensao in _EXTENSOES.values():
+            caminho = self._caminho(chave, extensao)
+            if os.path.exists(caminho):
+                return caminho
+        return None
+
+
+    def guardar(self, texto):
+        """
+        Guarda um texto (se ainda não existir) e retorna seu endereço.
+        Um objeto já existente conta como usado agora, para que o janitor
+        não o despeje logo depois de uma nova URL passar a apontar para ele.
+
+        Args:
+            texto (str): Conteúdo
+
+        Returns:
+            str: Hash SHA-256 usado como referência
+        """
+        chave = hash_conteudo(texto)
+        existente = self.localizar(chave)
+        if existente:
+            marcar_uso(existente)
+            return chave
+
+        caminho = self._caminho(chave, _EXTENSOES[self.codec])
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'wb') as f:
+                f.write(_comprimir(texto.encode('utf-8'), self.codec))
+            os.replace(temporario, caminho)
+        except Exception:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+        return chave
+
+
+    def ler(self, chave):
+        """
+        Lê e descomprime um objeto.
+
+        Returns:
+            str ou None: Texto ou None se o objeto não existir
+        """
+        caminho = self.localizar(chave)
+        if not caminho:
+            return None
+        with open(caminho, 'rb') as f:
+            dados = f.read()
+        marcar_uso(caminho)
+        return _descomprimir(dados, os.path.splitext(caminho)[1]).decode('utf-8')
+
+
+    def remover(self, chave):
+        """Apaga um objeto (todas as variantes de codec)."""
+        for extensao in _EXTENSOES.values():
+            caminho = self._caminho(chave, extensao)
+            if os.path.exists(caminho):
+                os.remove(caminho)
+
+
+    def listar(self):
+        """
+        Percorre os objetos guardados.
+
+        Yields:
+            tuple: (hash, caminho)
+        """
+        if not os.path.isdir(self.diretorio):
+            return
+        for prefixo in os.listdir(self.diretorio):
+            pasta = os.path.join(self.diretorio, prefixo)
+            if not os.path.isdir(pasta):
+                continue
+            for nome in os.listdir(pasta):
+                chave, extensao = os.path.splitext(nome)
+                if extensao in _EXTENSOES.values():
+                    yield chave, os.path.join(pasta, nome)
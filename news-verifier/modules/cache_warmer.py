@@ -0,0 +1,319 @@
+"""
+cache_warmer.py - Aquecimento do Cache com as Matérias em Destaque
+
+Responsabilidade:
+    A carga segue o ciclo de notícias: quando algo acontece, centenas de
+    verificações sobre o mesmo assunto chegam em poucos minutos e todas
+    encontram o cache de scraping frio.
+
+    O aquecedor lê periodicamente a página inicial (e a seção "mais lidas",
+    quando encontrada nela) de cada fonte em Config.TRUSTED_SOURCES, extrai
+    as matérias novas pelo NewsScraper e pré-calcula seus embeddings
+    (incluindo-as no índice de evidências locais).
+
+    Para não competir com as verificações em andamento:
+    - Cada ciclo tem um orçamento de requisições (páginas + matérias)
+    - Tudo passa pelo agendador global com prioridade baixa, respeitando
+      os limites e o intervalo por host
+    - O ciclo é adiado se o agendador já tem fila
+
+Uso (CLI):
+    python -m modules.cache_warmer
+    python -m modules.cache_warmer --fonte G1 --orcamento 10
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import argparse
+import re
+import threading
+import unicodedata
+from urllib.parse import urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+from config import Config
+from modules.fetcher import baixar_html
+from modules.scraper import NewsScraper
+from modules.scrape_scheduler import host_da_url
+from modules.url_canonical import chave_url, dominio_base
+
+
+_TEXTO_MAIS_LIDAS = ('mais lidas', 'mais lidos', 'mais vistas', 'mais acessadas', 'most read')
+_CAMINHO_MAIS_LIDAS = ('mais-lidas', 'mais-lidos', 'maislidas', 'mais-vistas', 'most-read')
+_SEGMENTOS_IGNORADOS = {
+    'busca', 'search', 'tag', 'tags', 'autor', 'autores', 'author', 'topicos',
+    'login', 'assinatura', 'assine', 'newsletter', 'podcast', 'podcasts',
+    'video', 'videos', 'ao-vivo', 'feed', 'rss'
+}
+_EXTENSOES_MATERIA = ('.ghtml', '.html', '.htm', '.shtml')
+
+
+def _normalizar(texto):
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'\s+', ' ', texto).strip().lower()
+
+
+def parece_materia(url, dominio):
+    """
+    Heurística para separar matérias de seções, tags e páginas de serviço.
+
+    Args:
+        url (str): URL absoluta
+        dominio (str): Domínio da fonte
+
+    Returns:
+        bool: True se a URL parece uma matéria da fonte
+    """
+    partes = urlsplit(url)
+    if partes.scheme not in ('http', 'https'):
+        return False
+    if dominio_base(partes.hostname or '') != dominio_base(dominio):
+        return False
+
+    segmentos = [s for s in partes.path.lower().split('/') if s]
+    if not segmentos or _SEGMENTOS_IGNORADOS & set(segmentos):
+        return False
+
+    ultimo = segmentos[-1]
+    if ultimo.endswith(_EXTENSOES_MATERIA):
+        return True
+    return len(segmentos) >= 2 and ultimo.count('-') >= 3
+
+
+def extrair_links(html, url_pagina, dominio):
+    """
+    Matérias e link da seção "mais lidas" de uma página de capa.
+
+    Args:
+        html (str): HTML da página
+        url_pagina (str): URL da página (para links relativos)
+        dominio (str): Domínio da fonte
+
+    Returns:
+        tuple: (lista de {'url', 'title', 'snippet'}, url "mais lidas" ou None)
+    """
+    soup = BeautifulSoup(html or '', 'html.parser')
+    materias = []
+    vistos = set()
+    mais_lidas = None
+
+    for link in soup.find_all('a', href=True):
+        url = urljoin(url_pagina, link['href'].strip()).split('#')[0]
+        titulo = link.get_text(' ', strip=True)[:200]
+
+        if mais_lidas is None and dominio_base(host_da_url(url)) == dominio_base(dominio):
+            if (any(t in _normalizar(titulo) for t in _TEXTO_MAIS_LIDAS)
+                    or any(c in url.lower() for c in _CAMINHO_MAIS_LIDAS)):
+                mais_lidas = url
+                continue
+
+        if not parece_materia(url, dominio):
+            continue
+        chave = chave_url(url)
+        if chave in vistos:
+            continue
+        vistos.add(chave)
+        materias.append({'url': url, 'title': titulo or url, 'snippet': ''})
+
+    return materias, mais_lidas
+
+
+def _carregar_analisador():
+    """SemanticAnalyzer para os embeddings, ou None se o modelo não estiver disponível."""
+    try:
+        from modules.semantic_analyzer import SemanticAnalyzer
+        return SemanticAnalyzer()
+    except Exception as e:
+        print(f"  Aquecedor sem embeddings (modelo indisponível): {e}")
+        return None
+
+
+class AquecedorCache:
+    """
+    Um ciclo de aquecimento: capas → matérias novas → scraping → embeddings.
+    """
+
+    def __init__(self, scraper=None, orcamento=None, max_por_fonte=None, analisador=None):
+        """
+        Args:
+            scraper (NewsScraper): Scraper usado (padrão: novo, no agendador global)
+            orcamento (int): Requisições por ciclo (padrão Config.CACHE_WARMER_BUDGET)
+            max_por_fonte (int): Matérias por fonte e ciclo (padrão Config.CACHE_WARMER_MAX_PER_SOURCE)
+            analisador (SemanticAnalyzer): Para os embeddings (padrão: carregado na
+                primeira vez, se Config.CACHE_WARMER_EMBEDDINGS)
+        """
+        self.scraper = scraper or NewsScraper()
+        self.orcamento = orcamento or Config.CACHE_WARMER_BUDGET
+        self.max_por_fonte = max_por_fonte or Config.CACHE_WARMER_MAX_PER_SOURCE
+        self._analisador = analisador
+
+
+    @property
+    def analisador(self):
+        if self._analisador is None and Config.CACHE_WARMER_EMBEDDINGS:
+            self._analisador = _carregar_analisador() or False
+        return self._analisador or None
+
+
+    def _baixar_pagina(self, url):
+        """Baixa uma capa pelo agendador global (prioridade baixa)."""
+        futuro = self.scraper.scheduler.submeter(
+            baixar_html, url, headers=Config.DEFAULT_HEADERS,
+            host=host_da_url(url), prioridade=Config.CACHE_WARMER_PRIORITY
+        )
+        try:
+            return futuro.result()
+        except Exception as e:
+            print(f"  Aquecedor: falha ao ler {url[:60]}: {e}")
+            return None
+
+
+    def _em_cache(self, url):
+        cache = self.scraper.cache
+        return cache.obter(url) is not None or cache.obter_falha(url) is not None
+
+
+    def _materias_novas(self, fonte, restante):
+        """
+        Lê a capa (e a seção "mais lidas") de uma fonte.
+
+        Returns:
+            tuple: (matérias fora do cache, requisições usadas)
+        """
+        usadas = 1
+        html = self._baixar_pagina(fonte['url_base'])
+        if html is None:
+            return [], usadas
+
+        materias, mais_lidas = extrair_links(html, fonte['url_base'], fonte['dominio'])
+        if mais_lidas and restante - usadas > 1:
+            usadas += 1
+            html_mais_lidas = self._baixar_pagina(mais_lidas)
+            if html_mais_lidas:
+                destaques, _ = extrair_links(html_mais_lidas, mais_lidas, fonte['dominio'])
+                vistos = {chave_url(m['url']) for m in destaques}
+                materias = destaques + [m for m in materias if chave_url(m['url']) not in vistos]
+
+        limite = min(self.max_por_fonte, restante - usadas)
+        novas = []
+        for materia in materias:
+            if len(novas) >= limite:
+                break
+            if not self._em_cache(materia['url']):
+                novas.append(materia)
+        return novas, usadas
+
+
+    def executar_ciclo(self, fontes=None):
+        """
+        Executa um ciclo dentro do orçamento.
+
+        Args:
+            fontes (list): Fontes a aquecer (padrão: TRUSTED_SOURCES ativas)
+
+        Returns:
+            dict: paginas, materias, sucessos, embeddings, adiado
+        """
+        relatorio = {'paginas': 0, 'materias': 0, 'sucessos': 0, 'embeddings': 0, 'adiado': False}
+
+        if self.scraper.scheduler.estatisticas()['pendentes'] > 0:
+            relatorio['adiado'] = True
+            return relatorio
+
+        fontes = fontes if fontes is not None else [f for f in Config.TRUSTED_SOURCES if f.get('ativo', True)]
+        restante = self.orcamento
+        lote = {}
+
+        for fonte in fontes:
+            if restante <= 0:
+                break
+            novas, usadas = self._materias_novas(fonte, restante)
+            restante -= usadas + len(novas)
+            relatorio['paginas'] += usadas
+            if novas:
+                lote[fonte['nome']] = novas
+
+        if not lote:
+            return relatorio
+
+        resultado = self.scraper.scrape_resultados_busca(
+            lote, prioridade_base=Config.CACHE_WARMER_PRIORITY
+        )
+        conteudos = [
+            {**conteudo, 'fonte': nome}
+            for nome in lote
+            for conteudo in resultado.get(nome, [])
+            if conteudo.get('sucesso') and conteudo.get('texto')
+        ]
+        relatorio['materias'] = sum(len(itens) for itens in lote.values())
+        relatorio['sucessos'] = len(conteudos)
+
+        if conteudos and self.analisador:
+            relatorio['embeddings'] = self.analisador.preparar_evidencias(
+                [conteudo['texto'] for conteudo in conteudos], conteudos=conteudos
+            )
+
+        return relatorio
+
+
+
+
+_aquecedor = None
+_aquecedor_lock = threading.Lock()
+
+
+def _executar_aquecedor(intervalo, parar):
+    aquecedor = AquecedorCache()
+    while not parar.wait(intervalo):
+        try:
+            relatorio = aquecedor.executar_ciclo()
+            print(f"  Aquecedor de cache: {relatorio}")
+        except Exception as e:
+            print(f"  Erro no aquecedor de cache: {e}")
+
+
+def iniciar_aquecedor(intervalo=None):
+    """
+    Inicia (uma vez por processo) a thread que aquece o cache a cada
+    Config.CACHE_WARMER_INTERVAL segundos.
+
+    Returns:
+        threading.Event ou None: Evento para parar a thread (None se desativado)
+    """
+    global _aquecedor
+
+    if not Config.ENABLE_CACHE_WARMER:
+        return None
+
+    with _aquecedor_lock:
+        if _aquecedor is None:
+            parar = threading.Event()
+            thread = threading.Thread(
+                target=_executar_aquecedor,
+                args=(intervalo or Config.CACHE_WARMER_INTERVAL, parar),
+                name="cache-warmer",
+                daemon=True
+            )
+            thread.start()
+            _aquecedor = parar
+
+    return _aquecedor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa um ciclo de aquecimento do cache de scraping.")
+    parser.add_argument('--fonte', action='append', help="Nome da fonte (pode repetir; padrão: todas)")
+    parser.add_argument('--orcamento', type=int, default=None,
+                        help="Requisições deste ciclo (padrão: Config)")
+    args = parser.parse_args(argv)
+
+    fontes = None
+    if args.fonte:
+        fontes = [f for f in Config.TRUSTED_SOURCES if f['nome'] in args.fonte]
+    print(AquecedorCache(orcamento=args.orcamento).executar_ciclo(fontes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+dedup.py - Colapso de Matérias Quase Idênticas antes da Análise Semântica
+
+Responsabilidade:
+    Matérias de agência (Agência Brasil, Estadão Conteúdo, Reuters...)
+    aparecem quase palavra por palavra em vários portais confiáveis, e cada
+    cópia era codificada e varrida atrás de contradições separadamente.
+
+    Entre filtrar_scraping e analisar_semantica, as matérias com SimHash
+    (64 bits sobre trigramas de palavras) a até Config.DEDUP_HAMMING_THRESHOLD
+    bits de distância são agrupadas; só um representante por grupo (o texto
+    mais longo) é analisado, e depois o resultado é replicado para cada
+    cópia na sua própria fonte, de modo que o VeracityScorer continua
+    aplicando o peso de confiabilidade de cada fonte.
+
+    Os pares candidatos saem de buckets por faixas de bits (se a distância
+    é <= k, ao menos uma de k+1 faixas disjuntas é idêntica), sem comparar
+    todas as matérias entre si.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from config import Config
+
+
+_CONTADORES_STATUS = {
+    'CONTRADIZ': 'contradizem',
+    'confirma_forte': 'confirmam_forte',
+    'confirma_parcial': 'confirmam_parcial',
+    'menciona': 'apenas_mencionam',
+}
+
+_CAMPOS_ANALISE = (
+    'similaridade', 'status', 'motivo', 'contradiz', 'confianca_contradicao',
+    'evidencias_contradicao', 'nivel_embedding', 'trechos_relevantes'
+)
+
+
+def _palavras(texto):
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ascii', 'ignore').decode('ascii')
+    return re.findall(r'\w+', texto.lower())
+
+
+def simhash(texto, tamanho_shingle=3):
+    """
+    Impressão SimHash de 64 bits do texto (trigramas de palavras, pesados
+    pela frequência).
+
+    Returns:
+        int: Impressão (0 para texto vazio)
+    """
+    palavras = _palavras(texto)
+    if not palavras:
+        return 0
+    shingles = Counter(
+        ' '.join(palavras[i:i + tamanho_shingle])
+        for i in range(max(1, len(palavras) - tamanho_shingle + 1))
+    )
+
+    hashes = np.frombuffer(b''.join(
+        hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest() for shingle in shingles
+    ), dtype='<u8')
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    pesos = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    soma = (2 * bits.astype(np.int64) - 1).T @ pesos
+
+    return int(np.packbits(soma > 0, bitorder='little').view('<u8')[0])
+
+
+def distancia_hamming(a, b):
+    """Número de bits diferentes entre duas impressões."""
+    return bin(a ^ b).count('1')
+
+
+def agrupar_impressoes(impressoes, limite=None):
+    """
+    Agrupa impressões a até `limite` bits umas das outras (transitivamente).
+
+    Args:
+        impressoes (list): Impressões SimHash
+        limite (int): Distância máxima (padrão Config.DEDUP_HAMMING_THRESHOLD)
+
+    Returns:
+        list: Grupos (listas de índices, em ordem) com 2 ou mais elementos
+    """
+    limite = Config.DEDUP_HAMMING_THRESHOLD if limite is None else limite
+    faixas = limite + 1
+    largura = 64 // faixas
+    mascara = (1 << largura) - 1
+
+    pai = list(range(len(impressoes)))
+
+    def raiz(i):
+        while pai[i] != i:
+            pai[i] = pai[pai[i]]
+            i = pai[i]
+        return i
+
+    buckets = defaultdict(list)
+    for i, impressao in enumerate(impressoes):
+        for faixa in range(faixas):
+            buckets[(faixa, (impressao >> (faixa * largura)) & mascara)].append(i)
+
+    for membros in buckets.values():
+        for posicao, i in enumerate(membros):
+            for j in membros[posicao + 1:]:
+                if raiz(i) != raiz(j) and distancia_hamming(impressoes[i], impressoes[j]) <= limite:
+                    pai[raiz(j)] = raiz(i)
+
+    grupos = defaultdict(list)
+    for i in range(len(impressoes)):
+        grupos[raiz(i)].append(i)
+    return [membros for membros in grupos.values() if len(membros) > 1]
+
+
+def colapsar_duplicatas(conteudos_scraping, limite=None):
+    """
+    Deixa um representante por grupo de matérias quase idênticas.
+
+    Args:
+        conteudos_scraping (dict): Resultado de filtrar_scraping
+        limite (int): Distância de Hamming máxima (padrão Config.DEDUP_HAMMING_THRESHOLD)
+
+    Returns:
+        tuple: (conteúdos sem as cópias, grupos) — cada grupo é
+               (fonte do representante, url do representante, [(fonte, conteúdo da cópia)])
+    """
+    candidatos = [
+        (fonte_nome, conteudo)
+        for fonte_nome, fonte_conteudos in conteudos_scraping.items()
+        if fonte_nome != 'metadata'
+        for conteudo in (fonte_conteudos or [])
+        if conteudo.get('sucesso') and len(_palavras(conteudo.get('texto'))) >= Config.DEDUP_MIN_WORDS
+    ]
+    grupos_indices = agrupar_impressoes([simhash(c['texto']) for _, c in candidatos], limite)
+    if not grupos_indices:
+        return conteudos_scraping, []
+
+    grupos = []
+    copias = set()
+    for indices in grupos_indices:
+        representante = max(indices, key=lambda i: len(candidatos[i][1]['texto']))
+        fonte_rep, conteudo_rep = candidatos[representante]
+        membros = [candidatos[i] for i in indices if i != representante]
+        copias.update(id(conteudo) for _, conteudo in membros)
+        grupos.append((fonte_rep, conteudo_rep.get('url'), membros))
+
+    resultado = {
+        fonte_nome: [c for c in fonte_conteudos or [] if id(c) not in copias] if fonte_nome != 'metadata' else fonte_conteudos
+        for fonte_nome, fonte_conteudos in conteudos_scraping.items()
+    }
+    return resultado, grupos
+
+
+def expandir_duplicatas(resultado_analise, grupos):
+    """
+    Replica a análise de cada representante para as suas cópias (cada uma
+    na sua fonte) e atualiza os contadores da metadata.
+
+    Args:
+        resultado_analise (dict): Resultado de analisar_semantica
+        grupos (list): Grupos devolvidos por colapsar_duplicatas
+
+    Returns:
+        dict: Resultado com todas as matérias
+    """
+    if not grupos:
+        return resultado_analise
+
+    metadata = dict(resultado_analise.get('metadata', {}))
+    resultado = {**resultado_analise, 'metadata': metadata}
+    replicadas = 0
+
+    for fonte_rep, url_rep, membros in grupos:
+        analise_rep = next(
+            (a for a in resultado.get(fonte_rep, []) if a.get('url') == url_rep and a.get('sucesso')),
+            None
+        )
+        if analise_rep is None:
+            continue
+
+        for fonte_nome, conteudo in membros:
+            analise = {
+                **conteudo,
+                **{campo: analise_rep[campo] for campo in _CAMPOS_ANALISE if campo in analise_rep},
+                'duplicata_de': url_rep
+            }
+            resultado[fonte_nome] = list(resultado.get(fonte_nome) or []) + [analise]
+            contador = _CONTADORES_STATUS.get(analise['status'], 'nao_relacionados')
+            metadata[contador] = metadata.get(contador, 0) + 1
+            metadata['total_analisados'] = metadata.get('total_analisados', 0) + 1
+            replicadas += 1
+
+    metadata['duplicatas_colapsadas'] = replicadas
+    return resultado
@@ -0,0 +1,188 @@
+"""
+embedding_backends.py - Backends de Inferência dos Embeddings
+
+Responsabilidade:
+    Os servidores rodam só em CPU, e o mpnet multilíngue em PyTorch fp32
+    domina a latência e a memória de cada verificação. Este módulo oferece
+    três backends com a mesma interface encode() do SentenceTransformer:
+
+    - 'pytorch':   SentenceTransformer original (fp32)
+    - 'onnx':      modelo exportado para ONNX, executado pelo ONNX Runtime
+    - 'onnx_int8': o mesmo modelo com quantização dinâmica int8 dos pesos
+
+    A exportação (optimum) e a quantização são feitas uma vez e guardadas
+    em Config.ONNX_MODEL_DIR. Os embeddings em cache ficam separados por
+    backend (identificador_embeddings), já que os vetores não são idênticos.
+
+    Se o ONNX Runtime/optimum não estiverem instalados, carregar_backend()
+    volta para o PyTorch.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import os
+import re
+
+import numpy as np
+
+from config import Config
+from modules.inference_batcher import configurar_threads_torch
+
+try:
+    import onnxruntime
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    OPTIMUM_AVAILABLE = True
+except ImportError:
+    OPTIMUM_AVAILABLE = False
+
+
+BACKENDS = ('pytorch', 'onnx', 'onnx_int8')
+
+
+def identificador_embeddings(modelo=None, backend=None):
+    """
+    Espaço de nomes dos embeddings em cache. O PyTorch mantém o id puro do
+    modelo (caches existentes continuam válidos); os demais ganham sufixo.
+
+    Returns:
+        str: Ex.: 'paraphrase-multilingual-mpnet-base-v2@onnx_int8'
+    """
+    modelo = modelo or Config.SENTENCE_TRANSFORMER_MODEL
+    backend = backend or Config.EMBEDDING_BACKEND
+    return modelo if backend == 'pytorch' else f"{modelo}@{backend}"
+
+
+def _repositorio(modelo):
+    """Nome no Hugging Face Hub (modelos curtos são da org sentence-transformers)."""
+    return modelo if '/' in modelo or os.path.isdir(modelo) else f"sentence-transformers/{modelo}"
+
+
+class BackendONNX:
+    """
+    Modelo sentence-transformers em ONNX Runtime: tokenizador do modelo,
+    sessão ONNX e mean pooling pela máscara de atenção (o mesmo pooling do
+    paraphrase-multilingual-mpnet-base-v2).
+    """
+
+    def __init__(self, modelo, quantizado=False, diretorio=None):
+        """
+        Args:
+            modelo (str): Id do modelo (Config.SENTENCE_TRANSFORMER_MODEL)
+            quantizado (bool): Usa a versão int8 (quantização dinâmica)
+            diretorio (str): Onde guardar a exportação (padrão Config.ONNX_MODEL_DIR)
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime não está instalado")
+
+        from transformers import AutoTokenizer
+
+        pasta = os.path.join(diretorio or Config.ONNX_MODEL_DIR, re.sub(r'[^\w.-]+', '_', modelo))
+        arquivo = exportar_onnx(modelo, pasta)
+        if quantizado:
+            arquivo = quantizar_onnx(arquivo)
+
+        opcoes = onnxruntime.SessionOptions()
+        opcoes.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if Config.ONNX_INTRA_OP_THREADS:
+            opcoes.intra_op_num_threads = Config.ONNX_INTRA_OP_THREADS
+
+        self.sessao = onnxruntime.InferenceSession(arquivo, opcoes, providers=['CPUExecutionProvider'])
+        self.entradas = {entrada.name for entrada in self.sessao.get_inputs()}
+        self.tokenizador = AutoTokenizer.from_pretrained(pasta)
+        self.max_seq_length = Config.EMBEDDING_MAX_SEQ_LENGTH
+
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True, **kwargs):
+        """
+        Mesma assinatura básica de SentenceTransformer.encode().
+
+        Returns:
+            np.ndarray: (n, dimensão) float32, ou vetor único se `textos` for str
+        """
+        unico = isinstance(textos, str)
+        textos = [textos] if unico else list(textos)
+
+        lotes = []
+        for inicio in range(0, len(textos), batch_size):
+            tokens = self.tokenizador(
+                textos[inicio:inicio + batch_size], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors='np'
+            )
+            alimentacao = {nome: valor.astype(np.int64) for nome, valor in tokens.items() if nome in self.entradas}
+            saida = self.sessao.run(None, alimentacao)[0]
+
+            mascara = tokens['attention_mask'][..., None].astype(np.float32)
+            soma = (saida * mascara).sum(axis=1)
+            lotes.append(soma / np.clip(mascara.sum(axis=1), 1e-9, None))
+
+        vetores = np.concatenate(lotes).astype(np.float32) if lotes else np.zeros((0, 0), np.float32)
+        return vetores[0] if unico else vetores
+
+
+def exportar_onnx(modelo, pasta):
+    """
+    Exporta o transformer para ONNX (uma vez) com o optimum.
+
+    Returns:
+        str: Caminho do model.onnx
+    """
+    arquivo = os.path.join(pasta, 'model.onnx')
+    if os.path.exists(arquivo):
+        return arquivo
+    if not OPTIMUM_AVAILABLE:
+        raise ImportError("optimum[onnxruntime] é necessário para exportar o modelo para ONNX")
+
+    from transformers import AutoTokenizer
+
+    print(f"   Exportando {modelo} para ONNX (só na primeira vez)...")
+    ORTModelForFeatureExtraction.from_pretrained(_repositorio(modelo), export=True).save_pretrained(pasta)
+    AutoTokenizer.from_pretrained(_repositorio(modelo)).save_pretrained(pasta)
+    return arquivo
+
+
+def quantizar_onnx(arquivo):
+    """
+    Quantização dinâmica int8 dos pesos (uma vez).
+
+    Returns:
+        str: Caminho do model-int8.onnx
+    """
+    destino = os.path.join(os.path.dirname(arquivo), 'model-int8.onnx')
+    if not os.path.exists(destino):
+        print("   Quantizando modelo ONNX para int8...")
+        quantize_dynamic(arquivo, destino, weight_type=QuantType.QInt8)
+    return destino
+
+
+def carregar_backend(modelo=None, backend=None):
+    """
+    Carrega o modelo de embeddings no backend pedido.
+
+    Args:
+        modelo (str): Id do modelo (padrão Config.SENTENCE_TRANSFORMER_MODEL)
+        backend (str): 'pytorch', 'onnx' ou 'onnx_int8' (padrão Config.EMBEDDING_BACKEND)
+
+    Returns:
+        tuple: (objeto com encode(), backend efetivamente usado)
+    """
+    modelo = modelo or Config.SENTENCE_TRANSFORMER_MODEL
+    backend = backend or Config.EMBEDDING_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"backend de embeddings desconhecido: {backend}")
+
+    if backend != 'pytorch':
+        try:
+            return BackendONNX(modelo, quantizado=(backend == 'onnx_int8')), backend
+        except ImportError as e:
+            print(f"    Backend {backend} indisponível ({e}); usando PyTorch")
+
+    from sentence_transformers import SentenceTransformer
+    configurar_threads_torch()
+    return SentenceTransformer(modelo), 'pytorch'
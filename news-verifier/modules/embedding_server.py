@@ -0,0 +1,395 @@
+"""
+embedding_server.py - Servidor Local de Embeddings (socket Unix)
+
+Responsabilidade:
+    Cada processo que importa o semantic_analyzer carrega a sua própria
+    cópia do sentence-transformer (centenas de MB e dezenas de segundos por
+    worker, inclusive nos scripts de teste).
+
+    Este módulo oferece um processo servidor que é dono do(s) modelo(s) e
+    atende pedidos de encode em lote por um socket Unix, e o cliente
+    correspondente, com a mesma interface encode() dos backends. Com
+    Config.EMBEDDING_SERVER_SOCKET definido, o SemanticAnalyzer usa o
+    cliente e os workers web não carregam modelo nenhum.
+
+Protocolo (binário, little-endian, várias requisições por conexão):
+    Requisição:  '<4sBHI' (MAGICO, operação, bytes do id do modelo, nº de textos)
+                 + id do modelo (utf-8) + nº de textos × ('<I' bytes + utf-8)
+    Resposta:    '<BI' (status, bytes do corpo) + corpo
+                 - OP_ENCODE ok: '<II' (linhas, dimensão) + float32 linha a linha
+                 - OP_MODELO ok: backend efetivamente usado (utf-8)
+                 - erro:         mensagem (utf-8)
+
+Uso:
+    python -m modules.embedding_server --socket /tmp/news-verifier-emb.sock
+    EMBEDDING_SERVER_SOCKET=/tmp/news-verifier-emb.sock python app.py
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import argparse
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+from config import Config
+from modules.embedding_backends import carregar_backend
+from modules.inference_batcher import DespachanteInferencia, com_micro_lotes
+
+
+MAGICO = b'NVE1'
+OP_ENCODE = 0
+OP_MODELO = 1
+
+STATUS_OK = 0
+STATUS_ERRO = 1
+
+MAX_TEXTOS = 4096
+MAX_BYTES_TEXTO = 1 << 20
+
+RECONEXAO_SEGUNDOS = 30
+
+_REQUISICAO = struct.Struct('<4sBHI')
+_RESPOSTA = struct.Struct('<BI')
+_MATRIZ = struct.Struct('<II')
+_TAMANHO = struct.Struct('<I')
+
+SUPORTADO = hasattr(socket, 'AF_UNIX')
+
+
+class ErroProtocolo(Exception):
+    """Quadro malformado ou erro devolvido pelo servidor."""
+
+
+def _receber_exato(conexao, tamanho):
+    """Lê exatamente `tamanho` bytes (None se a conexão fechar antes de começar)."""
+    partes = []
+    faltam = tamanho
+    while faltam:
+        parte = conexao.recv(min(faltam, 1 << 20))
+        if not parte:
+            if faltam == tamanho:
+                return None
+            raise ErroProtocolo("conexão encerrada no meio de um quadro")
+        partes.append(parte)
+        faltam -= len(parte)
+    return b''.join(partes)
+
+
+def codificar_requisicao(operacao, modelo, textos=()):
+    """Monta o quadro de uma requisição."""
+    id_modelo = modelo.encode('utf-8')
+    partes = [_REQUISICAO.pack(MAGICO, operacao, len(id_modelo), len(textos)), id_modelo]
+    for texto in textos:
+        dados = (texto or '').encode('utf-8', 'ignore')
+        partes.append(_TAMANHO.pack(len(dados)))
+        partes.append(dados)
+    return b''.join(partes)
+
+
+def ler_requisicao(conexao):
+    """
+    Lê uma requisição.
+
+    Returns:
+        tuple: (operação, modelo, textos) ou None no fim da conexão
+    """
+    cabecalho = _receber_exato(conexao, _REQUISICAO.size)
+    if cabecalho is None:
+        return None
+    magico, operacao, tamanho_modelo, quantidade = _REQUISICAO.unpack(cabecalho)
+    if magico != MAGICO:
+        raise ErroProtocolo("quadro inválido")
+    if quantidade > MAX_TEXTOS:
+        raise ErroProtocolo(f"máximo de {MAX_TEXTOS} textos por requisição")
+
+    modelo = _receber_exato(conexao, tamanho_modelo).decode('utf-8') if tamanho_modelo else ''
+    textos = []
+    for _ in range(quantidade):
+        (tamanho,) = _TAMANHO.unpack(_receber_exato(conexao, _TAMANHO.size))
+        if tamanho > MAX_BYTES_TEXTO:
+            raise ErroProtocolo("texto grande demais")
+        textos.append(_receber_exato(conexao, tamanho).decode('utf-8', 'ignore') if tamanho else '')
+    return operacao, modelo, textos
+
+
+def codificar_resposta(status, corpo):
+    return _RESPOSTA.pack(status, len(corpo)) + corpo
+
+
+def codificar_matriz(vetores):
+    """Corpo de uma resposta OP_ENCODE."""
+    vetores = np.ascontiguousarray(vetores, dtype=np.float32)
+    if not vetores.size:
+        return _MATRIZ.pack(0, 0)
+    vetores = vetores.reshape(-1, vetores.shape[-1])
+    return _MATRIZ.pack(*vetores.shape) + vetores.tobytes()
+
+
+def decodificar_matriz(corpo):
+    linhas, dimensao = _MATRIZ.unpack_from(corpo)
+    return np.frombuffer(corpo, dtype=np.float32, offset=_MATRIZ.size).reshape(linhas, dimensao).copy()
+
+
+class ServidorEmbeddings(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Processo dono dos modelos. Cada conexão é atendida numa thread; os
+    pedidos simultâneos de um mesmo modelo são juntados em micro-lotes
+    (inference_batcher.py) ou, com ele desligado, serializados.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, caminho, carregar=carregar_backend):
+        """
+        Args:
+            caminho (str): Caminho do socket Unix
+            carregar: Função (modelo) -> (objeto com encode(), backend)
+        """
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        self._carregar = carregar
+        self._modelos = {}
+        self._lock = threading.Lock()
+        super().__init__(caminho, _Atendimento)
+        os.chmod(caminho, 0o660)
+
+
+    def modelo(self, nome):
+        """(modelo, backend, lock) carregado na primeira vez que é pedido."""
+        nome = nome or Config.SENTENCE_TRANSFORMER_MODEL
+        with self._lock:
+            if nome not in self._modelos:
+                print(f"   Servidor de embeddings: carregando {nome} ({Config.EMBEDDING_BACKEND})...")
+                carregado, backend = self._carregar(nome)
+                carregado = com_micro_lotes(carregado)
+                lock = nullcontext() if isinstance(carregado, DespachanteInferencia) else threading.Lock()
+                self._modelos[nome] = (carregado, backend, lock)
+            return self._modelos[nome]
+
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except (OSError, TypeError):
+            pass
+
+
+class _Atendimento(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        while True:
+            try:
+                requisicao = ler_requisicao(self.request)
+            except (ErroProtocolo, struct.error, UnicodeDecodeError) as e:
+                self.request.sendall(codificar_resposta(STATUS_ERRO, str(e).encode('utf-8')))
+                return
+            except OSError:
+                return
+            if requisicao is None:
+                return
+
+            operacao, nome, textos = requisicao
+            try:
+                modelo, backend, lock = self.server.modelo(nome)
+                if operacao == OP_MODELO:
+                    resposta = codificar_resposta(STATUS_OK, backend.encode('utf-8'))
+                elif operacao == OP_ENCODE:
+                    with lock:
+                        vetores = modelo.encode(
+                            textos, batch_size=Config.EMBEDDING_BATCH_SIZE, convert_to_numpy=True
+                        ) if textos else np.zeros((0, 0), dtype=np.float32)
+                    resposta = codificar_resposta(STATUS_OK, codificar_matriz(vetores))
+                else:
+                    resposta = codificar_resposta(STATUS_ERRO, f"operação desconhecida: {operacao}".encode('utf-8'))
+            except Exception as e:
+                resposta = codificar_resposta(STATUS_ERRO, str(e).encode('utf-8'))
+
+            try:
+                self.request.sendall(resposta)
+            except OSError:
+                return
+
+
+
+
+class ClienteEmbeddings:
+    """
+    Cliente do servidor de embeddings com a interface encode() dos
+    backends. Mantém uma conexão por thread e reconecta uma vez se ela cair.
+
+    Com `reserva`, se o servidor parar de responder o encode passa a usar
+    um modelo local (carregado só nessa hora) e volta a tentar o servidor
+    a cada RECONEXAO_SEGUNDOS. A reserva só é aceita no mesmo backend do
+    servidor: os vetores continuam no mesmo espaço de embeddings (cache,
+    registros de características e índice de evidências).
+    """
+
+    def __init__(self, caminho, modelo=None, timeout=60, reserva=None):
+        """
+        Args:
+            caminho (str): Caminho do socket Unix do servidor
+            modelo (str): Id do modelo (padrão Config.SENTENCE_TRANSFORMER_MODEL)
+            timeout (float): Segundos por requisição
+            reserva: Função (backend) -> (modelo local com encode(), backend
+                efetivo), usada se o servidor cair
+        """
+        self.caminho = caminho
+        self.modelo = modelo or Config.SENTENCE_TRANSFORMER_MODEL
+        self.timeout = timeout
+        self.reserva = reserva
+        self._local = threading.local()
+        self.backend_servidor = None
+        self._modelo_reserva = None
+        self._servidor_fora_ate = 0.0
+        self._lock_reserva = threading.Lock()
+
+
+    def _conexao(self):
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            conexao.settimeout(self.timeout)
+            try:
+                conexao.connect(self.caminho)
+            except OSError:
+                conexao.close()
+                raise
+            self._local.conexao = conexao
+        return conexao
+
+
+    def fechar(self):
+        conexao = getattr(self._local, 'conexao', None)
+        self._local.conexao = None
+        if conexao is not None:
+            conexao.close()
+
+
+    def _requisitar(self, operacao, textos=()):
+        quadro = codificar_requisicao(operacao, self.modelo, textos)
+        for tentativa in range(2):
+            try:
+                conexao = self._conexao()
+                conexao.sendall(quadro)
+                cabecalho = _receber_exato(conexao, _RESPOSTA.size)
+                if cabecalho is None:
+                    raise ConnectionError("servidor de embeddings encerrou a conexão")
+                status, tamanho = _RESPOSTA.unpack(cabecalho)
+                corpo = _receber_exato(conexao, tamanho) if tamanho else b''
+                break
+            except (OSError, ErroProtocolo) as e:
+                self.fechar()
+                if tentativa:
+                    raise ConnectionError(f"servidor de embeddings indisponível: {e}") from e
+
+        if status != STATUS_OK:
+            raise ErroProtocolo(corpo.decode('utf-8', 'ignore'))
+        return corpo
+
+
+    def backend(self):
+        """Backend usado pelo servidor para este modelo (carrega-o se preciso)."""
+        self.backend_servidor = self._requisitar(OP_MODELO).decode('utf-8')
+        return self.backend_servidor
+
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True, **kwargs):
+        """
+        Mesma assinatura básica de SentenceTransformer.encode().
+
+        Returns:
+            np.ndarray: (n, dimensão) float32, ou vetor único se `textos` for str
+        """
+        unico = isinstance(textos, str)
+        textos = [textos] if unico else list(textos)
+
+        if self.reserva is not None and time.monotonic() < self._servidor_fora_ate:
+            vetores = self._encode_reserva(textos, batch_size)
+        else:
+            try:
+                lotes = [
+                    decodificar_matriz(self._requisitar(OP_ENCODE, textos[inicio:inicio + MAX_TEXTOS]))
+                    for inicio in range(0, len(textos), MAX_TEXTOS)
+                ]
+                vetores = np.concatenate(lotes) if lotes else np.zeros((0, 0), np.float32)
+            except ConnectionError as e:
+                if self.reserva is None:
+                    raise
+                print(f"    {e}; usando o modelo local")
+                vetores = self._encode_reserva(textos, batch_size)
+                self._servidor_fora_ate = time.monotonic() + RECONEXAO_SEGUNDOS
+        return vetores[0] if unico else vetores
+
+
+    def _encode_reserva(self, textos, batch_size):
+        with self._lock_reserva:
+            if self._modelo_reserva is None:
+                modelo, backend = self.reserva(self.backend_servidor)
+                if self.backend_servidor and backend != self.backend_servidor:
+                    raise ConnectionError(
+                        f"servidor de embeddings fora e backend {self.backend_servidor} "
+                        f"indisponível localmente (carregou {backend})"
+                    )
+                self._modelo_reserva = modelo
+        return np.asarray(self._modelo_reserva.encode(textos, batch_size=batch_size, convert_to_numpy=True))
+
+
+def conectar_servidor(modelo=None, caminho=None, reserva=None):
+    """
+    Cliente pronto para uso, se o servidor estiver configurado e respondendo.
+
+    Args:
+        reserva: Função (backend) -> (modelo local, backend), para quando o
+            servidor cair depois (ver ClienteEmbeddings)
+
+    Returns:
+        tuple: (ClienteEmbeddings, backend do servidor) ou (None, None)
+    """
+    caminho = caminho or Config.EMBEDDING_SERVER_SOCKET
+    if not caminho or not SUPORTADO:
+        return None, None
+    cliente = ClienteEmbeddings(caminho, modelo, reserva=reserva)
+    try:
+        return cliente, cliente.backend()
+    except (OSError, ErroProtocolo) as e:
+        print(f"    Servidor de embeddings indisponível em {caminho} ({e})")
+        cliente.fechar()
+        return None, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de embeddings (socket Unix).")
+    parser.add_argument('--socket', default=Config.EMBEDDING_SERVER_SOCKET or None,
+                        help="Caminho do socket (padrão: EMBEDDING_SERVER_SOCKET)")
+    parser.add_argument('--modelo', action='append',
+                        help="Modelo a pré-carregar (pode repetir; padrão: o modelo principal)")
+    args = parser.parse_args(argv)
+
+    if not SUPORTADO:
+        parser.error("sockets Unix não são suportados nesta plataforma")
+    if not args.socket:
+        parser.error("informe --socket ou defina EMBEDDING_SERVER_SOCKET")
+
+    servidor = ServidorEmbeddings(args.socket)
+    for modelo in args.modelo or [Config.SENTENCE_TRANSFORMER_MODEL]:
+        servidor.modelo(modelo)
+    print(f"   Servidor de embeddings ouvindo em {args.socket}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
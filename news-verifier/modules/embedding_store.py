@@ -0,0 +1,388 @@
+"""
+embedding_store.py - Armazenamento de Embeddings em Matriz Mapeada
+
+Responsabilidade:
+    O cache antigo gravava cada vetor num .pkl separado (chave MD5 de
+    modelo + texto): cada consulta custava stat + open + unpickle.
+
+    Aqui os vetores ficam numa única matriz (float16 por padrão) num
+    arquivo binário só de acréscimo, lida via np.memmap, e um índice
+    compacto (16 bytes do MD5 + 4 bytes da linha por registro) mantido
+    também em memória. Uma consulta é uma busca no dicionário mais a
+    leitura das linhas pedidas: consultas em lote copiam todas as linhas
+    numa única indexação (e numa única conversão de float16 para float32);
+    o memmap evita ler o arquivo inteiro, não a cópia das linhas.
+
+    - Acréscimos de vários processos são serializados por trava de arquivo
+      (fcntl/msvcrt); o vetor é gravado antes do registro no índice, então
+      quem lê nunca vê uma linha incompleta
+    - compactar() reescreve a matriz sem duplicatas (e dentro de um
+      orçamento de bytes) numa nova geração de arquivos; leitores com a
+      geração antiga continuam consistentes até recarregar
+
+Estrutura:
+    <diretorio>/meta.json                 dimensão, dtype e geração atual
+    <diretorio>/vetores-<geracao>.bin     matriz (linhas × dimensão)
+    <diretorio>/indice-<geracao>.bin      registros (md5, linha)
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import hashlib
+import json
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from config import Config
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+_REGISTRO = struct.Struct('<16sI')
+
+
+def chave_embedding(texto_lim, model_id):
+    """
+    Chave de um embedding (mesma origem das chaves .pkl antigas).
+
+    Returns:
+        bytes: MD5 (16 bytes) de "<model_id>||<texto>"
+    """
+    return hashlib.md5(f"{model_id}||{texto_lim}".encode("utf-8", "ignore")).digest()
+
+
+@contextmanager
+def trava_arquivo(caminho):
+    """Trava exclusiva entre processos (no-op se a plataforma não oferecer)."""
+    with open(caminho, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ArmazenamentoEmbeddings:
+    """
+    Matriz de embeddings só de acréscimo com índice hash → linha.
+    Seguro para várias threads e processos.
+    """
+
+    def __init__(self, diretorio, dtype=None):
+        """
+        Args:
+            diretorio (str): Pasta do armazenamento
+            dtype (str): 'float16' ou 'float32' para armazenamentos novos
+                (padrão Config.EMBEDDING_STORE_DTYPE)
+        """
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        self._dtype_padrao = np.dtype(dtype or Config.EMBEDDING_STORE_DTYPE)
+
+        self._lock = threading.RLock()
+        self._meta = None
+        self._indice = {}
+        self._lido = 0
+        self._matriz = None
+
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+
+    def _arquivos(self, geracao):
+        return (self._caminho(f"vetores-{geracao}.bin"), self._caminho(f"indice-{geracao}.bin"))
+
+
+    def _ler_meta(self):
+        try:
+            with open(self._caminho('meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+
+    def _gravar_meta(self, meta):
+        temporario = self._caminho(f"meta.json.{os.getpid()}.tmp")
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temporario, self._caminho('meta.json'))
+
+
+    def _bytes_linha(self, meta=None):
+        meta = meta or self._meta
+        return meta['dimensao'] * np.dtype(meta['dtype']).itemsize
+
+
+    def _atualizar(self):
+        """
+        Acompanha o disco: recarrega tudo se a geração mudou (compactação),
+        senão lê só os registros novos do índice.
+        """
+        meta = self._ler_meta()
+        if meta is None:
+            return
+        if self._meta is None or meta['geracao'] != self._meta['geracao']:
+            self._meta = meta
+            self._indice = {}
+            self._lido = 0
+            self._matriz = None
+
+        _, arquivo_indice = self._arquivos(self._meta['geracao'])
+        try:
+            with open(arquivo_indice, 'rb') as f:
+                f.seek(self._lido)
+                dados = f.read()
+        except OSError:
+            return
+
+        completos = len(dados) - len(dados) % _REGISTRO.size
+        for chave, linha in _REGISTRO.iter_unpack(dados[:completos]):
+            self._indice[chave] = linha
+        self._lido += completos
+
+
+    def _matriz_com(self, linha):
+        """Matriz mapeada que contenha `linha` (remapeia se o arquivo cresceu)."""
+        if self._matriz is None or linha >= self._matriz.shape[0]:
+            arquivo_vetores, _ = self._arquivos(self._meta['geracao'])
+            linhas = os.path.getsize(arquivo_vetores) // self._bytes_linha()
+            self._matriz = np.memmap(
+                arquivo_vetores, dtype=self._meta['dtype'], mode='r',
+                shape=(linhas, self._meta['dimensao'])
+            )
+        return self._matriz
+
+
+    def obter_varios(self, chaves, _recarregar=True):
+        """
+        Consulta em lote.
+
+        Args:
+            chaves (list): Chaves (bytes) de chave_embedding()
+
+        Returns:
+            list: np.ndarray float32 ou None (ausente), na ordem de `chaves`
+        """
+        with self._lock:
+            if any(chave not in self._indice for chave in chaves):
+                self._atualizar()
+            if not self._indice:
+                return [None] * len(chaves)
+
+            posicoes = [(i, self._indice[c]) for i, c in enumerate(chaves) if c in self._indice]
+            resultado = [None] * len(chaves)
+            if not posicoes:
+                return resultado
+
+            try:
+                matriz = self._matriz_com(max(linha for _, linha in posicoes))
+            except OSError:
+                if not _recarregar:
+                    return resultado
+                self._meta = None
+                return self.obter_varios(chaves, _recarregar=False)
+            # Indexação por lista: copia as linhas (não é uma view do memmap)
+            vetores = matriz[[linha for _, linha in posicoes]]
+
+        vetores = vetores.astype(np.float32, copy=False)
+        for (i, _), vetor in zip(posicoes, vetores):
+            resultado[i] = vetor
+        return resultado
+
+
+    def obter(self, chave):
+        """Consulta uma chave (np.ndarray float32 ou None)."""
+        return self.obter_varios([chave])[0]
+
+
+    def adicionar(self, chaves, vetores):
+        """
+        Acrescenta vetores (chaves já presentes são ignoradas).
+
+        Args:
+            chaves (list): Chaves (bytes)
+            vetores: Matriz/lista de vetores da mesma dimensão
+        """
+        if not len(chaves):
+            return
+        vetores = np.asarray(vetores, dtype=np.float32).reshape(len(chaves), -1)
+
+        with self._lock, trava_arquivo(self._caminho('.trava')):
+            self._atualizar()
+            if self._meta is None:
+                self._meta = {
+                    'versao': 1,
+                    'dimensao': int(vetores.shape[1]),
+                    'dtype': self._dtype_padrao.name,
+                    'geracao': 0
+                }
+                self._gravar_meta(self._meta)
+            if vetores.shape[1] != self._meta['dimensao']:
+                raise ValueError(
+                    f"dimensão {vetores.shape[1]} incompatível com o armazenamento ({self._meta['dimensao']})"
+                )
+
+            novos = {}
+            for chave, vetor in zip(chaves, vetores):
+                if chave not in self._indice and chave not in novos:
+                    novos[chave] = vetor
+            if not novos:
+                return
+
+            arquivo_vetores, arquivo_indice = self._arquivos(self._meta['geracao'])
+            # Uma escrita interrompida pode ter deixado uma linha (ou um
+            # registro) pela metade no fim: corta antes de acrescentar
+            with open(arquivo_vetores, 'ab') as f:
+                primeira, sobra = divmod(f.tell(), self._bytes_linha())
+                if sobra:
+                    f.truncate(primeira * self._bytes_linha())
+                f.write(np.stack(list(novos.values())).astype(self._meta['dtype']).tobytes())
+
+            registros = b''.join(
+                _REGISTRO.pack(chave, primeira + n) for n, chave in enumerate(novos)
+            )
+            with open(arquivo_indice, 'ab') as f:
+                sobra = f.tell() % _REGISTRO.size
+                if sobra:
+                    f.truncate(f.tell() - sobra)
+                f.write(registros)
+            self._atualizar()
+
+
+    def __len__(self):
+        with self._lock:
+            self._atualizar()
+            return len(self._indice)
+
+
+    def tamanho_bytes(self):
+        """Bytes ocupados pela geração atual (matriz + índice)."""
+        meta = self._ler_meta()
+        if meta is None:
+            return 0
+        total = 0
+        for caminho in self._arquivos(meta['geracao']):
+            try:
+                total += os.path.getsize(caminho)
+            except OSError:
+                pass
+        return total
+
+
+    def compactar(self, max_bytes=None):
+        """
+        Reescreve a matriz sem linhas duplicadas numa nova geração. Com
+        orçamento, mantém os vetores acrescentados mais recentemente.
+
+        Args:
+            max_bytes (int): Orçamento (None/0 = sem limite)
+
+        Returns:
+            dict: {'mantidos', 'removidos', 'bytes'}
+        """
+        with self._lock, trava_arquivo(self._caminho('.trava')):
+            self._atualizar()
+            if self._meta is None:
+                return {'mantidos': 0, 'removidos': 0, 'bytes': 0}
+
+            arquivo_vetores, _ = self._arquivos(self._meta['geracao'])
+            total_linhas = os.path.getsize(arquivo_vetores) // self._bytes_linha()
+            por_linha = sorted(self._indice.items(), key=lambda item: item[1], reverse=True)
+            if max_bytes:
+                cabem = max(0, max_bytes // (self._bytes_linha() + _REGISTRO.size))
+                por_linha = por_linha[:cabem]
+            por_linha.reverse()
+
+            matriz = self._matriz_com(total_linhas - 1) if total_linhas else None
+            geracao = self._meta['geracao'] + 1
+            novo_vetores, novo_indice = self._arquivos(geracao)
+            with open(novo_vetores + '.tmp', 'wb') as f:
+                if por_linha:
+                    f.write(np.ascontiguousarray(matriz[[linha for _, linha in por_linha]]).tobytes())
+            with open(novo_indice + '.tmp', 'wb') as f:
+                f.write(b''.join(_REGISTRO.pack(chave, n) for n, (chave, _) in enumerate(por_linha)))
+            os.replace(novo_vetores + '.tmp', novo_vetores)
+            os.replace(novo_indice + '.tmp', novo_indice)
+
+            antigos = self._arquivos(self._meta['geracao'])
+            self._gravar_meta({**self._meta, 'geracao': geracao})
+            self._matriz = None
+            self._atualizar()
+
+            for caminho in antigos:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+
+            return {
+                'mantidos': len(por_linha),
+                'removidos': total_linhas - len(por_linha),
+                'bytes': self.tamanho_bytes()
+            }
+
+
+
+
+def nome_pasta(namespace):
+    """Nome de pasta seguro para um espaço de nomes (ex.: id do modelo)."""
+    return re.sub(r'[^\w.-]+', '_', namespace).strip('_') or 'padrao'
+
+
+def listar_armazenamentos(diretorio=None):
+    """
+    Armazenamentos existentes (subpastas com meta.json) de um diretório.
+
+    Returns:
+        list: Instâncias de ArmazenamentoEmbeddings
+    """
+    diretorio = diretorio or Config.EMBEDDING_CACHE_DIR
+    if not os.path.isdir(diretorio):
+        return []
+    return [
+        ArmazenamentoEmbeddings(os.path.join(diretorio, nome))
+        for nome in sorted(os.listdir(diretorio))
+        if os.path.isfile(os.path.join(diretorio, nome, 'meta.json'))
+    ]
+
+
+_armazenamentos = {}
+_armazenamentos_lock = threading.Lock()
+
+
+def obter_armazenamento_embeddings(namespace):
+    """
+    Armazenamento compartilhado de um espaço de embeddings (um por modelo).
+
+    Args:
+        namespace (str): Identificador (ex.: id do modelo)
+    """
+    with _armazenamentos_lock:
+        if namespace not in _armazenamentos:
+            _armazenamentos[namespace] = ArmazenamentoEmbeddings(
+                os.path.join(Config.EMBEDDING_CACHE_DIR, nome_pasta(namespace))
+            )
+        return _armazenamentos[namespace]
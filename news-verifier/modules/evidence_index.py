@@ -0,0 +1,461 @@
+"""
+evidence_index.py - Índice de Vizinhos Aproximados das Matérias em Cache
+
+Responsabilidade:
+    Os embeddings das matérias já raspadas ficam no armazenamento de
+    embeddings, mas ele só responde consultas pelo texto exato. Este índice
+    guarda o embedding (normalizado) de cada matéria junto com a URL, o
+    título e a fonte, e responde "quais matérias que já temos são mais
+    parecidas com este texto?" em milissegundos, antes (ou no lugar) da
+    busca ao vivo.
+
+    - Com o hnswlib instalado, a busca usa um grafo HNSW (produto interno);
+      sem ele, um produto matriz-vetor em NumPy sobre todas as matérias
+    - Atualização incremental: cada matéria analisada (ou pré-aquecida pelo
+      cache_warmer) é acrescentada; vários processos podem acrescentar ao
+      mesmo índice (trava de arquivo) e cada um lê só o que é novo
+    - O grafo HNSW é salvo de tempos em tempos; ao abrir, as matérias
+      acrescentadas depois do último salvamento entram no grafo
+    - compactar() reescreve o índice sem as matérias descartadas (o
+      cache_janitor remove as que já saíram do cache de scraping e aplica
+      Config.EVIDENCE_INDEX_MAX_BYTES); os outros processos percebem a
+      troca dos arquivos e recarregam
+
+Estrutura (uma pasta por espaço de embeddings):
+    <diretorio>/meta.json      dimensão
+    <diretorio>/vetores.bin    matriz float32 (linha i = matéria i)
+    <diretorio>/itens.jsonl    uma matéria por linha (url, titulo, fonte, timestamp)
+    <diretorio>/hnsw.bin       grafo HNSW (opcional, reconstruível)
+
+Uso (CLI):
+    python -m modules.evidence_index "texto a procurar" [-k 5]
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from config import Config
+from modules.embedding_store import nome_pasta, trava_arquivo
+from modules.url_canonical import chave_url
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+
+def _normalizar(vetores):
+    vetores = np.asarray(vetores, dtype=np.float32)
+    normas = np.linalg.norm(vetores, axis=-1, keepdims=True)
+    return vetores / np.where(normas > 0, normas, 1.0)
+
+
+class IndiceEvidencias:
+    """
+    Índice de vizinhos mais próximos das matérias de um espaço de
+    embeddings. Seguro para várias threads e processos.
+    """
+
+    def __init__(self, diretorio, usar_hnsw=None):
+        """
+        Args:
+            diretorio (str): Pasta do índice
+            usar_hnsw (bool): Força (ou desliga) o HNSW; padrão: se o
+                hnswlib estiver instalado
+        """
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        self.usar_hnsw = HNSWLIB_AVAILABLE if usar_hnsw is None else (usar_hnsw and HNSWLIB_AVAILABLE)
+
+        self._lock = threading.RLock()
+        self._dimensao = None
+        self._itens = []
+        self._ids = {}
+        self._lido = 0
+        self._inode = None
+        self._blocos = []
+        self._matriz = None
+        self._hnsw = None
+        self._nao_salvos = 0
+
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+
+    def _ler_dimensao(self):
+        try:
+            with open(self._caminho('meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)['dimensao']
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+    def _zerar(self):
+        """Descarta o que foi lido (os arquivos foram reescritos por compactar())."""
+        self._dimensao = None
+        self._itens = []
+        self._ids = {}
+        self._lido = 0
+        self._inode = None
+        self._blocos = []
+        self._matriz = None
+        self._hnsw = None
+        self._nao_salvos = 0
+
+
+    def _atualizar(self, travado=False):
+        """
+        Lê as matérias acrescentadas (por este ou outro processo) desde a
+        última leitura. Só trava os arquivos quando há algo novo.
+
+        Args:
+            travado (bool): O chamador já tem a trava de arquivo
+        """
+        try:
+            info = os.stat(self._caminho('itens.jsonl'))
+        except OSError:
+            if self._itens and travado:
+                self._zerar()
+            return
+        if info.st_ino == self._inode and info.st_size <= self._lido:
+            return
+        if not travado:
+            with trava_arquivo(self._caminho('.trava')):
+                return self._atualizar(travado=True)
+
+        info = os.stat(self._caminho('itens.jsonl'))
+        if self._inode is not None and info.st_ino != self._inode:
+            self._zerar()
+        self._inode = info.st_ino
+
+        if self._dimensao is None:
+            self._dimensao = self._ler_dimensao()
+            if self._dimensao is None:
+                return
+
+        try:
+            with open(self._caminho('itens.jsonl'), 'rb') as f:
+                f.seek(self._lido)
+                dados = f.read()
+        except OSError:
+            return
+        completos = dados.rfind(b'\n') + 1
+        if not completos:
+            return
+
+        novos = [json.loads(linha) for linha in dados[:completos].splitlines() if linha.strip()]
+        bytes_linha = self._dimensao * 4
+        with open(self._caminho('vetores.bin'), 'rb') as f:
+            f.seek(len(self._itens) * bytes_linha)
+            vetores = np.frombuffer(f.read(len(novos) * bytes_linha), dtype=np.float32)
+        vetores = vetores.reshape(-1, self._dimensao)
+        novos = novos[:len(vetores)]
+        if not novos:
+            return
+
+        inicio = len(self._itens)
+        for n, item in enumerate(novos):
+            self._ids[item['chave']] = inicio + n
+        self._itens.extend(novos)
+        self._blocos.append(vetores[:len(novos)])
+        self._matriz = None
+        self._lido += completos
+        if self._hnsw is not None:
+            self._acrescentar_hnsw(self._hnsw)
+
+
+    def _matriz_completa(self):
+        if self._matriz is None:
+            self._matriz = np.concatenate(self._blocos) if self._blocos else np.zeros((0, self._dimensao or 0), np.float32)
+            self._blocos = [self._matriz]
+        return self._matriz
+
+
+    def _acrescentar_hnsw(self, indice):
+        """Coloca no grafo as linhas que ainda não estão nele."""
+        total = len(self._itens)
+        atual = indice.get_current_count()
+        if atual >= total:
+            return
+        if total > indice.get_max_elements():
+            indice.resize_index(max(total, 2 * indice.get_max_elements()))
+        indice.add_items(self._matriz_completa()[atual:total], np.arange(atual, total))
+        self._nao_salvos += total - atual
+
+
+    def _grafo(self):
+        """Grafo HNSW carregado do disco (ou novo) e em dia com as matérias."""
+        if self._hnsw is None:
+            indice = hnswlib.Index(space='ip', dim=self._dimensao)
+            arquivo = self._caminho('hnsw.bin')
+            capacidade = max(1024, 2 * len(self._itens))
+            carregado = False
+            if os.path.exists(arquivo):
+                try:
+                    indice.load_index(arquivo, max_elements=capacidade)
+                    carregado = indice.get_current_count() <= len(self._itens)
+                except (RuntimeError, OSError):
+                    carregado = False
+                if not carregado:
+                    indice = hnswlib.Index(space='ip', dim=self._dimensao)
+            if not carregado:
+                indice.init_index(
+                    max_elements=capacidade,
+                    ef_construction=Config.EVIDENCE_INDEX_EF_CONSTRUCTION,
+                    M=Config.EVIDENCE_INDEX_HNSW_M
+                )
+            self._hnsw = indice
+            self._acrescentar_hnsw(indice)
+        return self._hnsw
+
+
+    def adicionar(self, itens, vetores):
+        """
+        Acrescenta matérias (URLs já indexadas são ignoradas).
+
+        Args:
+            itens (list): Dicts com 'url' e, opcionalmente, 'titulo' e 'fonte'
+            vetores: Embeddings das matérias (mesma ordem)
+
+        Returns:
+            int: Matérias novas no índice
+        """
+        if not len(itens):
+            return 0
+        vetores = _normalizar(vetores).reshape(len(itens), -1)
+
+        with self._lock, trava_arquivo(self._caminho('.trava')):
+            self._atualizar(travado=True)
+            if self._dimensao is None:
+                self._dimensao = int(vetores.shape[1])
+                with open(self._caminho('meta.json'), 'w', encoding='utf-8') as f:
+                    json.dump({'versao': 1, 'dimensao': self._dimensao}, f)
+            if vetores.shape[1] != self._dimensao:
+                raise ValueError(f"dimensão {vetores.shape[1]} incompatível com o índice ({self._dimensao})")
+
+            novos = {}
+            agora = time.time()
+            for item, vetor in zip(itens, vetores):
+                chave = chave_url(item['url']) or item['url']
+                if chave in self._ids or chave in novos or not vetor.any():
+                    continue
+                novos[chave] = ({
+                    'chave': chave,
+                    'url': item['url'],
+                    'titulo': item.get('titulo', ''),
+                    'fonte': item.get('fonte', ''),
+                    'timestamp': agora
+                }, vetor)
+            if not novos:
+                return 0
+
+            with open(self._caminho('vetores.bin'), 'ab') as f:
+                esperado = len(self._itens) * self._dimensao * 4
+                if f.tell() != esperado:
+                    f.truncate(esperado)
+                f.write(np.stack([vetor for _, vetor in novos.values()]).tobytes())
+            with open(self._caminho('itens.jsonl'), 'ab') as f:
+                f.write(b''.join(
+                    json.dumps(item, ensure_ascii=False).encode('utf-8') + b'\n'
+                    for item, _ in novos.values()
+                ))
+            self._atualizar(travado=True)
+
+            if self._hnsw is not None and self._nao_salvos >= Config.EVIDENCE_INDEX_SAVE_EVERY:
+                self._salvar()
+            return len(novos)
+
+
+    def buscar(self, vetor, k=None, minimo=None):
+        """
+        Matérias mais próximas de um embedding.
+
+        Args:
+            vetor (np.ndarray): Embedding da consulta
+            k (int): Quantidade (padrão Config.EVIDENCE_INDEX_TOP_K)
+            minimo (float): Similaridade mínima (padrão: nenhuma)
+
+        Returns:
+            list: Dicts da matéria com 'similaridade', do mais parecido ao menos
+        """
+        k = k or Config.EVIDENCE_INDEX_TOP_K
+        vetor = _normalizar(vetor).reshape(-1)
+
+        with self._lock:
+            self._atualizar()
+            total = len(self._itens)
+            if not total or len(vetor) != self._dimensao:
+                return []
+            k = min(k, total)
+
+            if self.usar_hnsw:
+                indice = self._grafo()
+                indice.set_ef(max(Config.EVIDENCE_INDEX_EF_SEARCH, k))
+                ids, distancias = indice.knn_query(vetor, k=k)
+                pares = zip(ids[0].tolist(), (1.0 - distancias[0]).tolist())
+            else:
+                similaridades = self._matriz_completa() @ vetor
+                topo = np.argpartition(-similaridades, k - 1)[:k]
+                topo = topo[np.argsort(-similaridades[topo])]
+                pares = zip(topo.tolist(), similaridades[topo].tolist())
+
+            resultados = [{**self._itens[i], 'similaridade': float(s)} for i, s in pares]
+
+        if minimo is not None:
+            resultados = [r for r in resultados if r['similaridade'] >= minimo]
+        return resultados
+
+
+    def salvar(self):
+        """Grava o grafo HNSW (as matérias em si já estão no disco)."""
+        with self._lock, trava_arquivo(self._caminho('.trava')):
+            self._atualizar(travado=True)
+            self._salvar()
+
+
+    def _salvar(self):
+        if self._hnsw is None:
+            return
+        temporario = self._caminho(f"hnsw.bin.{os.getpid()}.tmp")
+        self._hnsw.save_index(temporario)
+        os.replace(temporario, self._caminho('hnsw.bin'))
+        self._nao_salvos = 0
+
+
+    def tamanho_bytes(self):
+        """Bytes ocupados em disco pelo índice."""
+        total = 0
+        for nome in ('meta.json', 'vetores.bin', 'itens.jsonl', 'hnsw.bin'):
+            try:
+                total += os.path.getsize(self._caminho(nome))
+            except OSError:
+                pass
+        return total
+
+
+    def compactar(self, manter=None, max_bytes=None):
+        """
+        Reescreve o índice só com as matérias que continuam valendo.
+
+        Args:
+            manter (callable): item -> bool; as matérias com False saem
+            max_bytes (int): Orçamento; estourando, saem as matérias mais antigas
+
+        Returns:
+            dict: {'removidos' (por `manter`), 'lru' (por orçamento), 'bytes'}
+        """
+        with self._lock, trava_arquivo(self._caminho('.trava')):
+            self._atualizar(travado=True)
+            linhas = [i for i, item in enumerate(self._itens) if manter is None or manter(item)]
+            removidos = len(self._itens) - len(linhas)
+
+            lru = 0
+            if max_bytes and self._itens:
+                por_linha = {i: self._dimensao * 4 + len(json.dumps(self._itens[i], ensure_ascii=False).encode('utf-8')) + 1
+                             for i in linhas}
+                # O grafo HNSW ocupa cerca de tanto quanto os vetores
+                fator = 2 if self.usar_hnsw else 1
+                total = sum(por_linha.values()) * fator
+                linhas.sort(key=lambda i: self._itens[i]['timestamp'])
+                while linhas and total > max_bytes:
+                    total -= por_linha[linhas.pop(0)] * fator
+                    lru += 1
+                linhas.sort()
+
+            if removidos or lru:
+                matriz = self._matriz_completa()[linhas]
+                vetores_tmp = self._caminho(f"vetores.bin.{os.getpid()}.tmp")
+                itens_tmp = self._caminho(f"itens.jsonl.{os.getpid()}.tmp")
+                with open(vetores_tmp, 'wb') as f:
+                    f.write(matriz.tobytes())
+                with open(itens_tmp, 'wb') as f:
+                    f.write(b''.join(
+                        json.dumps(self._itens[i], ensure_ascii=False).encode('utf-8') + b'\n' for i in linhas
+                    ))
+                try:
+                    os.remove(self._caminho('hnsw.bin'))
+                except FileNotFoundError:
+                    pass
+                os.replace(vetores_tmp, self._caminho('vetores.bin'))
+                os.replace(itens_tmp, self._caminho('itens.jsonl'))
+                self._zerar()
+                self._atualizar(travado=True)
+
+            return {'removidos': removidos, 'lru': lru, 'bytes': self.tamanho_bytes()}
+
+
+    def __len__(self):
+        with self._lock:
+            self._atualizar()
+            return len(self._itens)
+
+
+
+
+_indices = {}
+_indices_lock = threading.Lock()
+
+
+def listar_indices(diretorio=None):
+    """
+    Índices existentes (subpastas com meta.json) de um diretório.
+
+    Returns:
+        list: Instâncias de IndiceEvidencias
+    """
+    diretorio = diretorio or Config.EVIDENCE_INDEX_DIR
+    if not os.path.isdir(diretorio):
+        return []
+    return [
+        IndiceEvidencias(os.path.join(diretorio, nome))
+        for nome in sorted(os.listdir(diretorio))
+        if os.path.isfile(os.path.join(diretorio, nome, 'meta.json'))
+    ]
+
+
+def obter_indice_evidencias(namespace):
+    """
+    Índice compartilhado de um espaço de embeddings (um por modelo).
+
+    Args:
+        namespace (str): Identificador do espaço (ex.: id do modelo)
+    """
+    with _indices_lock:
+        if namespace not in _indices:
+            _indices[namespace] = IndiceEvidencias(
+                os.path.join(Config.EVIDENCE_INDEX_DIR, nome_pasta(namespace))
+            )
+        return _indices[namespace]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulta o índice local de matérias.")
+    parser.add_argument('texto', help="Texto a procurar")
+    parser.add_argument('-k', type=int, default=None, help="Quantidade de matérias")
+    args = parser.parse_args(argv)
+
+    from modules.semantic_analyzer import SemanticAnalyzer
+
+    analisador = SemanticAnalyzer()
+    inicio = time.perf_counter()
+    resultados = analisador.buscar_evidencias_locais(args.texto, k=args.k, minimo=-1.0)
+    duracao = (time.perf_counter() - inicio) * 1000
+
+    print(f"{len(resultados)} matéria(s) em {duracao:.1f} ms")
+    for resultado in resultados:
+        print(f"  {resultado['similaridade']:.3f}  [{resultado['fonte']}] {resultado['titulo'][:70]}")
+        print(f"         {resultado['url']}")
+
+
+if __name__ == "__main__":
+    main()
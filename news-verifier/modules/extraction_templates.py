@@ -0,0 +1,502 @@
+"""
+extraction_templates.py - Templates de Extração Aprendidos por Domínio
+
+Responsabilidade:
+    Os portais confiáveis publicam as matérias em poucos templates estáveis.
+    Este módulo observa as extrações bem-sucedidas da cascata do extractor,
+    descobre em quais nós do DOM estavam o título, o corpo e a data e grava
+    seletores XPath por domínio e padrão de URL.
+
+    Nas próximas páginas do mesmo template, os seletores compilados rodam
+    direto sobre o lxml (caminho rápido), sem newspaper3k/trafilatura/
+    readability. Quando um template deixa de casar várias vezes seguidas,
+    ele é descartado e a cascata volta a ser usada até aprender outro.
+
+    O templates.json é compartilhado pelos workers do parse_pool: cada
+    gravação relê o arquivo sob trava e mescla, e os descartes ficam
+    registrados com data para que um processo não ressuscite um template
+    que outro já descartou.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from lxml import etree
+from lxml import html as lxml_html
+
+from config import Config
+from modules.embedding_store import trava_arquivo
+
+
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>', re.IGNORECASE)
+_ESPACOS = re.compile(r'\s+')
+_DATA_ISO = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_TOKEN_ESTAVEL = re.compile(r'[A-Za-z][\w-]{1,39}')
+
+# Descartes mais antigos que isso já não importam: os templates
+# correspondentes saíram de todos os processos há muito tempo
+_MAX_DESCARTADOS = 1000
+
+_XPATHS_DATA = [
+    '//meta[@property="article:published_time"]/@content',
+    '//meta[@itemprop="datePublished"]/@content',
+    '//meta[@name="date"]/@content',
+    '//time[@itemprop="datePublished"]/@datetime',
+    '//time/@datetime',
+]
+
+_XPATHS_TITULO_FALLBACK = [
+    '//meta[@property="og:title"]/@content',
+    '//h1',
+    '//title',
+]
+
+
+def _normalizar(texto):
+    return _ESPACOS.sub(' ', texto or '').strip()
+
+
+def _parse_html(html):
+    """Converte HTML em árvore lxml (ignora declaração XML com encoding)."""
+    return lxml_html.fromstring(_XML_DECLARATION.sub('', html, count=1))
+
+
+def padrao_url(url):
+    """
+    Reduz uma URL ao par (domínio, padrão de caminho).
+
+    Segmentos numéricos viram {n} e o slug final vira {slug}, preservando a
+    extensão. Ex: /saude/noticia/2025/10/17/cancer.ghtml
+    -> /saude/noticia/{n}/{n}/{n}/{slug}.ghtml
+
+    Args:
+        url (str): URL da notícia
+
+    Returns:
+        tuple: (dominio, padrao)
+    """
+    parsed = urlparse(url)
+    dominio = parsed.netloc.lower()
+    if dominio.startswith('www.'):
+        dominio = dominio[4:]
+
+    segmentos = [s for s in parsed.path.split('/') if s]
+    padrao = []
+    for i, segmento in enumerate(segmentos):
+        ultimo = i == len(segmentos) - 1
+        nome, extensao = os.path.splitext(segmento) if ultimo else (segmento, '')
+        if nome.isdigit():
+            padrao.append('{n}' + extensao)
+        elif ultimo or ('-' in nome and len(nome) > 20):
+            padrao.append('{slug}' + extensao)
+        else:
+            padrao.append(segmento.lower())
+
+    return dominio, '/' + '/'.join(padrao)
+
+
+def _token_estavel(valor):
+    """Descarta ids/classes gerados (hashes, números longos, aspas)."""
+    if not valor or not _TOKEN_ESTAVEL.fullmatch(valor):
+        return False
+    return not re.search(r'\d{3,}', valor)
+
+
+def _seletor_unico(arvore, no):
+    """
+    Gera um XPath que aponta exclusivamente para o nó informado.
+
+    Returns:
+        str ou None: XPath ou None se nenhum atributo estável identifica o nó
+    """
+    tag = no.tag
+    if not isinstance(tag, str):
+        return None
+
+    candidatos = []
+    if _token_estavel(no.get('id')):
+        candidatos.append(f'//{tag}[@id="{no.get("id")}"]')
+    if _token_estavel(no.get('itemprop')):
+        candidatos.append(f'//{tag}[@itemprop="{no.get("itemprop")}"]')
+    for classe in (no.get('class') or '').split():
+        if _token_estavel(classe):
+            candidatos.append(
+                f'//{tag}[contains(concat(" ", normalize-space(@class), " "), " {classe} ")]'
+            )
+
+    for expr in candidatos:
+        encontrados = arvore.xpath(expr)
+        if len(encontrados) == 1 and encontrados[0] is no:
+            return expr
+    return None
+
+
+def _ancestral_comum(nos):
+    """Retorna o ancestral comum mais profundo de uma lista de nós."""
+    caminhos = [list(reversed([no] + list(no.iterancestors()))) for no in nos]
+    comum = None
+    for nivel in zip(*caminhos):
+        if all(item is nivel[0] for item in nivel):
+            comum = nivel[0]
+        else:
+            break
+    return comum
+
+
+def _texto_corpo(no):
+    """Extrai o texto dos parágrafos de um nó (mesma regra do extrator Globo)."""
+    paragrafos = []
+    for item in no.iter('p', 'li'):
+        texto = _normalizar(item.text_content())
+        if len(texto) > 20:
+            paragrafos.append(texto)
+    return '\n\n'.join(paragrafos)
+
+
+class ExtractionTemplates:
+    """
+    Repositório de templates de extração aprendidos, persistido em JSON.
+    Seguro para uso concorrente pelas threads do scraper.
+    """
+
+    def __init__(self, diretorio=None):
+        """
+        Inicializa o repositório de templates.
+
+        Args:
+            diretorio (str): Diretório onde o templates.json é mantido
+        """
+        self.diretorio = diretorio or Config.EXTRACTION_TEMPLATES_DIR
+        self.arquivo = os.path.join(self.diretorio, 'templates.json')
+        self.min_palavras = Config.TEMPLATE_MIN_WORDS
+        self.max_falhas = Config.TEMPLATE_MAX_FAILURES
+        self.max_por_dominio = Config.TEMPLATE_MAX_PER_DOMAIN
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._templates, self._descartados = self._carregar()
+
+
+    def extrair(self, url, html):
+        """
+        Tenta extrair a notícia usando os templates aprendidos do domínio.
+
+        Args:
+            url (str): URL da notícia
+            html (str): HTML já baixado
+
+        Returns:
+            dict ou None: Resultado no formato do ContentExtractor ou None
+        """
+        dominio, padrao = padrao_url(url)
+
+        with self._lock:
+            candidatos = list(self._templates.get(dominio, []))
+        if not candidatos or not html:
+            return None
+
+        candidatos.sort(key=lambda t: (t['padrao'] != padrao, -t.get('acertos', 0)))
+
+        try:
+            arvore = _parse_html(html)
+        except (etree.ParserError, ValueError):
+            return None
+
+        for template in candidatos:
+            resultado = self._aplicar(template, arvore, url)
+            if resultado:
+                self._registrar(dominio, template, acerto=True)
+                return resultado
+            if template['padrao'] == padrao:
+                self._registrar(dominio, template, acerto=False)
+
+        return None
+
+
+    def aprender(self, url, html, resultado):
+        """
+        Aprende um template a partir de uma extração bem-sucedida da cascata.
+
+        Args:
+            url (str): URL da notícia
+            html (str): HTML usado na extração
+            resultado (dict): Resultado vencedor da cascata
+
+        Returns:
+            bool: True se um template novo foi gravado
+        """
+        if not resultado or not resultado.get('sucesso') or not html:
+            return False
+        if resultado.get('metodo_extracao') == 'template':
+            return False
+
+        try:
+            arvore = _parse_html(html)
+        except (etree.ParserError, ValueError):
+            return False
+
+        corpo = self._aprender_corpo(arvore, resultado.get('texto') or '')
+        if not corpo:
+            return False
+
+        dominio, padrao = padrao_url(url)
+        template = {
+            'padrao': padrao,
+            'corpo': corpo,
+            'titulo': self._aprender_titulo(arvore, resultado.get('titulo') or ''),
+            'data': self._aprender_data(arvore, resultado.get('data_publicacao')),
+            'origem': resultado.get('metodo_extracao'),
+            'acertos': 0,
+            'falhas_seguidas': 0,
+            'criado_em': time.time()
+        }
+
+        if not self._aplicar(template, arvore, url):
+            return False
+
+        with self._lock:
+            lista = [t for t in self._templates.get(dominio, []) if t['padrao'] != padrao]
+            lista.append(template)
+            if len(lista) > self.max_por_dominio:
+                lista.sort(key=lambda t: t.get('acertos', 0), reverse=True)
+                lista = lista[:self.max_por_dominio]
+            self._templates[dominio] = lista
+            self._salvar()
+
+        print(f"  Template aprendido para {dominio}{padrao} ({template['origem']})")
+        return True
+
+
+    def _aplicar(self, template, arvore, url):
+        """Executa os seletores do template sobre a árvore já parseada."""
+        nos = self._xpath(template['corpo'])(arvore)
+        if len(nos) != 1 or not isinstance(nos[0], etree._Element):
+            return None
+
+        texto = _texto_corpo(nos[0])
+        if len(texto.split()) < self.min_palavras:
+            return None
+
+        titulo = None
+        for expr in ([template['titulo']] if template.get('titulo') else []) + _XPATHS_TITULO_FALLBACK:
+            titulo = self._valor(arvore, expr)
+            if titulo:
+                break
+        if not titulo:
+            return None
+
+        data = None
+        if template.get('data'):
+            valor = self._valor(arvore, template['data']) or ''
+            encontrado = _DATA_ISO.search(valor)
+            data = encontrado.group(1) if encontrado else None
+
+        return {
+            'url': url, 'titulo': titulo, 'texto': texto,
+            'data_publicacao': data, 'autor': None,
+            'metodo_extracao': 'template', 'sucesso': True, 'erro': None
+        }
+
+
+    def _aprender_corpo(self, arvore, texto):
+        """Localiza o contêiner que engloba os parágrafos extraídos."""
+        trechos = [_normalizar(p) for p in texto.split('\n')]
+        trechos = [t for t in trechos if len(t) >= 40][:8]
+        if not trechos:
+            return None
+
+        chaves = {t[:60] for t in trechos}
+        encontrados = [
+            p for p in arvore.iter('p', 'li')
+            if _normalizar(p.text_content())[:60] in chaves
+        ]
+        if len(encontrados) < min(2, len(trechos)):
+            return None
+
+        no = encontrados[0].getparent() if len(encontrados) == 1 else _ancestral_comum(encontrados)
+        palavras_base = None
+        for _ in range(4):
+            if no is None or no.tag in ('body', 'html'):
+                return None
+            palavras = len(_texto_corpo(no).split())
+            if palavras_base is None:
+                palavras_base = palavras
+            elif palavras > palavras_base * 1.5:
+                return None
+            seletor = _seletor_unico(arvore, no)
+            if seletor:
+                return seletor
+            no = no.getparent()
+        return None
+
+
+    def _aprender_titulo(self, arvore, titulo):
+        """Procura o h1 (ou og:title) que contém exatamente o título extraído."""
+        titulo = _normalizar(titulo)
+        if not titulo:
+            return None
+
+        for h1 in arvore.iter('h1'):
+            if _normalizar(h1.text_content()) == titulo:
+                seletor = _seletor_unico(arvore, h1)
+                if seletor:
+                    return seletor
+        return None
+
+
+    def _aprender_data(self, arvore, data_publicacao):
+        """Escolhe a meta/tag de data presente no documento."""
+        primeiro = None
+        for expr in _XPATHS_DATA:
+            valores = arvore.xpath(expr)
+            if not valores or not _DATA_ISO.search(str(valores[0])):
+                continue
+            if not data_publicacao or str(valores[0]).startswith(data_publicacao):
+                return expr
+            primeiro = primeiro or expr
+        return primeiro
+
+
+    def _valor(self, arvore, expr):
+        """Primeiro valor textual de um XPath (elemento ou atributo)."""
+        try:
+            valores = self._xpath(expr)(arvore)
+        except etree.XPathError:
+            return None
+        if not valores:
+            return None
+        valor = valores[0]
+        if isinstance(valor, etree._Element):
+            return _normalizar(valor.text_content()) or None
+        return _normalizar(str(valor)) or None
+
+
+    def _xpath(self, expr):
+        """XPath compilado (um cache por thread, pois lxml não compartilha)."""
+        compilados = getattr(self._local, 'compilados', None)
+        if compilados is None:
+            compilados = self._local.compilados = {}
+        if expr not in compilados:
+            compilados[expr] = etree.XPath(expr)
+        return compilados[expr]
+
+
+    def _registrar(self, dominio, template, acerto):
+        """Atualiza contadores e descarta templates que pararam de casar."""
+        with self._lock:
+            if acerto:
+                template['acertos'] = template.get('acertos', 0) + 1
+                template['falhas_seguidas'] = 0
+                return
+
+            template['falhas_seguidas'] = template.get('falhas_seguidas', 0) + 1
+            if template['falhas_seguidas'] < self.max_falhas:
+                return
+
+            lista = self._templates.get(dominio, [])
+            if template in lista:
+                lista.remove(template)
+                self._descartados[(dominio, template['padrao'], template['corpo'])] = time.time()
+                print(f"  Template descartado para {dominio}{template['padrao']}")
+                self._salvar()
+
+
+    def _carregar(self):
+        """
+        Returns:
+            tuple: (templates por domínio, {(dominio, padrao, corpo): descartado_em})
+        """
+        if not os.path.exists(self.arquivo):
+            return {}, {}
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except Exception as e:
+            print(f"  Erro ao ler templates de extração: {e}")
+            return {}, {}
+        if not isinstance(dados, dict):
+            return {}, {}
+        if 'templates' not in dados:
+            return dados, {}
+        descartados = {
+            (dominio, padrao, corpo): momento
+            for dominio, padrao, corpo, momento in dados.get('descartados', [])
+        }
+        return dados['templates'], descartados
+
+
+    def _vivo(self, dominio, template):
+        """False se o template foi descartado depois de aprendido."""
+        descartado_em = self._descartados.get((dominio, template.get('padrao'), template.get('corpo')))
+        return descartado_em is None or template.get('criado_em', 0) > descartado_em
+
+
+    def _mesclar_disco(self):
+        """
+        Incorpora o que outros processos (workers do parse_pool) gravaram:
+        templates novos e descartes, que também valem para as cópias em
+        memória aprendidas antes deles.
+        """
+        templates_disco, descartados_disco = self._carregar()
+        for chave, momento in descartados_disco.items():
+            if momento > self._descartados.get(chave, 0):
+                self._descartados[chave] = momento
+
+        for dominio in set(self._templates) | set(templates_disco):
+            lista = [t for t in self._templates.get(dominio, []) if self._vivo(dominio, t)]
+            conhecidos = {t['padrao'] for t in lista}
+            for template in templates_disco.get(dominio, []):
+                if template.get('padrao') not in conhecidos and self._vivo(dominio, template):
+                    lista.append(template)
+                    conhecidos.add(template.get('padrao'))
+            self._templates[dominio] = lista
+
+
+    def _salvar(self):
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            with trava_arquivo(f"{self.arquivo}.trava"):
+                self._mesclar_disco()
+                descartados = sorted(
+                    ([*chave, momento] for chave, momento in self._descartados.items()),
+                    key=lambda item: item[3]
+                )[-_MAX_DESCARTADOS:]
+                descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+                try:
+                    with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+                        json.dump(
+                            {'templates': self._templates, 'descartados': descartados},
+                            f, ensure_ascii=False, indent=2
+                        )
+                    os.replace(temporario, self.arquivo)
+                except Exception:
+                    if os.path.exists(temporario):
+                        os.remove(temporario)
+                    raise
+        except Exception as e:
+            print(f"  Erro ao salvar templates de extração: {e}")
+
+
+
+_templates_singleton = None
+_templates_lock = threading.Lock()
+
+
+def obter_templates():
+    """Retorna o repositório de templates compartilhado pelo processo."""
+    global _templates_singleton
+
+    if _templates_singleton is None:
+        with _templates_lock:
+            if _templates_singleton is None:
+                _templates_singleton = ExtractionTemplates()
+
+    return _templates_singleton
@@ -3,6 +3,7 @@ extractor.py - Módulo de Extração de Conteúdo (Melhorado)
 
 Responsabilidade:
     Extrair conteúdo textual de URLs de notícias com múltiplas estratégias:
+    0. JSON-LD/OpenGraph e templates aprendidos por domínio (caminhos rápidos)
     1. newspaper3k (principal)
     2. trafilatura (fallback 1)
     3. AMP pages (fallback 2)
@@ -14,13 +15,16 @@ Autor: Projeto Acadêmico
 Data: 2025
 """
 
-import requests
 from newspaper import Article
 from bs4 import BeautifulSoup
 import validators
 from datetime import datetime
 from config import Config
-import time
+from modules.extraction_templates import obter_templates
+from modules.structured_data import resultado_estruturado
+from modules.fetcher import baixar_html, ConteudoNaoHTML
+from modules.retry_policy import RetryPolicy, classificar_erro
+from modules.url_canonical import registrar_canonico_html
 import random
 
                    
@@ -42,29 +46,98 @@ except ImportError:
 class ContentExtractor:
     """Extrator com múltiplas estratégias de fallback."""
     
-    def __init__(self):
+    def __init__(self, parse_pool=None, baixar_amp=True):
+        """
+        Args:
+            parse_pool (ParsePool): Pool de processos para o parsing (opcional).
+                Sem pool, a extração roda na própria thread chamadora.
+            baixar_amp (bool): Baixar a versão AMP durante a cascata. Nos
+                workers do pool é False: a URL AMP volta em 'amp_url' e o
+                download fica com a thread.
+        """
         self.timeout = Config.REQUEST_TIMEOUT
         self.headers = Config.DEFAULT_HEADERS.copy()
-        self.retry_attempts = Config.MAX_RETRIES
-        self.retry_delay = Config.RETRY_DELAY
+        self.retry_policy = RetryPolicy()
+        self.templates = obter_templates() if Config.ENABLE_EXTRACTION_TEMPLATES else None
+        self.parse_pool = parse_pool
+        self.baixar_amp = baixar_amp
     
     def extract(self, url):
-        """Extrai conteúdo com 6 estratégias de fallback."""
+        """Extrai conteúdo com templates aprendidos e 6 estratégias de fallback."""
         
                      
         if not self._validar_url(url):
-            return self._resultado_erro(url, 'URL inválida')
+            return self._resultado_erro(url, 'URL inválida', classe_falha='url_invalida')
         
                     
-        html = self._obter_html(url)
+        html, classe_falha = self._obter_html_classificado(url)
         if not html:
-            return self._resultado_erro(url, 'Não foi possível obter HTML')
+            return self._resultado_erro(url, 'Não foi possível obter HTML', classe_falha=classe_falha)
         
+        if self.parse_pool:
+            resultado = self.parse_pool.extrair(url, html)
+            amp_url = resultado.pop('amp_url', None)
+            if amp_url:
+                resultado = self._completar_com_amp(resultado, amp_url)
+            return resultado
+        return self.extrair_de_html(url, html)
+    
+    def _completar_com_amp(self, resultado, amp_url):
+        """Baixa a versão AMP nesta thread e a extrai no pool (fallback 2)."""
+        print("  Tentando AMP...")
+        amp_html = self._obter_html(amp_url)
+        if not amp_html:
+            return resultado
+        resultado_amp = self.parse_pool.extrair_amp(amp_url, amp_html)
+        if not resultado_amp['sucesso']:
+            return resultado
+        if resultado['sucesso'] and len(resultado['texto'].split()) >= len(resultado_amp['texto'].split()):
+            return resultado
+        return resultado_amp
+    
+    def extrair_de_amp(self, amp_url, amp_html):
+        """
+        Extração da versão AMP já baixada (trafilatura).
+        
+        Returns:
+            dict: Resultado padronizado da extração
+        """
+        if not TRAFILATURA_AVAILABLE:
+            return self._resultado_erro(amp_url, 'AMP: trafilatura não disponível', 'amp')
+        return self._extrair_trafilatura(amp_html, amp_url)
+    
+    def extrair_de_html(self, url, html):
+        """
+        Etapa de CPU da extração: JSON-LD, templates, cascata e aprendizado.
+        
+        Args:
+            url (str): URL da notícia
+            html (str): HTML já baixado
+            
+        Returns:
+            dict: Resultado padronizado da extração
+        """
+        resultado = resultado_estruturado(url, html)
+        if resultado:
+            return resultado
+        
+        if self.templates:
+            resultado = self.templates.extrair(url, html)
+            if resultado:
+                return resultado
+        
+        resultado = self._extrair_cascata(url, html)
+        if self.templates and resultado['sucesso']:
+            self.templates.aprender(url, html, resultado)
+        return resultado
+    
+    def _extrair_cascata(self, url, html):
+        """Executa as 6 estratégias genéricas e devolve a melhor extração."""
         melhor_resultado = None
         melhor_tamanho = 0
         
                                    
-        resultado = self._extrair_newspaper(url)
+        resultado = self._extrair_newspaper(url, html)
         if resultado['sucesso']:
             tamanho = len(resultado['texto'].split())
             if tamanho >= 80:
@@ -85,15 +158,19 @@ class ContentExtractor:
                     melhor_tamanho = tamanho
         
                            
-        print("  Tentando AMP...")
-        resultado = self._extrair_amp(html, url)
-        if resultado['sucesso']:
-            tamanho = len(resultado['texto'].split())
-            if tamanho > melhor_tamanho:
-                if tamanho >= 80:
-                    return resultado
-                melhor_resultado = resultado
-                melhor_tamanho = tamanho
+        amp_url = None
+        if self.baixar_amp:
+            print("  Tentando AMP...")
+            resultado = self._extrair_amp(html, url)
+            if resultado['sucesso']:
+                tamanho = len(resultado['texto'].split())
+                if tamanho > melhor_tamanho:
+                    if tamanho >= 80:
+                        return resultado
+                    melhor_resultado = resultado
+                    melhor_tamanho = tamanho
+        else:
+            amp_url = self._url_amp(html, url)
         
                                    
         if READABILITY_AVAILABLE:
@@ -128,7 +205,10 @@ class ContentExtractor:
                 melhor_resultado = resultado
                 melhor_tamanho = tamanho
         
-        return melhor_resultado or self._resultado_erro(url, 'Todas estratégias falharam')
+        resultado = melhor_resultado or self._resultado_erro(url, 'Todas estratégias falharam', classe_falha='extracao')
+        if amp_url:
+            resultado['amp_url'] = amp_url
+        return resultado
     
     def _validar_url(self, url):
         """Valida se URL está no formato correto."""
@@ -140,49 +220,69 @@ class ContentExtractor:
             return False
         return True
     
+    def obter_html(self, url):
+        """
+        Baixa o HTML de uma URL válida (sem extrair conteúdo).
+        
+        Returns:
+            str: HTML ou string vazia em caso de falha
+        """
+        if not self._validar_url(url):
+            return ""
+        return self._obter_html(url)
+    
     def _obter_html(self, url):
-        """Obtém HTML com retry."""
-        for tentativa in range(self.retry_attempts):
-            try:
-                headers = self.headers.copy()
-                headers['User-Agent'] = random.choice(Config.USER_AGENTS)
-                response = requests.get(url, headers=headers, timeout=self.timeout, allow_redirects=True)
-                response.raise_for_status()
-                return response.text
-            except Exception:
-                if tentativa < self.retry_attempts - 1:
-                    time.sleep(self.retry_delay)
-        return ""
+        """Obtém HTML em streaming, repetindo apenas falhas transitórias."""
+        return self._obter_html_classificado(url)[0]
     
-    def _extrair_newspaper(self, url):
-        """Extração com newspaper3k."""
-        for tentativa in range(self.retry_attempts):
-            try:
-                article = Article(url, language='pt')
-                article.config.request_timeout = self.timeout
-                article.config.headers = self.headers
-                article.download()
-                article.parse()
-                
-                titulo = article.title
-                texto = article.text
-                
-                if not titulo or not texto or len(texto.split()) < 20:
-                    raise Exception("Conteúdo insuficiente")
-                
-                data = article.publish_date.strftime('%Y-%m-%d') if article.publish_date else None
-                autor = article.authors[0] if article.authors else None
-                
-                return {
-                    'url': url, 'titulo': titulo.strip(), 'texto': texto.strip(),
-                    'data_publicacao': data, 'autor': autor,
-                    'metodo_extracao': 'newspaper3k', 'sucesso': True, 'erro': None
-                }
-            except Exception as e:
-                if tentativa < self.retry_attempts - 1:
-                    time.sleep(self.retry_delay)
+    def _obter_html_classificado(self, url):
+        """
+        Como _obter_html, mas também informa a classe da falha.
         
-        return self._resultado_erro(url, 'newspaper3k falhou', 'newspaper3k')
+        Returns:
+            tuple: (html ou "", classe_falha ou None) - ver classificar_erro()
+        """
+        try:
+            html = self.retry_policy.executar(self._baixar, url)
+            registrar_canonico_html(url, html)
+            return html, None
+        except ConteudoNaoHTML as e:
+            print(f"  Ignorando {url[:60]}: {e}")
+            return "", 'nao_html'
+        except Exception as e:
+            classe = classificar_erro(e)
+            print(f"  Falha ao obter HTML ({classe}): {url[:60]}")
+            return "", classe
+    
+    def _baixar(self, url):
+        """Uma tentativa de download, com User-Agent rotativo."""
+        headers = self.headers.copy()
+        headers['User-Agent'] = random.choice(Config.USER_AGENTS)
+        return baixar_html(url, headers=headers, timeout=self.timeout)
+    
+    def _extrair_newspaper(self, url, html):
+        """Extração com newspaper3k sobre o HTML já baixado."""
+        try:
+            article = Article(url, language='pt')
+            article.download(input_html=html)
+            article.parse()
+            
+            titulo = article.title
+            texto = article.text
+            
+            if not titulo or not texto or len(texto.split()) < 20:
+                raise Exception("Conteúdo insuficiente")
+            
+            data = article.publish_date.strftime('%Y-%m-%d') if article.publish_date else None
+            autor = article.authors[0] if article.authors else None
+            
+            return {
+                'url': url, 'titulo': titulo.strip(), 'texto': texto.strip(),
+                'data_publicacao': data, 'autor': autor,
+                'metodo_extracao': 'newspaper3k', 'sucesso': True, 'erro': None
+            }
+        except Exception as e:
+            return self._resultado_erro(url, f'newspaper3k: {e}', 'newspaper3k')
     
     def _extrair_trafilatura(self, html, url):
         """Extração com trafilatura."""
@@ -203,19 +303,28 @@ class ContentExtractor:
         except Exception as e:
             return self._resultado_erro(url, f'trafilatura: {e}', 'trafilatura')
     
-    def _extrair_amp(self, html, url):
-        """Extração de versão AMP."""
+    def _url_amp(self, html, url):
+        """URL absoluta da versão AMP (link rel=amphtml), ou None."""
         try:
             soup = BeautifulSoup(html, 'lxml')
             amp_link = soup.find('link', rel=lambda x: x and 'amphtml'in str(x).lower())
-            
-            if amp_link and amp_link.get('href'):
-                amp_url = amp_link['href']
-                if amp_url.startswith('/'):
-                    from urllib.parse import urlparse
-                    parsed = urlparse(url)
-                    amp_url = f"{parsed.scheme}://{parsed.netloc}{amp_url}"
-                
+        except Exception:
+            return None
+        
+        if not amp_link or not amp_link.get('href'):
+            return None
+        amp_url = amp_link['href']
+        if amp_url.startswith('/'):
+            from urllib.parse import urlparse
+            parsed = urlparse(url)
+            amp_url = f"{parsed.scheme}://{parsed.netloc}{amp_url}"
+        return amp_url
+    
+    def _extrair_amp(self, html, url):
+        """Extração de versão AMP."""
+        try:
+            amp_url = self._url_amp(html, url)
+            if amp_url:
                 amp_html = self._obter_html(amp_url)
                 if amp_html and TRAFILATURA_AVAILABLE:
                     return self._extrair_trafilatura(amp_html, amp_url)
@@ -275,69 +384,66 @@ class ContentExtractor:
     
     def _extrair_beautifulsoup(self, url, html=None):
         """Extração genérica com BeautifulSoup."""
-        for tentativa in range(self.retry_attempts):
-            try:
+        try:
+            if not html:
+                html = self._obter_html(url)
                 if not html:
-                    html = self._obter_html(url)
-                    if not html:
-                        raise Exception("HTML vazio")
-                
-                soup = BeautifulSoup(html, 'lxml')
-                
-                        
-                titulo = None
-                meta_title = soup.find('meta', property='og:title')
-                if meta_title and meta_title.get('content'):
-                    titulo = meta_title.get('content')
-                if not titulo:
-                    title_tag = soup.find('title')
-                    if title_tag:
-                        titulo = title_tag.get_text()
-                if not titulo:
-                    h1 = soup.find('h1')
-                    if h1:
-                        titulo = h1.get_text()
-                
-                       
-                texto = None
-                article_tag = soup.find('article')
-                if article_tag:
-                    paragrafos = article_tag.find_all('p')
-                    texto = '\n\n'.join([p.get_text().strip() for p in paragrafos if p.get_text().strip()])
-                
-                if not texto or len(texto.split()) < 20:
-                    content_divs = soup.find_all('div', class_=['content', 'article-content', 'post-content', 'entry-content'])
-                    for div in content_divs:
-                        paragrafos = div.find_all('p')
-                        texto_temp = '\n\n'.join([p.get_text().strip() for p in paragrafos if p.get_text().strip()])
-                        if len(texto_temp.split()) > len((texto or '').split()):
-                            texto = texto_temp
-                
-                if not texto or len(texto.split()) < 20:
-                    paragrafos = soup.find_all('p')
-                    texto = '\n\n'.join([p.get_text().strip() for p in paragrafos if len(p.get_text().strip()) > 50])
-                
-                if not titulo or not texto or len(texto.split()) < 20:
-                    raise Exception("Conteúdo insuficiente")
-                
-                return {
-                    'url': url, 'titulo': titulo.strip(), 'texto': texto.strip()[:Config.MAX_CONTENT_LENGTH],
-                    'data_publicacao': None, 'autor': None,
-                    'metodo_extracao': 'beautifulsoup', 'sucesso': True, 'erro': None
-                }
+                    raise Exception("HTML vazio")
+            
+            soup = BeautifulSoup(html, 'lxml')
+            
+                    
+            titulo = None
+            meta_title = soup.find('meta', property='og:title')
+            if meta_title and meta_title.get('content'):
+                titulo = meta_title.get('content')
+            if not titulo:
+                title_tag = soup.find('title')
+                if title_tag:
+                    titulo = title_tag.get_text()
+            if not titulo:
+                h1 = soup.find('h1')
+                if h1:
+                    titulo = h1.get_text()
+            
+                   
+            texto = None
+            article_tag = soup.find('article')
+            if article_tag:
+                paragrafos = article_tag.find_all('p')
+                texto = '\n\n'.join([p.get_text().strip() for p in paragrafos if p.get_text().strip()])
+            
+            if not texto or len(texto.split()) < 20:
+                content_divs = soup.find_all('div', class_=['content', 'article-content', 'post-content', 'entry-content'])
+                for div in content_divs:
+                    paragrafos = div.find_all('p')
+                    texto_temp = '\n\n'.join([p.get_text().strip() for p in paragrafos if p.get_text().strip()])
+                    if len(texto_temp.split()) > len((texto or '').split()):
+                        texto = texto_temp
+            
+            if not texto or len(texto.split()) < 20:
+                paragrafos = soup.find_all('p')
+                texto = '\n\n'.join([p.get_text().strip() for p in paragrafos if len(p.get_text().strip()) > 50])
+            
+            if not titulo or not texto or len(texto.split()) < 20:
+                raise Exception("Conteúdo insuficiente")
             
-            except Exception as e:
-                if tentativa < self.retry_attempts - 1:
-                    time.sleep(self.retry_delay)
+            return {
+                'url': url, 'titulo': titulo.strip(), 'texto': texto.strip()[:Config.MAX_CONTENT_LENGTH],
+                'data_publicacao': None, 'autor': None,
+                'metodo_extracao': 'beautifulsoup', 'sucesso': True, 'erro': None
+            }
         
-        return self._resultado_erro(url, 'BeautifulSoup falhou', 'beautifulsoup')
+        except Exception as e:
+            return self._resultado_erro(url, f'BeautifulSoup: {e}', 'beautifulsoup')
     
-    def _resultado_erro(self, url, erro, metodo=None):
+    def _resultado_erro(self, url, erro, metodo=None, classe_falha=None):
         """Retorna resultado de erro padronizado."""
         return {
             'url': url, 'titulo': None, 'texto': None,
             'data_publicacao': None, 'autor': None,
-            'metodo_extracao': metodo, 'sucesso': False, 'erro': erro
+            'metodo_extracao': metodo, 'sucesso': False, 'erro': erro,
+            'classe_falha': classe_falha
         }
 
 
@@ -0,0 +1,148 @@
+"""
+fetcher.py - Download Limitado de Páginas HTML
+
+Responsabilidade:
+    Baixar o HTML das notícias em modo streaming, sem nunca carregar a
+    resposta inteira na memória:
+    - Verifica o Content-Type antes de ler o corpo
+    - Reconhece assinaturas binárias (PDF, imagens, vídeo) no primeiro bloco
+    - Decodifica o charset de forma incremental
+    - Interrompe a leitura ao atingir Config.MAX_HTML_BYTES ou o tempo total
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import codecs
+import re
+import time
+
+import requests
+
+from config import Config
+from modules.url_canonical import registrar_alias
+
+
+CHUNK_SIZE = 16384
+
+_ASSINATURAS_BINARIAS = (
+    b'%PDF',
+    b'\x89PNG',
+    b'GIF8',
+    b'\xff\xd8\xff',
+    b'PK\x03\x04',
+    b'ID3',
+    b'OggS',
+    b'RIFF',
+    b'\x1aE\xdf\xa3',
+)
+
+_CHARSET_HEADER = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+_CHARSET_META = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+
+class ConteudoNaoHTML(Exception):
+    """A resposta não é uma página HTML (PDF, vídeo, imagem...)."""
+
+
+def _assinatura_binaria(chunk):
+    """Detecta formatos binários pelos primeiros bytes da resposta."""
+    inicio = chunk.lstrip()[:16]
+    if inicio.startswith(_ASSINATURAS_BINARIAS):
+        return True
+    return chunk[4:8] == b'ftyp'
+
+
+def _detectar_charset(content_type, primeiro_chunk):
+    """
+    Escolhe o charset: header HTTP, depois <meta charset> e por fim UTF-8.
+
+    Returns:
+        str: Nome de codec válido
+    """
+    candidatos = []
+    encontrado = _CHARSET_HEADER.search(content_type or '')
+    if encontrado:
+        candidatos.append(encontrado.group(1))
+    encontrado = _CHARSET_META.search(primeiro_chunk[:4096])
+    if encontrado:
+        candidatos.append(encontrado.group(1).decode('ascii', 'ignore'))
+
+    for charset in candidatos:
+        try:
+            codecs.lookup(charset)
+            return charset
+        except LookupError:
+            continue
+    return 'utf-8'
+
+
+def baixar_html(url, headers=None, timeout=None, max_bytes=None, session=None):
+    """
+    Baixa uma página HTML com limite de bytes e de tempo total.
+
+    Páginas maiores que o limite são truncadas (o corpo das matérias fica no
+    início do documento); respostas que não são HTML são abortadas antes de
+    qualquer leitura do corpo.
+
+    Args:
+        url (str): URL da página
+        headers (dict): Headers HTTP
+        timeout (float): Timeout de conexão/leitura e orçamento total (s)
+        max_bytes (int): Máximo de bytes lidos (padrão Config.MAX_HTML_BYTES)
+        session (requests.Session): Sessão opcional para reaproveitar conexões
+
+    Returns:
+        str: HTML decodificado
+
+    Raises:
+        ConteudoNaoHTML: Content-Type ou assinatura não são HTML
+        requests.RequestException: Falhas de rede ou status HTTP de erro
+    """
+    cliente = session or requests
+    timeout = timeout or Config.REQUEST_TIMEOUT
+    limite = max_bytes or Config.MAX_HTML_BYTES
+    prazo = time.monotonic() + max(timeout, Config.SCRAPING_TIMEOUT)
+
+    with cliente.get(url, headers=headers, timeout=timeout,
+                     allow_redirects=True, stream=True) as response:
+        response.raise_for_status()
+        if response.history:
+            registrar_alias(url, response.url)
+
+        content_type = response.headers.get('Content-Type', '')
+        tipo = content_type.split(';')[0].strip().lower()
+        if tipo and tipo not in Config.HTML_CONTENT_TYPES:
+            raise ConteudoNaoHTML(f"Content-Type não suportado: {tipo}")
+
+        decoder = None
+        partes = []
+        lidos = 0
+
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if not chunk:
+                continue
+
+            if decoder is None:
+                if _assinatura_binaria(chunk):
+                    raise ConteudoNaoHTML("Conteúdo binário recebido")
+                charset = _detectar_charset(content_type, chunk)
+                decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+
+            restante = limite - lidos
+            if len(chunk) >= restante:
+                partes.append(decoder.decode(chunk[:restante], final=True))
+                print(f"  HTML truncado em {limite} bytes: {url[:60]}...")
+                return ''.join(partes)
+
+            partes.append(decoder.decode(chunk))
+            lidos += len(chunk)
+
+            if time.monotonic() > prazo:
+                print(f"  Tempo total de download excedido: {url[:60]}...")
+                break
+
+        if decoder is not None:
+            partes.append(decoder.decode(b'', final=True))
+
+    return ''.join(partes)
@@ -7,6 +7,8 @@ Responsabilidade:
     - Filtrar notícias antigas
     - Verificar correlação de título
     - Blacklist de domínios problemáticos
+    - URLs que falharam recentemente no scraping (cache negativo)
+    - Variantes da mesma matéria (utm, AMP, redirects) - url_canonical.py
 
 Autor: Projeto Acadêmico
 Data: 2025
@@ -16,6 +18,8 @@ from datetime import datetime, timedelta
 from urllib.parse import urlparse
 import re
 from config import Config
+from modules.negative_cache import obter_cache_negativo
+from modules.url_canonical import chave_url
 
 
 class ContentFilter:
@@ -69,6 +73,7 @@ class ContentFilter:
         resultados_filtrados = {}
         total_original = 0
         total_filtrado = 0
+        vistos = set()
         
         for fonte_nome, fonte_resultados in resultados_busca.items():
             if fonte_nome == 'metadata':
@@ -83,10 +88,12 @@ class ContentFilter:
                                     
             filtrados = []
             for resultado in fonte_resultados:
-                if self._validar_resultado_busca(resultado, fonte_nome):
-                    filtrados.append(resultado)
-                else:
+                if not self._validar_resultado_busca(resultado, fonte_nome):
                     print(f"     Filtrado: {resultado['url'][:60]}...")
+                elif self._duplicada(resultado.get('url'), vistos):
+                    print(f"     Duplicada: {resultado['url'][:60]}...")
+                else:
+                    filtrados.append(resultado)
             
             resultados_filtrados[fonte_nome] = filtrados
             total_filtrado += len(filtrados)
@@ -122,6 +129,7 @@ class ContentFilter:
         conteudos_filtrados = {}
         total_original = 0
         total_filtrado = 0
+        vistos = set()
         
                                                      
         termos_principais = self._extrair_termos_principais(texto_original)
@@ -140,6 +148,8 @@ class ContentFilter:
             filtrados = []
             for conteudo in fonte_conteudos:
                 motivo_filtro = self._validar_conteudo_scraping(conteudo, termos_principais)
+                if not motivo_filtro and self._duplicada(conteudo.get('url'), vistos):
+                    motivo_filtro = "Matéria duplicada (mesma URL canônica)"
                 
                 if not motivo_filtro:
                     filtrados.append(conteudo)
@@ -164,6 +174,33 @@ class ContentFilter:
         return conteudos_filtrados
     
     
+    def _falha_recente(self, url):
+        """Entrada do cache negativo da URL, se houver."""
+        if not (Config.ENABLE_CACHE and Config.ENABLE_NEGATIVE_CACHE):
+            return None
+        return obter_cache_negativo().obter(url)
+    
+    
+    def _duplicada(self, url, vistos):
+        """
+        Marca a URL canônica como vista e indica se ela já tinha aparecido.
+        
+        Args:
+            url (str): URL do resultado/conteúdo
+            vistos (set): URLs canônicas já aceitas nesta etapa
+            
+        Returns:
+            bool: True se for variante de uma URL já aceita
+        """
+        chave = chave_url(url)
+        if not chave:
+            return False
+        if chave in vistos:
+            return True
+        vistos.add(chave)
+        return False
+    
+    
     def _validar_resultado_busca(self, resultado, fonte_nome):
         """
         Valida se um resultado de busca deve ser mantido.
@@ -208,6 +245,11 @@ class ContentFilter:
         if path in ['/', '']:
             return False
         
+        falha = self._falha_recente(url)
+        if falha:
+            print(f"     Falha recente no scraping ({falha['classe_falha']})")
+            return False
+        
                                                             
         if fonte_nome == 'Folha de S.Paulo':
                                                                        
@@ -0,0 +1,183 @@
+"""
+inference_batcher.py - Micro-lotes de Inferência entre Requisições
+
+Responsabilidade:
+    Com carga concorrente, várias threads do Flask chamam encode() ao mesmo
+    tempo, cada uma com poucos textos: disputam o GIL e o pool de threads
+    intra-op do PyTorch, e a vazão cai em vez de subir.
+
+    O DespachanteInferencia envolve um modelo (mesma interface encode()):
+    os pedidos de todas as threads entram numa fila, e uma única thread de
+    inferência junta os que chegarem em até Config.INFERENCE_BATCH_WAIT_MS
+    (ou até Config.INFERENCE_MAX_BATCH textos), faz UMA passada em lote e
+    devolve a fatia de cada pedido pelo seu Future. Se o lote falhar, cada
+    pedido é refeito sozinho e só o que falhar de novo recebe o erro.
+
+    configurar_threads_torch() aplica Config.TORCH_NUM_THREADS e
+    Config.TORCH_INTEROP_THREADS antes do modelo ser carregado.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from config import Config
+
+
+def configurar_threads_torch():
+    """
+    Aplica os limites de threads do PyTorch definidos na configuração
+    (0 = padrão do PyTorch).
+
+    Returns:
+        dict: {'intra_op', 'inter_op'} em vigor, ou {} sem PyTorch
+    """
+    try:
+        import torch
+    except ImportError:
+        return {}
+
+    if Config.TORCH_NUM_THREADS:
+        torch.set_num_threads(Config.TORCH_NUM_THREADS)
+    if Config.TORCH_INTEROP_THREADS:
+        try:
+            torch.set_num_interop_threads(Config.TORCH_INTEROP_THREADS)
+        except RuntimeError:
+            pass
+    return {'intra_op': torch.get_num_threads(), 'inter_op': torch.get_num_interop_threads()}
+
+
+class DespachanteInferencia:
+    """
+    Junta os encode() concorrentes num único lote por passada do modelo.
+    """
+
+    def __init__(self, modelo, espera_ms=None, max_lote=None):
+        """
+        Args:
+            modelo: Objeto com encode() (SentenceTransformer, BackendONNX...)
+            espera_ms (float): Quanto esperar por mais pedidos (padrão Config.INFERENCE_BATCH_WAIT_MS)
+            max_lote (int): Textos por passada (padrão Config.INFERENCE_MAX_BATCH)
+        """
+        self.modelo = modelo
+        self.espera = (Config.INFERENCE_BATCH_WAIT_MS if espera_ms is None else espera_ms) / 1000.0
+        self.max_lote = max_lote or Config.INFERENCE_MAX_BATCH
+
+        self._fila = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {'pedidos': 0, 'lotes': 0, 'textos': 0, 'maior_lote': 0}
+
+
+    def __getattr__(self, nome):
+        if nome == 'modelo':
+            raise AttributeError(nome)
+        return getattr(self.modelo, nome)
+
+
+    def _iniciar(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name="inference-batcher", daemon=True)
+                self._thread.start()
+
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True, **kwargs):
+        """
+        Mesma assinatura básica de SentenceTransformer.encode(); bloqueia
+        até o lote que contém estes textos ser processado.
+
+        Returns:
+            np.ndarray: (n, dimensão) float32, ou vetor único se `textos` for str
+        """
+        unico = isinstance(textos, str)
+        textos = [textos] if unico else list(textos)
+        if not textos:
+            return self.modelo.encode(textos, batch_size=batch_size, convert_to_numpy=True)
+
+        self._iniciar()
+        futuro = Future()
+        self._fila.put((textos, futuro))
+        vetores = futuro.result()
+        return vetores[0] if unico else vetores
+
+
+    def _coletar(self):
+        """Primeiro pedido da fila mais os que chegarem dentro da janela."""
+        lote = [self._fila.get()]
+        total = len(lote[0][0])
+        prazo = time.monotonic() + self.espera
+        while total < self.max_lote:
+            restante = prazo - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                pedido = self._fila.get(timeout=restante)
+            except queue.Empty:
+                break
+            lote.append(pedido)
+            total += len(pedido[0])
+        return lote, total
+
+
+    def _executar(self):
+        while True:
+            lote, total = self._coletar()
+            textos = [texto for pedido, _ in lote for texto in pedido]
+            try:
+                vetores = np.asarray(self.modelo.encode(
+                    textos, batch_size=Config.EMBEDDING_BATCH_SIZE, convert_to_numpy=True
+                ))
+            except Exception as e:
+                self._isolar_falha(lote, e)
+                continue
+
+            inicio = 0
+            for pedido, futuro in lote:
+                futuro.set_result(vetores[inicio:inicio + len(pedido)])
+                inicio += len(pedido)
+
+            with self._lock:
+                self._stats['pedidos'] += len(lote)
+                self._stats['lotes'] += 1
+                self._stats['textos'] += total
+                self._stats['maior_lote'] = max(self._stats['maior_lote'], total)
+
+
+    def _isolar_falha(self, lote, erro):
+        """
+        Um texto inválido não pode derrubar os pedidos alheios que caíram
+        no mesmo lote: cada pedido é refeito sozinho e só os que falham de
+        novo recebem o erro.
+        """
+        if len(lote) == 1:
+            lote[0][1].set_exception(erro)
+            return
+        for pedido, futuro in lote:
+            try:
+                futuro.set_result(np.asarray(self.modelo.encode(
+                    pedido, batch_size=Config.EMBEDDING_BATCH_SIZE, convert_to_numpy=True
+                )))
+            except Exception as e:
+                futuro.set_exception(e)
+
+
+    def estatisticas(self):
+        """Pedidos, lotes, textos e média de textos por passada."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['media_lote'] = round(stats['textos'] / stats['lotes'], 2) if stats['lotes'] else 0.0
+        return stats
+
+
+def com_micro_lotes(modelo):
+    """Envolve o modelo num DespachanteInferencia se Config.ENABLE_INFERENCE_BATCHER."""
+    if not Config.ENABLE_INFERENCE_BATCHER or isinstance(modelo, DespachanteInferencia):
+        return modelo
+    return DespachanteInferencia(modelo)
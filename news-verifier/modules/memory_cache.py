@@ -0,0 +1,201 @@
+"""
+memory_cache.py - Camada LRU em Memória para os Caches em Disco
+
+Responsabilidade:
+    Durante um pico de notícias, as mesmas matérias são pedidas por várias
+    verificações seguidas e cada ScraperCache.obter() repetia exists +
+    open + json.load (+ descompressão) no disco.
+
+    CacheMemoria é um LRU thread-safe, limitado por número de entradas e
+    por bytes estimados, com validade por entrada e contadores de
+    acertos/faltas. Fica na frente do disco (leitura) e recebe as gravações
+    (write-through).
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+
+_BYTES_FIXOS = 64
+
+
+def tamanho_estimado(valor):
+    """
+    Estimativa barata do peso de um valor em memória (sem serializar).
+
+    Args:
+        valor: dict/list/str/número
+
+    Returns:
+        int: Bytes aproximados
+    """
+    if isinstance(valor, str):
+        return _BYTES_FIXOS + len(valor)
+    if isinstance(valor, dict):
+        return _BYTES_FIXOS + sum(len(str(k)) + tamanho_estimado(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return _BYTES_FIXOS + sum(tamanho_estimado(v) for v in valor)
+    return _BYTES_FIXOS
+
+
+class CacheMemoria:
+    """
+    LRU limitado por entradas e bytes, seguro para várias threads.
+    Os valores (dicts) são copiados na entrada e na saída para que quem
+    recebe possa alterá-los sem corromper o cache.
+    """
+
+    def __init__(self, max_entradas=None, max_bytes=None):
+        """
+        Args:
+            max_entradas (int): Limite de itens (padrão Config.MEMORY_CACHE_MAX_ENTRIES)
+            max_bytes (int): Limite de bytes estimados (padrão Config.MEMORY_CACHE_MAX_BYTES)
+        """
+        self.max_entradas = max_entradas or Config.MEMORY_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or Config.MEMORY_CACHE_MAX_BYTES
+
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+        self.despejos = 0
+        self.expirados = 0
+
+
+    def obter(self, chave, agora=None):
+        """
+        Args:
+            chave (str): Chave do item
+            agora (float): Timestamp atual (padrão time.time())
+
+        Returns:
+            Cópia do valor ou None (ausente ou expirado)
+        """
+        agora = time.time() if agora is None else agora
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.faltas += 1
+                return None
+
+            valor, expira_em, _ = item
+            if expira_em is not None and agora >= expira_em:
+                self._remover(chave)
+                self.expirados += 1
+                self.faltas += 1
+                return None
+
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+        return _copiar(valor)
+
+
+    def guardar(self, chave, valor, expira_em=None):
+        """
+        Guarda (ou substitui) um item, despejando os menos usados se preciso.
+
+        Args:
+            chave (str): Chave do item
+            valor: Valor (dict, list ou escalar)
+            expira_em (float): Timestamp de validade (None = sem validade)
+        """
+        tamanho = tamanho_estimado(valor)
+        if tamanho > self.max_bytes:
+            self.invalidar(chave)
+            return
+
+        valor = _copiar(valor)
+        with self._lock:
+            self._remover(chave)
+            self._itens[chave] = (valor, expira_em, tamanho)
+            self._bytes += tamanho
+
+            while len(self._itens) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, _, peso) = self._itens.popitem(last=False)
+                self._bytes -= peso
+                self.despejos += 1
+
+
+    def invalidar(self, chave):
+        """Remove um item (se existir)."""
+        with self._lock:
+            self._remover(chave)
+
+
+    def limpar(self):
+        """Esvazia o cache (mantém os contadores)."""
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+
+    def _remover(self, chave):
+        item = self._itens.pop(chave, None)
+        if item is not None:
+            self._bytes -= item[2]
+
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: entradas, bytes, acertos, faltas, taxa_acerto, despejos, expirados
+        """
+        with self._lock:
+            consultas = self.acertos + self.faltas
+            return {
+                'entradas': len(self._itens),
+                'bytes': self._bytes,
+                'acertos': self.acertos,
+                'faltas': self.faltas,
+                'taxa_acerto': round(self.acertos / consultas, 3) if consultas else 0.0,
+                'despejos': self.despejos,
+                'expirados': self.expirados
+            }
+
+
+def _copiar(valor):
+    if isinstance(valor, dict):
+        return dict(valor)
+    if isinstance(valor, list):
+        return list(valor)
+    return valor
+
+
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def obter_cache_memoria(nome):
+    """
+    Retorna a camada em memória compartilhada de um cache (uma por nome/
+    diretório no processo), ou None se desativada.
+
+    Args:
+        nome (str): Identificador do cache em disco (ex.: o diretório)
+    """
+    if not Config.ENABLE_MEMORY_CACHE:
+        return None
+
+    with _caches_lock:
+        if nome not in _caches:
+            _caches[nome] = CacheMemoria()
+        return _caches[nome]
+
+
+def estatisticas_caches_memoria():
+    """
+    Returns:
+        dict: nome → estatisticas() de cada camada criada
+    """
+    with _caches_lock:
+        caches = dict(_caches)
+    return {nome: cache.estatisticas() for nome, cache in caches.items()}
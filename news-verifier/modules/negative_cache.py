@@ -0,0 +1,184 @@
+"""
+negative_cache.py - Cache Negativo do Scraping
+
+Responsabilidade:
+    Lembrar as URLs cuja extração falhou recentemente, com validade
+    conforme a classe da falha (Config.NEGATIVE_CACHE_TTL), para que a
+    busca, os filtros e o scraper não tentem de novo a cada verificação.
+
+    As entradas ficam em <SCRAPE_CACHE_DIR>/falhas/<md5>.json, com a mesma
+    chave do cache de scraping (URL canônica). O módulo é leve de propósito:
+    os filtros o consultam sem carregar o extractor nem o pool de parsing.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from config import Config
+from modules.memory_cache import obter_cache_memoria
+from modules.url_canonical import chave_url
+
+
+def chave_scraping(url):
+    """
+    Chave de uma URL nos caches de scraping (variantes da mesma matéria -
+    utm, AMP, http/https, redirects conhecidos - compartilham a chave).
+
+    Returns:
+        str: Hash MD5 da URL canônica
+    """
+    return hashlib.md5((chave_url(url) or url).encode()).hexdigest()
+
+
+def ttl_falha(classe):
+    """
+    Validade (segundos) de uma entrada negativa para a classe de falha.
+    Status HTTP sem entrada própria usam 'http_4xx' / 'http_5xx'.
+
+    Args:
+        classe (str): Classe retornada por retry_policy.classificar_erro()
+            ou 'extracao' (todas as estratégias falharam)
+
+    Returns:
+        int: Segundos (0 = não guardar)
+    """
+    ttls = Config.NEGATIVE_CACHE_TTL
+    if classe in ttls:
+        return ttls[classe]
+    if classe.startswith('http_'):
+        familia = f"http_{classe[5:6]}xx"
+        if familia in ttls:
+            return ttls[familia]
+    return ttls.get('outro', 0)
+
+
+class CacheNegativo:
+    """
+    Entradas negativas de um diretório de cache de scraping. A camada em
+    memória é a mesma do ScraperCache do diretório (chaves 'falha:<md5>').
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir (str): Diretório do cache de scraping (padrão Config.SCRAPE_CACHE_DIR)
+        """
+        self.cache_dir = cache_dir or Config.SCRAPE_CACHE_DIR
+        self.memoria = obter_cache_memoria(os.path.abspath(self.cache_dir))
+
+
+    def _arquivo(self, chave):
+        return os.path.join(self.cache_dir, 'falhas', f"{chave}.json")
+
+
+    def obter(self, url):
+        """
+        Consulta o cache negativo.
+
+        Args:
+            url (str): URL da notícia
+
+        Returns:
+            dict ou None: {'url', 'classe_falha', 'erro', 'timestamp', 'expira_em'}
+        """
+        if not (Config.ENABLE_CACHE and Config.ENABLE_NEGATIVE_CACHE):
+            return None
+
+        chave = chave_scraping(url)
+        if self.memoria:
+            falha = self.memoria.obter(f"falha:{chave}", datetime.now().timestamp())
+            if falha is not None:
+                return falha
+
+        cache_file = self._arquivo(chave)
+        if not os.path.exists(cache_file):
+            return None
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                falha = json.load(f)
+
+            if datetime.now().timestamp() >= falha.get('expira_em', 0):
+                os.remove(cache_file)
+                return None
+
+            if self.memoria:
+                self.memoria.guardar(f"falha:{chave}", falha, falha['expira_em'])
+            return falha
+
+        except Exception as e:
+            print(f"  Erro ao ler cache negativo: {e}")
+            return None
+
+
+    def salvar(self, url, resultado):
+        """
+        Registra uma extração que falhou.
+
+        Args:
+            url (str): URL da notícia
+            resultado (dict): Resultado de erro do extractor
+        """
+        if not (Config.ENABLE_CACHE and Config.ENABLE_NEGATIVE_CACHE):
+            return
+
+        classe = resultado.get('classe_falha') or 'extracao'
+        ttl = ttl_falha(classe)
+        if ttl <= 0:
+            return
+
+        chave = chave_scraping(url)
+        agora = datetime.now().timestamp()
+        falha = {
+            'url': url,
+            'classe_falha': classe,
+            'erro': resultado.get('erro'),
+            'timestamp': agora,
+            'expira_em': agora + ttl
+        }
+
+        try:
+            cache_file = self._arquivo(chave)
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(falha, f, ensure_ascii=False)
+
+            if self.memoria:
+                self.memoria.guardar(f"falha:{chave}", falha, falha['expira_em'])
+        except Exception as e:
+            print(f"  Erro ao salvar cache negativo: {e}")
+
+
+    def invalidar(self, url):
+        """Remove a entrada negativa da URL (ex.: depois de uma extração bem-sucedida)."""
+        chave = chave_scraping(url)
+        try:
+            os.remove(self._arquivo(chave))
+        except FileNotFoundError:
+            pass
+        if self.memoria:
+            self.memoria.invalidar(f"falha:{chave}")
+
+
+
+
+_cache_negativo = None
+_cache_negativo_lock = threading.Lock()
+
+
+def obter_cache_negativo():
+    """Retorna o cache negativo compartilhado do processo (Config.SCRAPE_CACHE_DIR)."""
+    global _cache_negativo
+
+    if _cache_negativo is None:
+        with _cache_negativo_lock:
+            if _cache_negativo is None:
+                _cache_negativo = CacheNegativo()
+
+    return _cache_negativo
@@ -0,0 +1,253 @@
+"""
+parse_pool.py - Pool de Processos para Extração de HTML
+
+Responsabilidade:
+    trafilatura, readability, newspaper3k e BeautifulSoup seguram a GIL
+    durante o parsing. Com várias threads de scraping, o download é
+    paralelo, mas a extração acaba serializada.
+
+    Este módulo separa as duas etapas: as threads apenas baixam o HTML e
+    enviam (url, html) para processos worker, que executam a cascata de
+    extração e devolvem somente o dicionário de resultado. Os workers não
+    acessam a rede: a versão AMP, quando necessária, é baixada pela thread
+    (respeitando os limites por host do scheduler) e enviada de volta.
+
+    Cada worker tem o seu pipe: o tempo limite conta só enquanto a
+    extração roda, e um worker travado é morto e substituído sem derrubar
+    os outros (o que o ProcessPoolExecutor não permite).
+
+Configuração:
+    - Config.ENABLE_PARSE_POOL: liga/desliga o pool
+    - Config.PARSE_WORKERS: número de processos (0 = extração na thread;
+      é o padrão em máquinas com até 2 CPUs)
+
+    Os workers são iniciados por forkserver (spawn onde não houver): no
+    momento em que o pool é criado o processo já tem threads vivas
+    (scheduler, janitor, warmer, micro-lotes, PyTorch), e um fork herdaria
+    locks presos por elas.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import atexit
+import multiprocessing
+import queue
+import threading
+
+from config import Config
+
+
+_CAMPOS_RESULTADO = (
+    'url', 'titulo', 'texto', 'data_publicacao', 'autor',
+    'metodo_extracao', 'sucesso', 'erro', 'classe_falha', 'amp_url'
+)
+
+_extrator_worker = None
+_extrator_lock = threading.Lock()
+
+
+def _obter_extrator_worker():
+    """ContentExtractor do processo, sem downloads (o AMP fica com a thread)."""
+    global _extrator_worker
+    with _extrator_lock:
+        if _extrator_worker is None:
+            from modules.extractor import ContentExtractor
+            _extrator_worker = ContentExtractor(baixar_amp=False)
+    return _extrator_worker
+
+
+def _contexto_processos():
+    """forkserver quando disponível (Linux/macOS), senão spawn."""
+    metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(metodo)
+
+
+def _resultado_falha(url, erro, classe_falha):
+    return {
+        'url': url, 'titulo': None, 'texto': None,
+        'data_publicacao': None, 'autor': None,
+        'metodo_extracao': None, 'sucesso': False, 'erro': erro,
+        'classe_falha': classe_falha
+    }
+
+
+def _filtrar_campos(resultado):
+    return {campo: resultado[campo] for campo in _CAMPOS_RESULTADO if campo in resultado}
+
+
+def _extrair_no_worker(url, html):
+    """Executa a etapa de CPU da extração dentro do worker."""
+    return _filtrar_campos(_obter_extrator_worker().extrair_de_html(url, html))
+
+
+def _extrair_amp_no_worker(url, html):
+    """Extrai a versão AMP (baixada pela thread) dentro do worker."""
+    return _filtrar_campos(_obter_extrator_worker().extrair_de_amp(url, html))
+
+
+def _laco_worker(conexao):
+    """Laço do processo worker: recebe (funcao, args) e devolve (ok, valor)."""
+    while True:
+        try:
+            tarefa = conexao.recv()
+        except EOFError:
+            return
+        if tarefa is None:
+            return
+        funcao, args = tarefa
+        try:
+            conexao.send((True, funcao(*args)))
+        except Exception as e:
+            conexao.send((False, str(e)))
+
+
+class _Worker:
+    """Um processo worker com o seu próprio pipe."""
+
+    def __init__(self, contexto):
+        self.conexao, lado_worker = contexto.Pipe()
+        self.processo = contexto.Process(target=_laco_worker, args=(lado_worker,), daemon=True)
+        self.processo.start()
+        lado_worker.close()
+
+    def encerrar(self, matar=False):
+        try:
+            if matar:
+                self.processo.kill()
+            else:
+                self.conexao.send(None)
+        except OSError:
+            pass
+        self.processo.join(timeout=1)
+        if self.processo.is_alive():
+            self.processo.kill()
+            self.processo.join(timeout=1)
+        self.conexao.close()
+
+
+class ParsePool:
+    """
+    Pool de processos de longa duração para a extração de conteúdo.
+    Criado sob demanda; cada worker que trava ou morre é substituído
+    sozinho, sem afetar as extrações dos demais.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int): Número de processos (padrão Config.PARSE_WORKERS)
+        """
+        self.workers = Config.PARSE_WORKERS if workers is None else workers
+        self._ativos = []
+        self._livres = queue.Queue()
+        self._lock = threading.Lock()
+
+
+    def _obter_worker(self):
+        """Espera um worker livre (o tempo na fila não conta no timeout)."""
+        with self._lock:
+            if not self._ativos:
+                contexto = _contexto_processos()
+                for _ in range(self.workers):
+                    worker = _Worker(contexto)
+                    self._ativos.append(worker)
+                    self._livres.put(worker)
+        return self._livres.get()
+
+
+    def _devolver(self, worker):
+        with self._lock:
+            if worker in self._ativos:
+                self._livres.put(worker)
+                return
+        worker.encerrar()
+
+
+    def _substituir(self, worker):
+        """Mata um worker travado ou morto e põe um novo no lugar."""
+        worker.encerrar(matar=True)
+        with self._lock:
+            if worker not in self._ativos:
+                return
+            novo = _Worker(_contexto_processos())
+            self._ativos[self._ativos.index(worker)] = novo
+            self._livres.put(novo)
+
+
+    def _executar(self, funcao, url, html):
+        if self.workers <= 0:
+            return funcao(url, html)
+
+        worker = self._obter_worker()
+        try:
+            worker.conexao.send((funcao, (url, html)))
+            if not worker.conexao.poll(Config.ANALYSIS_TIMEOUT):
+                self._substituir(worker)
+                return _resultado_falha(url, 'Tempo esgotado na extração', 'timeout')
+            ok, valor = worker.conexao.recv()
+        except (EOFError, OSError):
+            print("  Worker de parsing interrompido, recriando...")
+            self._substituir(worker)
+            return funcao(url, html)
+
+        self._devolver(worker)
+        if not ok:
+            return _resultado_falha(url, f'Erro no worker de extração: {valor}', 'extracao')
+        return valor
+
+
+    def extrair(self, url, html):
+        """
+        Extrai o conteúdo de um HTML já baixado (bloqueia até terminar).
+
+        O tempo limite (Config.ANALYSIS_TIMEOUT) conta a partir do envio ao
+        worker. Se o resultado trouxer 'amp_url', a cascata não achou um
+        texto completo e a versão AMP ainda pode ser baixada pela thread
+        (ver ContentExtractor.extract).
+
+        Args:
+            url (str): URL da notícia
+            html (str): HTML da página
+
+        Returns:
+            dict: Resultado padronizado da extração
+        """
+        return self._executar(_extrair_no_worker, url, html)
+
+
+    def extrair_amp(self, url, html):
+        """Extrai o HTML da versão AMP, já baixado pela thread chamadora."""
+        return self._executar(_extrair_amp_no_worker, url, html)
+
+
+    def encerrar(self):
+        """Finaliza os processos worker."""
+        with self._lock:
+            ativos, self._ativos = self._ativos, []
+            self._livres = queue.Queue()
+        for worker in ativos:
+            worker.encerrar()
+
+
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def obter_parse_pool():
+    """
+    Retorna o pool compartilhado do processo, ou None se desativado.
+    """
+    global _parse_pool
+
+    if not Config.ENABLE_PARSE_POOL or Config.PARSE_WORKERS <= 0:
+        return None
+
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                _parse_pool = ParsePool()
+                atexit.register(_parse_pool.encerrar)
+
+    return _parse_pool
@@ -0,0 +1,112 @@
+"""
+passages.py - Divisão das Matérias em Passagens
+
+Responsabilidade:
+    O embedding de uma matéria usa só os primeiros 2000 caracteres, então
+    parágrafos que confirmam ou desmentem a informação mais adiante em
+    matérias longas não contam, enquanto a busca de contradição percorre o
+    texto inteiro.
+
+    Aqui as matérias são divididas em passagens (parágrafos agrupados até
+    Config.PASSAGE_MAX_CHARS, com parágrafos longos quebrados por frases) e
+    um orçamento de passagens por verificação é repartido entre as
+    matérias. O SemanticAnalyzer codifica todas as passagens escolhidas
+    num único lote, pontua cada matéria pela melhor passagem e restringe a
+    detecção de contradição às passagens mais parecidas.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import re
+
+from config import Config
+
+
+_FIM_DE_FRASE = re.compile(r'(?<=[.!?…])\s+')
+
+
+def _unidades(texto, tamanho):
+    """Parágrafos; os maiores que `tamanho` são quebrados por frases (e, no limite, por tamanho)."""
+    for paragrafo in re.split(r'\s*\n\s*', texto or ''):
+        paragrafo = re.sub(r'\s+', ' ', paragrafo).strip()
+        if not paragrafo:
+            continue
+        if len(paragrafo) <= tamanho:
+            yield paragrafo
+            continue
+        for frase in _FIM_DE_FRASE.split(paragrafo):
+            while len(frase) > tamanho:
+                corte = frase.rfind(' ', 0, tamanho)
+                corte = corte if corte > tamanho // 2 else tamanho
+                yield frase[:corte].strip()
+                frase = frase[corte:].strip()
+            if frase:
+                yield frase
+
+
+def dividir_passagens(texto, tamanho=None):
+    """
+    Divide um texto em passagens de até `tamanho` caracteres, juntando
+    parágrafos curtos consecutivos.
+
+    Args:
+        texto (str): Texto da matéria
+        tamanho (int): Caracteres por passagem (padrão Config.PASSAGE_MAX_CHARS)
+
+    Returns:
+        list: Passagens, na ordem do texto
+    """
+    tamanho = tamanho or Config.PASSAGE_MAX_CHARS
+    passagens = []
+    atual = ''
+    for unidade in _unidades(texto, tamanho):
+        if atual and len(atual) + 1 + len(unidade) > tamanho:
+            passagens.append(atual)
+            atual = unidade
+        else:
+            atual = f"{atual} {unidade}" if atual else unidade
+    if atual:
+        passagens.append(atual)
+    return passagens
+
+
+def _espalhar(quantidade, escolher):
+    """`escolher` índices de 0..quantidade-1 espalhados pelo texto (sempre inclui o primeiro)."""
+    if escolher >= quantidade:
+        return list(range(quantidade))
+    if escolher == 1:
+        return [0]
+    return sorted({round(i * (quantidade - 1) / (escolher - 1)) for i in range(escolher)})
+
+
+def selecionar_passagens(quantidades, orcamento=None, por_materia=None):
+    """
+    Reparte o orçamento de passagens entre as matérias, uma passagem por
+    matéria a cada rodada (nenhuma matéria longa consome o orçamento das
+    demais). Toda matéria com texto recebe ao menos uma passagem. Quando
+    uma matéria tem mais passagens do que a sua parte, as escolhidas são
+    espalhadas do início ao fim do texto.
+
+    Args:
+        quantidades (list): Número de passagens de cada matéria
+        orcamento (int): Total de passagens (padrão Config.PASSAGE_BUDGET)
+        por_materia (int): Máximo por matéria (padrão Config.PASSAGES_PER_ARTICLE)
+
+    Returns:
+        list: Índices das passagens escolhidas, por matéria
+    """
+    orcamento = Config.PASSAGE_BUDGET if orcamento is None else orcamento
+    orcamento = max(orcamento, sum(1 for quantidade in quantidades if quantidade))
+    por_materia = por_materia or Config.PASSAGES_PER_ARTICLE
+    partes = [0] * len(quantidades)
+
+    for rodada in range(min(max(quantidades, default=0), por_materia)):
+        for materia, quantidade in enumerate(quantidades):
+            if orcamento <= 0:
+                break
+            if rodada < quantidade:
+                partes[materia] += 1
+                orcamento -= 1
+
+    return [_espalhar(quantidade, parte) for quantidade, parte in zip(quantidades, partes)]
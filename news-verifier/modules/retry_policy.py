@@ -0,0 +1,203 @@
+"""
+retry_policy.py - Política de Retentativas Compartilhada
+
+Responsabilidade:
+    Decidir SE e QUANDO uma requisição que falhou deve ser repetida:
+    - Falha imediata em erros definitivos (4xx exceto 408/425/429, DNS,
+      URL inválida, conteúdo não HTML)
+    - Respeita o header Retry-After das respostas 429/503
+    - Backoff exponencial com jitter ("full jitter") para erros transitórios
+    - Nunca dorme além do orçamento de tempo restante da requisição
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import random
+import socket
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from config import Config
+from modules.fetcher import ConteudoNaoHTML
+
+
+STATUS_REPETIVEIS = {408, 425, 429}
+
+_MENSAGENS_DNS = (
+    'name or service not known',
+    'nodename nor servname',
+    'getaddrinfo failed',
+    'temporary failure in name resolution',
+    'no address associated with hostname',
+)
+
+_ERROS_DEFINITIVOS = (
+    requests.exceptions.InvalidURL,
+    requests.exceptions.MissingSchema,
+    requests.exceptions.InvalidSchema,
+    requests.exceptions.TooManyRedirects,
+)
+
+
+def _status_http(erro):
+    response = getattr(erro, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def _cadeia_erros(erro, profundidade=6):
+    """Percorre a cadeia de causas (requests → urllib3 → socket)."""
+    vistos = []
+    pendentes = [erro]
+    while pendentes and len(vistos) < profundidade:
+        atual = pendentes.pop(0)
+        if atual is None or any(atual is v for v in vistos):
+            continue
+        vistos.append(atual)
+        pendentes.extend([getattr(atual, 'reason', None), atual.__cause__, atual.__context__])
+        pendentes.extend(a for a in getattr(atual, 'args', ()) if isinstance(a, BaseException))
+    return vistos
+
+
+def erro_dns(erro):
+    """Indica se a falha foi de resolução de nome (domínio inexistente)."""
+    for item in _cadeia_erros(erro):
+        if isinstance(item, socket.gaierror) or type(item).__name__ == 'NameResolutionError':
+            return True
+        mensagem = str(item).lower()
+        if any(trecho in mensagem for trecho in _MENSAGENS_DNS):
+            return True
+    return False
+
+
+def classificar_erro(erro):
+    """
+    Classifica uma exceção de download.
+
+    Args:
+        erro (Exception): Exceção levantada pela requisição
+
+    Returns:
+        str: 'http_<status>', 'nao_html', 'dns', 'timeout', 'conexao',
+             'url_invalida' ou 'outro'
+    """
+    if isinstance(erro, ConteudoNaoHTML):
+        return 'nao_html'
+    status = _status_http(erro)
+    if status:
+        return f'http_{status}'
+    if isinstance(erro, _ERROS_DEFINITIVOS):
+        return 'url_invalida'
+    if isinstance(erro, requests.exceptions.Timeout):
+        return 'timeout'
+    if erro_dns(erro):
+        return 'dns'
+    if isinstance(erro, requests.exceptions.ConnectionError):
+        return 'conexao'
+    return 'outro'
+
+
+def retry_after(erro):
+    """
+    Lê o header Retry-After (segundos ou data HTTP).
+
+    Returns:
+        float ou None: Segundos a aguardar
+    """
+    response = getattr(erro, 'response', None)
+    valor = (getattr(response, 'headers', None) or {}).get('Retry-After')
+    if not valor:
+        return None
+
+    valor = valor.strip()
+    if valor.isdigit():
+        return float(valor)
+    try:
+        data = parsedate_to_datetime(valor)
+    except (TypeError, ValueError):
+        return None
+    if data.tzinfo is None:
+        data = data.replace(tzinfo=timezone.utc)
+    return max(0.0, (data - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Executa funções de rede com retentativas inteligentes.
+    Uma instância pode ser compartilhada entre threads.
+    """
+
+    def __init__(self, max_tentativas=None, atraso_base=None, atraso_max=None, orcamento=None):
+        """
+        Args:
+            max_tentativas (int): Total de tentativas (padrão Config.MAX_RETRIES)
+            atraso_base (float): Base do backoff exponencial em segundos
+            atraso_max (float): Teto de cada espera
+            orcamento (float): Tempo total da operação em segundos
+        """
+        self.max_tentativas = max_tentativas or Config.MAX_RETRIES
+        self.atraso_base = atraso_base if atraso_base is not None else Config.RETRY_BACKOFF_BASE
+        self.atraso_max = atraso_max if atraso_max is not None else Config.RETRY_BACKOFF_MAX
+        self.orcamento = orcamento or Config.SCRAPING_TIMEOUT
+
+
+    def deve_repetir(self, erro):
+        """Retorna True apenas para falhas transitórias."""
+        classe = classificar_erro(erro)
+        if classe.startswith('http_'):
+            status = _status_http(erro)
+            return status in STATUS_REPETIVEIS or status >= 500
+        return classe in ('timeout', 'conexao')
+
+
+    def calcular_atraso(self, tentativa, erro=None):
+        """
+        Tempo de espera antes da próxima tentativa.
+
+        Args:
+            tentativa (int): Índice da tentativa que falhou (0, 1, ...)
+            erro (Exception): Erro ocorrido (para ler Retry-After)
+
+        Returns:
+            float: Segundos
+        """
+        pedido = retry_after(erro) if erro is not None else None
+        if pedido is not None:
+            return pedido
+        teto = min(self.atraso_max, self.atraso_base * (2 ** tentativa))
+        return random.uniform(0, teto)
+
+
+    def executar(self, funcao, *args, prazo=None, **kwargs):
+        """
+        Executa `funcao` repetindo apenas falhas transitórias.
+
+        Args:
+            funcao (callable): Operação de rede
+            prazo (float): Deadline absoluto em time.monotonic() (opcional)
+
+        Returns:
+            Valor retornado por `funcao`
+
+        Raises:
+            Exception: Último erro quando não há mais tentativas ou tempo
+        """
+        if prazo is None:
+            prazo = time.monotonic() + self.orcamento
+
+        for tentativa in range(self.max_tentativas):
+            try:
+                return funcao(*args, **kwargs)
+            except Exception as erro:
+                ultima = tentativa >= self.max_tentativas - 1
+                if ultima or not self.deve_repetir(erro):
+                    raise
+
+                atraso = self.calcular_atraso(tentativa, erro)
+                if time.monotonic() + atraso >= prazo:
+                    raise
+
+                time.sleep(atraso)
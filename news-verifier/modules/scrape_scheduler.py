@@ -0,0 +1,258 @@
+"""
+scrape_scheduler.py - Agendador Global de Scraping
+
+Responsabilidade:
+    Antes, cada verificação criava um ThreadPoolExecutor por fonte (3
+    workers) e o descartava em seguida; verificações simultâneas não
+    enxergavam umas às outras e podiam martelar o mesmo portal.
+
+    Este módulo mantém UM conjunto de threads de longa duração para o
+    processo inteiro. Todas as URLs de todas as verificações entram na
+    mesma fila e são despachadas respeitando:
+    - Limite global de downloads simultâneos (Config.SCRAPE_MAX_WORKERS)
+    - Limite por host (Config.SCRAPE_MAX_PER_HOST / SCRAPE_HOST_LIMITS)
+    - Intervalo mínimo entre inícios no mesmo host
+      (Config.SCRAPE_HOST_MIN_INTERVAL); hosts diferentes não esperam
+    - Prioridade da tarefa (menor valor = executa antes)
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import atexit
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+from config import Config
+
+
+def host_da_url(url):
+    """
+    Host usado para os limites por domínio (minúsculo, sem "www.").
+
+    Args:
+        url (str): URL da notícia
+
+    Returns:
+        str: Host ou '' se a URL não tiver host
+    """
+    if url and '://' not in url:
+        url = 'https://' + url
+    host = (urlparse(url or '').hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class _Tarefa:
+    __slots__ = ('funcao', 'args', 'kwargs', 'host', 'futuro')
+
+    def __init__(self, funcao, args, kwargs, host, futuro):
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.host = host
+        self.futuro = futuro
+
+
+class ScrapeScheduler:
+    """
+    Fila de prioridade com limite global e por host, atendida por um
+    conjunto fixo de threads. Pode ser compartilhada entre requisições.
+    """
+
+    def __init__(self, max_workers=None, max_por_host=None, limites_host=None, intervalo_host=None):
+        """
+        Args:
+            max_workers (int): Downloads simultâneos no processo
+                (padrão Config.SCRAPE_MAX_WORKERS)
+            max_por_host (int): Downloads simultâneos por host
+                (padrão Config.SCRAPE_MAX_PER_HOST)
+            limites_host (dict): Exceções por host (padrão Config.SCRAPE_HOST_LIMITS)
+            intervalo_host (float): Segundos mínimos entre dois inícios no
+                mesmo host (padrão Config.SCRAPE_HOST_MIN_INTERVAL)
+        """
+        self.max_workers = max(1, max_workers or Config.SCRAPE_MAX_WORKERS)
+        self.max_por_host = max(1, max_por_host or Config.SCRAPE_MAX_PER_HOST)
+        self.limites_host = dict(Config.SCRAPE_HOST_LIMITS if limites_host is None else limites_host)
+        self.intervalo_host = Config.SCRAPE_HOST_MIN_INTERVAL if intervalo_host is None else intervalo_host
+
+        self._fila = []
+        self._sequencia = itertools.count()
+        self._ativos_por_host = {}
+        self._proximo_inicio = {}
+        self._condicao = threading.Condition()
+        self._threads = []
+        self._encerrado = False
+
+
+    def _limite(self, host):
+        return self.limites_host.get(host, self.max_por_host)
+
+
+    def _iniciar_threads(self):
+        """Cria as threads na primeira submissão (chamado com o lock)."""
+        if self._threads:
+            return
+        for i in range(self.max_workers):
+            thread = threading.Thread(
+                target=self._executar_worker,
+                name=f"scrape-worker-{i}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+
+    def submeter(self, funcao, *args, host=None, prioridade=0, **kwargs):
+        """
+        Agenda `funcao(*args, **kwargs)`.
+
+        Args:
+            funcao (callable): Trabalho a executar
+            host (str): Host para o limite por domínio ('' = sem limite)
+            prioridade (int): Menor valor sai primeiro; empates em ordem FIFO
+
+        Returns:
+            concurrent.futures.Future: Futuro com o retorno da função
+        """
+        futuro = Future()
+        tarefa = _Tarefa(funcao, args, kwargs, host or '', futuro)
+
+        with self._condicao:
+            if self._encerrado:
+                raise RuntimeError("ScrapeScheduler encerrado")
+            self._iniciar_threads()
+            heapq.heappush(self._fila, (prioridade, next(self._sequencia), tarefa))
+            self._condicao.notify()
+
+        return futuro
+
+
+    def _proxima_tarefa(self):
+        """
+        Retira da fila a tarefa de maior prioridade cujo host tem vaga e já
+        cumpriu o intervalo mínimo (chamado com o lock).
+
+        Returns:
+            tuple: (tarefa ou None, segundos até um host adiado liberar ou None)
+        """
+        agora = time.monotonic()
+        adiadas = []
+        escolhida = None
+        espera = None
+
+        while self._fila:
+            item = heapq.heappop(self._fila)
+            tarefa = item[2]
+            if tarefa.futuro.cancelled():
+                continue
+            if not tarefa.host:
+                escolhida = tarefa
+                break
+            adiadas.append(item)
+            if self._ativos_por_host.get(tarefa.host, 0) >= self._limite(tarefa.host):
+                continue
+            restante = self._proximo_inicio.get(tarefa.host, 0) - agora
+            if restante > 0:
+                espera = restante if espera is None else min(espera, restante)
+                continue
+            adiadas.pop()
+            escolhida = tarefa
+            break
+
+        for item in adiadas:
+            heapq.heappush(self._fila, item)
+
+        if escolhida is not None and escolhida.host:
+            self._ativos_por_host[escolhida.host] = self._ativos_por_host.get(escolhida.host, 0) + 1
+            if self.intervalo_host > 0:
+                self._proximo_inicio[escolhida.host] = agora + self.intervalo_host
+            self._limpar_intervalos(agora)
+        return escolhida, espera
+
+
+    def _limpar_intervalos(self, agora):
+        """Descarta marcas de intervalo vencidas (chamado com o lock)."""
+        if len(self._proximo_inicio) > 4 * self.max_workers:
+            for host in [h for h, t in self._proximo_inicio.items() if t <= agora]:
+                del self._proximo_inicio[host]
+
+
+    def _liberar(self, host):
+        with self._condicao:
+            if host:
+                restantes = self._ativos_por_host.get(host, 1) - 1
+                if restantes > 0:
+                    self._ativos_por_host[host] = restantes
+                else:
+                    self._ativos_por_host.pop(host, None)
+            self._condicao.notify_all()
+
+
+    def _executar_worker(self):
+        while True:
+            with self._condicao:
+                tarefa, espera = self._proxima_tarefa()
+                while tarefa is None:
+                    if self._encerrado:
+                        return
+                    self._condicao.wait(espera)
+                    tarefa, espera = self._proxima_tarefa()
+
+            if tarefa.futuro.set_running_or_notify_cancel():
+                try:
+                    tarefa.futuro.set_result(tarefa.funcao(*tarefa.args, **tarefa.kwargs))
+                except BaseException as erro:
+                    tarefa.futuro.set_exception(erro)
+            self._liberar(tarefa.host)
+
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: {'pendentes', 'ativos_por_host', 'workers'}
+        """
+        with self._condicao:
+            return {
+                'pendentes': len(self._fila),
+                'ativos_por_host': dict(self._ativos_por_host),
+                'workers': len(self._threads)
+            }
+
+
+    def encerrar(self, aguardar=True):
+        """Cancela o que ainda está na fila e finaliza as threads."""
+        with self._condicao:
+            self._encerrado = True
+            while self._fila:
+                heapq.heappop(self._fila)[2].futuro.cancel()
+            self._condicao.notify_all()
+            threads = list(self._threads)
+
+        if aguardar:
+            for thread in threads:
+                thread.join()
+
+
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def obter_scrape_scheduler():
+    """
+    Retorna o agendador compartilhado do processo.
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = ScrapeScheduler()
+                atexit.register(_scheduler.encerrar, False)
+
+    return _scheduler
@@ -16,12 +16,19 @@ Data: 2025
 """
 
 from modules.extractor import ContentExtractor
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from modules.parse_pool import obter_parse_pool
+from modules.structured_data import extrair_dados_estruturados
+from modules.cache_storage import ArmazenamentoConteudo, marcar_uso
+from modules.memory_cache import obter_cache_memoria
+from modules.article_features import ArmazenamentoFeatures
+from modules.negative_cache import CacheNegativo, chave_scraping, ttl_falha
+from modules.scrape_scheduler import obter_scrape_scheduler, host_da_url
+from modules.cache_refresh import agendar_revalidacao, expiracao_definitiva
+from concurrent.futures import Future
+from functools import partial
 from config import Config
-import time
 import json
 import os
-import hashlib
 from datetime import datetime
 
 
@@ -33,16 +40,28 @@ class ScraperCache:
     """
     Cache específico para resultados de scraping.
     Similar ao SearchCache, mas para conteúdo extraído.
+    
+    Cada URL tem um índice JSON pequeno (metadados + referência); o texto
+    fica comprimido em objetos/ e é compartilhado entre URLs com o mesmo
+    conteúdo (ver cache_storage.py). Ao lado do texto fica o registro de
+    características usado pela análise semântica (ver article_features.py).
+    Um LRU em memória, compartilhado pelas instâncias do mesmo diretório,
+    atende as leituras repetidas.
     """
     
-    def __init__(self, cache_dir='cache_scraping'):
+    def __init__(self, cache_dir=None):
         """
         Inicializa cache de scraping.
         
         Args:
-            cache_dir (str): Diretório para cache
+            cache_dir (str): Diretório para cache (padrão Config.SCRAPE_CACHE_DIR)
         """
+        cache_dir = cache_dir or Config.SCRAPE_CACHE_DIR
         self.cache_dir = cache_dir
+        self.objetos = ArmazenamentoConteudo(os.path.join(cache_dir, 'objetos'))
+        self.features = ArmazenamentoFeatures(os.path.join(cache_dir, 'features'))
+        self.memoria = obter_cache_memoria(os.path.abspath(cache_dir))
+        self.falhas = CacheNegativo(cache_dir)
         
         if not os.path.exists(cache_dir):
             os.makedirs(cache_dir)
@@ -50,23 +69,30 @@ class ScraperCache:
     
     def _gerar_chave(self, url):
         """
-        Gera chave única para URL.
+        Gera chave única para URL (variantes da mesma matéria - utm, AMP,
+        http/https, redirects conhecidos - compartilham a chave).
         
         Args:
             url (str): URL da notícia
             
         Returns:
-            str: Hash MD5
+            str: Hash MD5 da URL canônica
         """
-        return hashlib.md5(url.encode()).hexdigest()
+        return chave_scraping(url)
     
     
-    def obter(self, url):
+    def obter(self, url, atualizar=None):
         """
         Obtém conteúdo do cache se existir.
         
+        Entradas vencidas há menos de Config.CACHE_STALE_GRACE segundos
+        ainda são devolvidas quando o chamador informa `atualizar`; nesse
+        caso a atualização é agendada em segundo plano (cache_refresh.py).
+        
         Args:
             url (str): URL da notícia
+            atualizar (callable): Função sem argumentos que baixa e salva
+                a URL novamente (habilita stale-while-revalidate)
             
         Returns:
             dict ou None: Conteúdo ou None
@@ -75,6 +101,11 @@ class ScraperCache:
             return None
         
         chave = self._gerar_chave(url)
+        if self.memoria:
+            conteudo = self.memoria.obter(chave, datetime.now().timestamp())
+            if conteudo is not None:
+                return conteudo
+        
         cache_file = os.path.join(self.cache_dir, f"{chave}.json")
         
         if not os.path.exists(cache_file):
@@ -88,11 +119,30 @@ class ScraperCache:
             timestamp = cache_data.get('timestamp', 0)
             now = datetime.now().timestamp()
             
-            if (now - timestamp) > Config.CACHE_EXPIRATION:
+            idade = now - timestamp
+            if idade > expiracao_definitiva():
                 os.remove(cache_file)
                 return None
             
-            return cache_data.get('conteudo')
+            obsoleto = idade > Config.CACHE_EXPIRATION
+            if obsoleto and atualizar is None:
+                return None
+            
+            conteudo = cache_data.get('conteudo')
+            referencia = cache_data.get('texto_ref')
+            if conteudo is not None and referencia:
+                texto = self.objetos.ler(referencia)
+                if texto is None:
+                    os.remove(cache_file)
+                    return None
+                conteudo['texto'] = texto
+            
+            marcar_uso(cache_file)
+            if obsoleto:
+                agendar_revalidacao(f"scraping:{chave}", atualizar, host=host_da_url(url))
+            elif self.memoria and conteudo is not None:
+                self.memoria.guardar(chave, conteudo, timestamp + Config.CACHE_EXPIRATION)
+            return conteudo
         
         except Exception as e:
             print(f"  Erro ao ler cache de scraping: {e}")
@@ -113,17 +163,151 @@ class ScraperCache:
         chave = self._gerar_chave(url)
         cache_file = os.path.join(self.cache_dir, f"{chave}.json")
         
-        cache_data = {
-            'url': url,
-            'timestamp': datetime.now().timestamp(),
-            'conteudo': conteudo
-        }
-        
         try:
+            cache_data = {
+                'url': url,
+                'timestamp': datetime.now().timestamp(),
+                'conteudo': {k: v for k, v in conteudo.items() if k != 'texto'}
+            }
+            if conteudo.get('texto'):
+                cache_data['texto_ref'] = self.objetos.guardar(conteudo['texto'])
+                if Config.ENABLE_ARTICLE_FEATURES:
+                    self.features.calcular_se_ausente(conteudo['texto'], cache_data['texto_ref'])
+            else:
+                cache_data['conteudo'] = conteudo
+            
             with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                json.dump(cache_data, f, ensure_ascii=False)
+            
+            self.falhas.invalidar(url)
+            
+            if self.memoria:
+                self.memoria.guardar(chave, conteudo, cache_data['timestamp'] + Config.CACHE_EXPIRATION)
         except Exception as e:
             print(f"  Erro ao salvar cache de scraping: {e}")
+    
+    
+    def obter_falha(self, url):
+        """Consulta o cache negativo (ver negative_cache.py)."""
+        return self.falhas.obter(url)
+    
+    
+    def salvar_falha(self, url, resultado):
+        """
+        Registra uma extração que falhou, com validade conforme a classe
+        da falha (Config.NEGATIVE_CACHE_TTL).
+        """
+        self.falhas.salvar(url, resultado)
+
+
+def _resultado_falha_recente(url, falha):
+    """Resultado de erro montado a partir de uma entrada do cache negativo."""
+    return {
+        'url': url,
+        'titulo': None,
+        'texto': None,
+        'data_publicacao': None,
+        'autor': None,
+        'metodo_extracao': 'cache_negativo',
+        'sucesso': False,
+        'erro': falha.get('erro') or 'Falha recente',
+        'classe_falha': falha.get('classe_falha')
+    }
+
+
+def _futuro_resolvido(valor):
+    """Future já concluído (cache hit / título+snippet)."""
+    futuro = Future()
+    futuro.set_result(valor)
+    return futuro
+
+
+def _conteudo_titulo_snippet(resultado):
+    """
+    Monta o "conteúdo" de um resultado de busca a partir de título+snippet.
+    
+    Args:
+        resultado (dict): Item da busca ({'title', 'url', 'snippet'})
+        
+    Returns:
+        dict: Conteúdo no formato padrão do scraper
+    """
+    titulo = resultado.get('title', '')
+    snippet = resultado.get('snippet', '')
+    texto = f"{titulo}. {snippet}"
+    ok = len(texto.strip()) >= 30
+    
+    return {
+        'url': resultado.get('url', ''),
+        'titulo': titulo,
+        'texto': texto if ok else '',
+        'data_publicacao': None,
+        'autor': None,
+        'metodo_extracao': 'titulo_snippet',
+        'sucesso': ok,
+        'erro': None if ok else 'Título+snippet muito curto'
+    }
+
+
+def _revalidar(url, extractor, cache):
+    """
+    Baixa de novo uma URL cujo cache venceu (stale-while-revalidate).
+    Só grava sucessos: se a atualização falhar, a entrada antiga continua
+    servindo até a expiração definitiva.
+    """
+    resultado = extractor.extract(url if url.startswith('http') else 'https://' + url)
+    if resultado.get('sucesso'):
+        resultado['url'] = url
+        cache.salvar(url, resultado)
+    return resultado
+
+
+def _extrair_paywall(resultado, extractor, cache):
+    """
+    Conteúdo de uma URL com paywall usando apenas dados estruturados.
+    
+    Usa o articleBody do JSON-LD quando disponível; senão, título + descrição
+    (se mais rica que o snippet da busca); por fim, título+snippet.
+    
+    Args:
+        resultado (dict): Item da busca
+        extractor (ContentExtractor): Extrator usado para baixar o HTML
+        cache (ScraperCache): Cache de scraping
+        
+    Returns:
+        dict: Conteúdo no formato padrão do scraper
+    """
+    url = resultado.get('url', '')
+    if not url:
+        return _conteudo_titulo_snippet(resultado)
+    
+    cache_result = cache.obter(url)
+    if cache_result:
+        return cache_result
+    
+    dados = extrair_dados_estruturados(extractor.obter_html(url))
+    titulo = dados.get('titulo') or resultado.get('title', '')
+    descricao = dados.get('descricao') or ''
+    
+    if len((dados.get('texto') or '').split()) >= 20:
+        texto, metodo = dados['texto'], 'json_ld'
+    elif len(descricao) > len(resultado.get('snippet', '')):
+        texto, metodo = f"{titulo}. {descricao}", 'json_ld_resumo'
+    else:
+        return _conteudo_titulo_snippet(resultado)
+    
+    conteudo = {
+        'url': url,
+        'titulo': titulo,
+        'texto': texto,
+        'data_publicacao': dados.get('data_publicacao'),
+        'autor': dados.get('autor'),
+        'metodo_extracao': metodo,
+        'sucesso': True,
+        'erro': None
+    }
+    cache.salvar(url, conteudo)
+    return conteudo
 
 
                                                                               
@@ -136,18 +320,30 @@ class NewsScraper:
     Otimizado para processar resultados do searcher.
     """
     
-    def __init__(self):
-        """Inicializa scraper com extractor e cache"""
-        self.extractor = ContentExtractor()
+    def __init__(self, scheduler=None):
+        """
+        Inicializa scraper com extractor e cache.
+        
+        Args:
+            scheduler (ScrapeScheduler): Agendador (padrão: o global do processo)
+        """
+        self.extractor = ContentExtractor(parse_pool=obter_parse_pool())
         self.cache = ScraperCache()
+        self.scheduler = scheduler or obter_scrape_scheduler()
     
     
-    def scrape_resultados_busca(self, resultados_busca):
+    def scrape_resultados_busca(self, resultados_busca, prioridade_base=0):
         """
         Extrai conteúdo de todos os resultados da busca.
         
+        Todas as URLs (de todas as fontes) são enviadas de uma vez ao
+        agendador global, que respeita os limites por host. O primeiro
+        resultado de cada fonte tem prioridade sobre os seguintes.
+        
         Args:
             resultados_busca (dict): Resultado do searcher.buscar_em_todas_fontes()
+            prioridade_base (int): Somado às prioridades (trabalho em segundo
+                plano, como o cache_warmer, usa valores altos)
             
         Returns:
             dict: Conteúdos extraídos ou dados da busca (título+snippet)
@@ -158,6 +354,7 @@ class NewsScraper:
         fontes_problematicas = Config.SOURCES_WITH_PAYWALL
         
         resultados_scraping = {}
+        agendados = {}
         total_urls = 0
         total_sucesso = 0
         
@@ -172,23 +369,25 @@ class NewsScraper:
             
             print(f"\n   {fonte_nome}: {len(fonte_resultados)} URL(s)")
             
-                                               
-            if fonte_nome in fontes_problematicas:
-                print(f"      Fonte com paywall detectada - usando título+snippet")
-                conteudos = self._usar_titulo_snippet(fonte_resultados)
-                sucessos = len([c for c in conteudos if c['sucesso']])
-            else:
-                                              
-                urls = [item['url'] for item in fonte_resultados]
-                conteudos = self.scrape_urls(urls)
-                sucessos = sum(1 for c in conteudos if c['sucesso'])
+            paywall = fonte_nome in fontes_problematicas
+            if paywall:
+                print(f"      Fonte com paywall detectada - usando dados estruturados")
+            
+            agendados[fonte_nome] = [
+                (item, self._submeter(item, prioridade_base + posicao, paywall=paywall))
+                for posicao, item in enumerate(fonte_resultados)
+            ]
+        
+        for fonte_nome, itens in agendados.items():
+            conteudos = [self._coletar(futuro, item.get('url', '')) for item, futuro in itens]
+            sucessos = sum(1 for c in conteudos if c['sucesso'])
             
             resultados_scraping[fonte_nome] = conteudos
             
-            total_urls += len(fonte_resultados)
+            total_urls += len(itens)
             total_sucesso += sucessos
             
-            print(f"     {sucessos}/{len(fonte_resultados)} processados")
+            print(f"     {fonte_nome}: {sucessos}/{len(itens)} processados")
         
                                   
         taxa_sucesso = (total_sucesso / total_urls * 100) if total_urls > 0 else 0
@@ -206,124 +405,100 @@ class NewsScraper:
         }
     
     
-    def _usar_titulo_snippet(self, resultados_busca):
+    def _submeter(self, resultado, prioridade=0, paywall=False):
         """
-        Usa título + snippet como "conteúdo"sem fazer scraping.
-        Para fontes com paywall que bloqueiam acesso.
+        Agenda a extração de um resultado da busca no agendador global.
+        Cache hits e título+snippet são resolvidos na hora, sem ocupar vaga.
         
         Args:
-            resultados_busca (list): Lista de resultados da busca
+            resultado (dict): Item da busca ({'url', 'title', 'snippet'})
+            prioridade (int): Posição do item na fonte (menor sai antes)
+            paywall (bool): Fonte com paywall (só dados estruturados)
             
         Returns:
-            list: Lista com "conteúdo"montado a partir de título+snippet
+            concurrent.futures.Future: Futuro com o conteúdo extraído
+        """
+        url = resultado.get('url', '')
+        
+        if paywall:
+            if not Config.ENABLE_PAYWALL_STRUCTURED_DATA:
+                return _futuro_resolvido(_conteudo_titulo_snippet(resultado))
+            return self.scheduler.submeter(
+                _extrair_paywall, resultado, self.extractor, self.cache,
+                host=host_da_url(url), prioridade=prioridade
+            )
+        
+        cache_result = self.cache.obter(
+            url, atualizar=partial(_revalidar, url, self.extractor, self.cache)
+        ) if url else None
+        if cache_result:
+            print(f"       Cache hit: {url[:50]}...")
+            return _futuro_resolvido(cache_result)
+        
+        falha = self.cache.obter_falha(url) if url else None
+        if falha:
+            print(f"       Falha recente ({falha['classe_falha']}): {url[:50]}...")
+            return _futuro_resolvido(_resultado_falha_recente(url, falha))
+        
+        return self.scheduler.submeter(
+            self._scrape_e_salvar, url,
+            host=host_da_url(url), prioridade=prioridade
+        )
+    
+    
+    def _coletar(self, futuro, url):
         """
-        conteudos = []
+        Aguarda o resultado de uma extração agendada.
         
-        for resultado in resultados_busca:
-            titulo = resultado.get('title', '')
-            snippet = resultado.get('snippet', '')
-            url = resultado.get('url', '')
-            
-                                                         
-            texto_completo = f"{titulo}. {snippet}"
-            
-                                                           
-            if len(texto_completo.strip()) < 30:
-                conteudos.append({
-                    'url': url,
-                    'titulo': titulo,
-                    'texto': '',
-                    'data_publicacao': None,
-                    'autor': None,
-                    'metodo_extracao': 'titulo_snippet',
-                    'sucesso': False,
-                    'erro': 'Título+snippet muito curto'
-                })
-                continue
-            
-            conteudos.append({
+        Returns:
+            dict: Conteúdo extraído ou resultado de falha
+        """
+        try:
+            return futuro.result()
+        except Exception as e:
+            print(f"       Erro ao processar {url[:50]}: {e}")
+            return {
                 'url': url,
-                'titulo': titulo,
-                'texto': texto_completo,
+                'titulo': None,
+                'texto': None,
                 'data_publicacao': None,
                 'autor': None,
-                'metodo_extracao': 'titulo_snippet',
-                'sucesso': True,
-                'erro': None
-            })
-        
-        return conteudos
+                'sucesso': False,
+                'erro': str(e)
+            }
+    
+    
+    def _scrape_e_salvar(self, url):
+        """Extrai uma URL e guarda o resultado no cache (positivo ou negativo)."""
+        resultado = self._scrape_url_single(url)
+        if resultado['sucesso']:
+            self.cache.salvar(url, resultado)
+        else:
+            self.cache.salvar_falha(url, resultado)
+        return resultado
     
     
     def scrape_urls(self, urls):
         """
-        Extrai conteúdo de múltiplas URLs em paralelo.
+        Extrai conteúdo de múltiplas URLs em paralelo (agendador global).
         
         Args:
             urls (list): Lista de URLs
             
         Returns:
-            list: Lista de dicionários com conteúdo extraído
+            list: Lista de dicionários com conteúdo extraído, na ordem de `urls`
         """
-        if not urls:
-            return []
-        
-        resultados = []
-        
-                                  
-        urls_para_scrape = []
-        for url in urls:
-            cache_result = self.cache.obter(url)
-            if cache_result:
-                print(f"       Cache hit: {url[:50]}...")
-                resultados.append(cache_result)
-            else:
-                urls_para_scrape.append(url)
-        
-                                                    
-        if not urls_para_scrape:
-            return resultados
-        
-                                                                   
-        max_workers = min(3, len(urls_para_scrape))
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                              
-            future_to_url = {
-                executor.submit(self._scrape_url_single, url): url 
-                for url in urls_para_scrape
-            }
-            
-                                                   
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    resultado = future.result()
-                    resultados.append(resultado)
-                    
-                                                
-                    if resultado['sucesso']:
-                        self.cache.salvar(url, resultado)
-                
-                except Exception as e:
-                    print(f"       Erro ao processar {url[:50]}: {e}")
-                    resultados.append({
-                        'url': url,
-                        'titulo': None,
-                        'texto': None,
-                        'data_publicacao': None,
-                        'autor': None,
-                        'sucesso': False,
-                        'erro': str(e)
-                    })
-        
-        return resultados
+        futuros = [
+            self._submeter({'url': url}, posicao)
+            for posicao, url in enumerate(urls)
+        ]
+        return [self._coletar(futuro, url) for url, futuro in zip(urls, futuros)]
     
     
     def _scrape_url_single(self, url):
         """
         Extrai conteúdo de uma única URL.
-        Wrapper para usar com ThreadPoolExecutor.
+        Wrapper para usar com o agendador global.
         
         Args:
             url (str): URL da notícia
@@ -348,15 +523,13 @@ class NewsScraper:
         else:
             print(f"       Falha: {resultado['erro'][:40]}...")
         
-                                              
-        time.sleep(0.5)
-        
         return resultado
     
     
     def scrape_url(self, url):
         """
         Método de conveniência para extrair uma única URL.
+        Passa pelo agendador global para respeitar a cortesia por host.
         
         Args:
             url (str): URL da notícia
@@ -364,19 +537,7 @@ class NewsScraper:
         Returns:
             dict: Conteúdo extraído
         """
-                         
-        cache_result = self.cache.obter(url)
-        if cache_result:
-            return cache_result
-        
-                 
-        resultado = self._scrape_url_single(url)
-        
-                                 
-        if resultado['sucesso']:
-            self.cache.salvar(url, resultado)
-        
-        return resultado
+        return self._coletar(self._submeter({'url': url}), url)
 
 
                                                                               
@@ -384,7 +545,7 @@ class NewsScraper:
                                                                               
 
                                                  
-_EXTRACTOR_SINGLETON = ContentExtractor()
+_EXTRACTOR_SINGLETON = ContentExtractor(parse_pool=obter_parse_pool())
 _SCRAPE_CACHE_SINGLETON = ScraperCache()
 
 def extrair_conteudo_url(url_info):
@@ -411,10 +572,16 @@ def extrair_conteudo_url(url_info):
         }
 
            
-    cache_hit = _SCRAPE_CACHE_SINGLETON.obter(url)
+    cache_hit = _SCRAPE_CACHE_SINGLETON.obter(
+        url, atualizar=partial(_revalidar, url, _EXTRACTOR_SINGLETON, _SCRAPE_CACHE_SINGLETON)
+    )
     if cache_hit:
         return fonte_nome, cache_hit
 
+    falha = _SCRAPE_CACHE_SINGLETON.obter_falha(url)
+    if falha:
+        return fonte_nome, _resultado_falha_recente(url, falha)
+
                 
     if not url.startswith("http"):
         url = "https://" + url
@@ -427,6 +594,8 @@ def extrair_conteudo_url(url_info):
             res['titulo'] = titulo_prv
         if res.get('sucesso'):
             _SCRAPE_CACHE_SINGLETON.salvar(url, res)
+        else:
+            _SCRAPE_CACHE_SINGLETON.salvar_falha(url, res)
         return fonte_nome, res
     except Exception as e:
         return fonte_nome, {
@@ -439,10 +608,23 @@ def extrair_conteudo_url(url_info):
             'erro': str(e)
         }
 
+def extrair_conteudo_paywall(url_info):
+    """
+    Worker para fontes com paywall (JSON-LD/OpenGraph ou título+snippet).
+    Args:
+        url_info: tuple(str fonte_nome, dict resultado_busca_item)
+    Return:
+        (fonte_nome, dict resultado_extracao)
+    """
+    fonte_nome, dados = url_info
+    if not Config.ENABLE_PAYWALL_STRUCTURED_DATA:
+        return fonte_nome, _conteudo_titulo_snippet(dados or {})
+    return fonte_nome, _extrair_paywall(dados or {}, _EXTRACTOR_SINGLETON, _SCRAPE_CACHE_SINGLETON)
+
 def scrape_noticias_paralelo(resultado_busca):
     """
     Extrai conteúdo de TODAS as URLs simultaneamente (todas as fontes).
-    Respeita fontes com paywall usando título+snippet.
+    Fontes com paywall usam JSON-LD/OpenGraph (ou título+snippet).
     Retorna no mesmo formato do scrape_noticias()/scrape_resultados_busca().
     """
                                           
@@ -465,47 +647,33 @@ def scrape_noticias_paralelo(resultado_busca):
 
                                      
         if fonte_nome in fontes_paywall:
-            print(f"   {fonte_nome}: {len(resultados)} URL(s) (paywall) → título+snippet")
-            for r in resultados:
-                titulo = r.get('title', '')
-                snippet = r.get('snippet', '')
-                url = r.get('url', '')
-                texto = f"{titulo}. {snippet}".strip()
-                ok = len(texto) >= 30
-                conteudos_por_fonte[fonte_nome].append({
-                    'url': url,
-                    'titulo': titulo,
-                    'texto': texto if ok else '',
-                    'data_publicacao': None,
-                    'autor': None,
-                    'metodo_extracao': 'titulo_snippet',
-                    'sucesso': ok,
-                    'erro': None if ok else 'Título+snippet muito curto'
-                })
+            print(f"   {fonte_nome}: {len(resultados)} URL(s) (paywall) → dados estruturados")
+            for posicao, r in enumerate(resultados):
+                tarefas.append((extrair_conteudo_paywall, (fonte_nome, r or {}), posicao))
                 total_urls += 1
-                if ok:
-                    total_sucesso += 1
             continue
 
                                                   
         print(f"   {fonte_nome}: {len(resultados)} URL(s)")
-        for r in resultados:
-            tarefas.append((fonte_nome, r))
+        for posicao, r in enumerate(resultados):
+            tarefas.append((extrair_conteudo_url, (fonte_nome, r or {}), posicao))
             total_urls += 1
 
                                            
     if tarefas:
         print(f"\n Extraindo {len(tarefas)} URLs em PARALELO...")
-        max_workers = min(10, len(tarefas))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_map = {executor.submit(extrair_conteudo_url, info): info for info in tarefas}
-            for future in as_completed(future_map):
-                fonte_nome, resultado = future.result()
-                if fonte_nome not in conteudos_por_fonte:
-                    conteudos_por_fonte[fonte_nome] = []
-                conteudos_por_fonte[fonte_nome].append(resultado)
-                if resultado.get('sucesso'):
-                    total_sucesso += 1
+        scheduler = obter_scrape_scheduler()
+        futuros = [
+            scheduler.submeter(funcao, info, host=host_da_url(info[1].get('url', '')), prioridade=posicao)
+            for funcao, info, posicao in tarefas
+        ]
+        for future in futuros:
+            fonte_nome, resultado = future.result()
+            if fonte_nome not in conteudos_por_fonte:
+                conteudos_por_fonte[fonte_nome] = []
+            conteudos_por_fonte[fonte_nome].append(resultado)
+            if resultado.get('sucesso'):
+                total_sucesso += 1
 
     taxa_sucesso = (total_sucesso / total_urls * 100) if total_urls else 0.0
     print(f"\n Scraping (paralelo) concluído: {total_sucesso}/{total_urls} ({taxa_sucesso:.1f}%)")
@@ -10,7 +10,8 @@ import random
 import unicodedata
 from dataclasses import dataclass
 from collections import Counter
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from functools import partial
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -18,6 +19,10 @@ import requests
 from bs4 import BeautifulSoup
 
 from config import Config
+from modules.fetcher import baixar_html
+from modules.cache_storage import marcar_uso
+from modules.url_canonical import chave_url
+from modules.cache_refresh import agendar_revalidacao, dentro_da_tolerancia
 
                                
                                     
@@ -35,13 +40,15 @@ try:
 except Exception:
     GSEARCH_AVAILABLE = False
 
+TITLE_SNIPPET_MAX_BYTES = 262144
+
 
                                                               
                                                     
                                                               
 
 def _cache_dir() -> str:
-    d = os.path.join(".cache", "search")
+    d = Config.SEARCH_CACHE_DIR
     os.makedirs(d, exist_ok=True)
     return d
 
@@ -52,7 +59,13 @@ def _cache_key(query: str, site: str) -> str:
 def _cache_path(query: str, site: str) -> str:
     return os.path.join(_cache_dir(), f"{_cache_key(query, site)}.json")
 
-def cache_get(query: str, site: str) -> Optional[List[Dict[str, Any]]]:
+def cache_get(query: str, site: str,
+              atualizar: Optional[Callable[[], Any]] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Lê resultados em cache. Com `atualizar`, entradas vencidas há menos de
+    Config.CACHE_STALE_GRACE são devolvidas e `atualizar()` é agendado em
+    segundo plano (deduplicado por chave); sem ele, entrada vencida = None.
+    """
     if not Config.ENABLE_CACHE:
         return None
     path = _cache_path(query, site)
@@ -62,9 +75,12 @@ def cache_get(query: str, site: str) -> Optional[List[Dict[str, Any]]]:
         with open(path, "r", encoding="utf-8") as f:
             payload = json.load(f)
                    
-        ttl = getattr(Config, "CACHE_EXPIRATION", 3600)
-        if time.time() - payload.get("_ts", 0) > ttl:
-            return None
+        idade = time.time() - payload.get("_ts", 0)
+        if idade > Config.CACHE_EXPIRATION:
+            if atualizar is None or not dentro_da_tolerancia(idade):
+                return None
+            agendar_revalidacao(f"busca:{_cache_key(query, site)}", atualizar, host="busca")
+        marcar_uso(path)
         return payload.get("results", None)
     except Exception:
         return None
@@ -269,8 +285,11 @@ def _rank_results_by_keywords(
 
     scored.sort(key=lambda item: (item[0], item[1], item[2]), reverse=True)
     ordenados: List[Dict[str, Any]] = []
+    vistos = set()
     for _, _, _, res in scored:
-        if not any(res.get("url") and res.get("url") == existente.get("url") for existente in ordenados):
+        chave = chave_url(res.get("url", ""))
+        if not chave or chave not in vistos:
+            vistos.add(chave)
             ordenados.append(res)
         if len(ordenados) >= limit:
             break
@@ -304,10 +323,18 @@ class SearchEngine:
         focus_raw, focus_norm = _extract_focus_phrases(query, keywords)
         query_norm = _normalize_for_match(query)
 
-        cached = cache_get(query, dominio)
+        cached = cache_get(query, dominio, atualizar=partial(self._buscar_sem_cache, query, dominio, True))
         if cached is not None:
             return _rank_results_by_keywords(cached, keywords, query_norm, focus_norm, self.max_per_source)
 
+        return self._buscar_sem_cache(query, dominio)
+
+    def _buscar_sem_cache(self, query: str, dominio: str, revalidando: bool = False) -> List[Dict[str, Any]]:
+        """Consulta os métodos de busca e grava o cache (também usado na revalidação)."""
+        keywords = _tokenize_keywords(query)
+        focus_raw, focus_norm = _extract_focus_phrases(query, keywords)
+        query_norm = _normalize_for_match(query)
+
         methods = getattr(Config, "SEARCH_METHODS_PRIORITY", ["serpapi", "googlesearch", "direct"])
         methods = list(dict.fromkeys(list(methods) + ["google_rss"]))
         mode = getattr(Config, "SEARCH_MODE", "mock").lower()
@@ -315,6 +342,7 @@ class SearchEngine:
         variantes = _gerar_variacoes_query(query, keywords, focus_raw)
         max_coleta = max(self.max_per_source * 3, 6)
         resultados_final: List[Dict[str, Any]] = []
+        vistos = set()
 
         for variante in variantes:
             raw = cache_get(variante, dominio)
@@ -328,7 +356,9 @@ class SearchEngine:
             for item in ranqueados:
                 if not item.get("url"):
                     continue
-                if not any(item["url"] == existente.get("url") for existente in resultados_final):
+                chave = chave_url(item["url"])
+                if chave not in vistos:
+                    vistos.add(chave)
                     resultados_final.append(item)
                 if len(resultados_final) >= self.max_per_source:
                     break
@@ -345,7 +375,8 @@ class SearchEngine:
             resultados_final = ranqueados_fallback or raw_fallback[: self.max_per_source]
 
         cache_set(query, dominio, resultados_final)
-        time.sleep(self.delay_between)
+        if not revalidando:
+            time.sleep(self.delay_between)
         return resultados_final[: self.max_per_source]
 
                                                
@@ -471,6 +502,7 @@ class SearchEngine:
     def _buscar_raw(self, query: str, dominio: str, mode: str,
                     methods: List[str], max_coleta: int) -> List[Dict[str, Any]]:
         resultados: List[Dict[str, Any]] = []
+        vistos = set()
 
         modo = mode or "mock"
         modo = modo.lower()
@@ -497,8 +529,10 @@ class SearchEngine:
             for item in encontrados:
                 if not item.get("url"):
                     continue
-                if any(item["url"] == existente.get("url") for existente in resultados):
+                chave = chave_url(item["url"])
+                if chave in vistos:
                     continue
+                vistos.add(chave)
                 resultados.append(item)
                 if len(resultados) >= max_coleta:
                     break
@@ -520,10 +554,9 @@ class SearchEngine:
         sess = session or requests.Session()
         sess.headers.update(self.headers)
         try:
-            r = sess.get(url, timeout=Config.REQUEST_TIMEOUT, allow_redirects=True)
-            if not r.ok:
-                return "", ""
-            soup = BeautifulSoup(r.text, "html.parser")
+            html = baixar_html(url, timeout=Config.REQUEST_TIMEOUT,
+                               max_bytes=TITLE_SNIPPET_MAX_BYTES, session=sess)
+            soup = BeautifulSoup(html, "html.parser")
             title = soup.find("title").get_text(strip=True) if soup.find("title") else url
             ogdesc = soup.find("meta", attrs={"property": "og:description"})
             desc = ogdesc["content"] if ogdesc and ogdesc.get("content") else ""
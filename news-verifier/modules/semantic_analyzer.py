@@ -1,18 +1,34 @@
                               
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 import re
 from config import Config
+from modules.cache_storage import hash_conteudo
+from modules.embedding_store import chave_embedding, obter_armazenamento_embeddings
+from modules.embedding_backends import carregar_backend, identificador_embeddings
+from modules.embedding_server import conectar_servidor
+from modules.evidence_index import obter_indice_evidencias
+from modules.inference_batcher import com_micro_lotes
+from modules.passages import dividir_passagens, selecionar_passagens
+from modules.scrape_scheduler import obter_scrape_scheduler
+from modules.url_canonical import chave_url
+from modules.article_features import (
+    STRONG_NEGATION_WORDS,
+    STRONG_DEBUNK_PATTERNS,
+    calcular_features,
+    extrair_numeros,
+    obter_armazenamento_features,
+    referencia_embedding
+)
+from bisect import bisect_left
+from functools import partial
 import time
 
                                    
 import os
-import hashlib
 import pickle
 
                                   
-CACHE_DIR = os.path.join("cache", "embeddings")
+CACHE_DIR = Config.EMBEDDING_CACHE_DIR
 os.makedirs(CACHE_DIR, exist_ok=True)
 
 
@@ -20,14 +36,6 @@ os.makedirs(CACHE_DIR, exist_ok=True)
                                      
                                                                               
 
-                                                      
-STRONG_NEGATION_WORDS = [
-    'não', 'nao', 'nunca', 'jamais', 'nenhum', 'nenhuma',
-    'falso', 'falsa', 'mentira', 'fake', 'desmentido', 'desmente',
-    'incorreto', 'incorreta', 'errado', 'errada',
-    'boato', 'desinformação', 'fake news'
-]
-
                                                                  
 NEUTRAL_WORDS = [
     'quer', 'pretende', 'planeja', 'projeta', 'estuda', 'avalia',
@@ -35,29 +43,6 @@ NEUTRAL_WORDS = [
     'pode', 'deve', 'vai', 'irá', 'poderá', 'deverá'
 ]
 
-                                                       
-STRONG_DEBUNK_PATTERNS = [
-    r'é\s+falso\s+que',
-    r'não\s+é\s+verdade\s+que',
-    r'checagem.*conclu[ií].*falso',
-    r'fact.*check.*falso',
-    r'desmente.*completamente',
-    r'totalmente\s+falso',
-    r'não\s+há\s+nenhuma\s+evidência',
-    r'completamente\s+sem\s+fundamento',
-    r'boato\s+que\s+circula'
-]
-
-
-def extrair_numeros(texto):
-    """
-    Extrai números do texto para comparação.
-    Exemplo: "R$ 1.631" → 1631.0
-    """
-                                        
-    numeros = re.findall(r'[\d]+[.,]?[\d]*', texto.replace('.', '').replace(',', '.'))
-    return [float(n.replace(',', '.')) for n in numeros if n]
-
 
 def numeros_similares(nums1, nums2, tolerancia=0.05):
     """
@@ -76,11 +61,45 @@ def numeros_similares(nums1, nums2, tolerancia=0.05):
     return False
 
 
-def detectar_contradicao_inteligente(texto_original, texto_fonte, similaridade_semantica):
+def normalizar_l2(vetores):
+    """
+    Normaliza um vetor (ou cada linha de uma matriz) para norma 1, de modo
+    que o cosseno vire um produto escalar. Vetores nulos continuam nulos.
+    """
+    vetores = np.asarray(vetores, dtype=np.float32)
+    normas = np.linalg.norm(vetores, axis=-1, keepdims=True)
+    return vetores / np.where(normas > 0, normas, 1.0)
+
+
+def similaridades(vetor, matriz):
+    """
+    Cosseno de um embedding normalizado com cada linha de uma matriz de
+    embeddings normalizados: um único produto matriz-vetor.
+    
+    Returns:
+        np.ndarray: (n,) float32
+    """
+    if not len(matriz):
+        return np.zeros((0,), dtype=np.float32)
+    return np.asarray(matriz, dtype=np.float32) @ vetor
+
+
+def _negacao_no_intervalo(posicoes, tamanho, inicio, fim):
+    """Há ocorrência (posições ordenadas) inteiramente dentro de [inicio, fim)?"""
+    if not posicoes:
+        return False
+    i = bisect_left(posicoes, inicio)
+    return i < len(posicoes) and posicoes[i] + tamanho <= fim
+
+
+def detectar_contradicao_inteligente(texto_original, texto_fonte, similaridade_semantica, features_fonte=None):
     """
     Detecta contradição de forma INTELIGENTE, evitando falsos positivos.
+    
+    `features_fonte` é o registro de article_features.py da fonte; quando
+    a matéria veio do cache ele já está pronto e evita refazer minúsculas,
+    números, padrões de desmentido e a busca das negações.
     """
-    texto_fonte_lower = texto_fonte.lower()
     texto_original_lower = texto_original.lower()
     
     evidencias = []
@@ -96,8 +115,12 @@ def detectar_contradicao_inteligente(texto_original, texto_fonte, similaridade_s
         }
     
                                                  
+    if features_fonte is None:
+        features_fonte = calcular_features(texto_fonte)
+    texto_fonte_lower = features_fonte['texto_normalizado']
+    
     nums_original = extrair_numeros(texto_original)
-    nums_fonte = extrair_numeros(texto_fonte)
+    nums_fonte = features_fonte['numeros']
     if nums_original and nums_fonte:
         if numeros_similares(nums_original, nums_fonte, tolerancia=0.05):
             return {
@@ -108,11 +131,9 @@ def detectar_contradicao_inteligente(texto_original, texto_fonte, similaridade_s
             }
     
                                            
-    for pattern in STRONG_DEBUNK_PATTERNS:
-        match = re.search(pattern, texto_fonte_lower)
-        if match:
-            score_contradicao += 0.5
-            evidencias.append(f"Padrão de desmentido: '{match.group(0)}'")
+    for trecho in features_fonte['desmentidos']:
+        score_contradicao += 0.5
+        evidencias.append(f"Padrão de desmentido: '{trecho}'")
     
                                                          
     palavras_chave = [w for w in texto_original_lower.split() if len(w) > 4 and w not in NEUTRAL_WORDS][:5]
@@ -122,9 +143,8 @@ def detectar_contradicao_inteligente(texto_original, texto_fonte, similaridade_s
         for pos in posicoes:
             inicio = max(0, pos - 50)
             fim = min(len(texto_fonte_lower), pos + len(palavra_chave) + 50)
-            contexto = texto_fonte_lower[inicio:fim]
             for negacao in STRONG_NEGATION_WORDS:
-                if negacao in contexto:
+                if _negacao_no_intervalo(features_fonte['negacoes'].get(negacao), len(negacao), inicio, fim):
                     negacoes_contextuais += 1
                     evidencias.append(f"Negação '{negacao}'próxima de '{palavra_chave}'")
     if negacoes_contextuais >= 2:
@@ -151,30 +171,57 @@ def detectar_contradicao_inteligente(texto_original, texto_fonte, similaridade_s
                                 
                                                                               
 
-_semantic_model = None
+_semantic_models = {}
 
 
-def _carregar_modelo():
+def _reserva_local(modelo, backend):
+    """Modelo local no backend do servidor (reserva do ClienteEmbeddings)."""
+    carregado, efetivo = carregar_backend(modelo, backend)
+    return com_micro_lotes(carregado), efetivo
+
+
+def _carregar_modelo(modelo=None):
     """
-    Carrega o modelo sentence-transformers apenas uma vez.
+    Carrega um modelo sentence-transformers apenas uma vez, no backend
+    escolhido em Config.EMBEDDING_BACKEND (ver embedding_backends.py).
+    
+    Com Config.EMBEDDING_SERVER_SOCKET, usa o servidor de embeddings
+    (embedding_server.py) no lugar de uma cópia local do modelo; se ele
+    não responder, carrega localmente (também depois, se o servidor cair
+    com o worker já rodando, mas só no mesmo backend do servidor, para não
+    misturar espaços de embeddings). Modelos locais passam pelo
+    despachante de micro-lotes (inference_batcher.py).
+    
+    Args:
+        modelo (str): Id do modelo (padrão Config.SENTENCE_TRANSFORMER_MODEL)
+    
+    Returns:
+        tuple: (modelo com encode(), identificador dos embeddings em cache)
     """
-    global _semantic_model
+    modelo = modelo or Config.SENTENCE_TRANSFORMER_MODEL
     
-    if _semantic_model is None:
+    if modelo not in _semantic_models and Config.EMBEDDING_SERVER_SOCKET:
+        cliente, backend = conectar_servidor(modelo, reserva=partial(_reserva_local, modelo))
+        if cliente is not None:
+            print(f"   Modelo {modelo} ({backend}) via servidor de embeddings")
+            _semantic_models[modelo] = (cliente, identificador_embeddings(modelo, backend))
+    
+    if modelo not in _semantic_models:
         print("Carregando modelo sentence-transformers...")
-        print(f"   Modelo: {Config.SENTENCE_TRANSFORMER_MODEL}")
+        print(f"   Modelo: {modelo} ({Config.EMBEDDING_BACKEND})")
         print("    Isso pode demorar 30-60s na primeira vez...")
         
         inicio = time.time()
         try:
-            _semantic_model = SentenceTransformer(Config.SENTENCE_TRANSFORMER_MODEL)
+            carregado, backend = carregar_backend(modelo)
+            _semantic_models[modelo] = (com_micro_lotes(carregado), identificador_embeddings(modelo, backend))
             tempo = time.time() - inicio
             print(f"    Modelo carregado em {tempo:.1f}s!")
         except Exception as e:
             print(f"    ERRO ao carregar modelo: {e}")
             raise
     
-    return _semantic_model
+    return _semantic_models[modelo]
 
 
                                                                               
@@ -187,7 +234,10 @@ class SemanticAnalyzer:
     """
     def __init__(self):
         """Inicializa analyzer com modelo de IA"""
-        self.model = _carregar_modelo()
+        self.model, self.model_id = _carregar_modelo()
+        self.cascata = Config.ENABLE_EMBEDDING_CASCADE and not Config.ENABLE_PASSAGE_SCORING
+        if self.cascata:
+            self.modelo_pequeno, self.modelo_pequeno_id = _carregar_modelo(Config.CASCADE_SMALL_MODEL)
 
                                                            
     def _gerar_embedding_com_cache(self, texto: str) -> np.ndarray:
@@ -195,35 +245,393 @@ class SemanticAnalyzer:
         Gera embedding com cache em disco. Usa hash do texto + id do modelo.
         Limita o texto a 2000 chars (mesma heurística do pipeline).
         """
-        if not texto:
-            return np.zeros((384,), dtype=np.float32)                                          
-
-        texto_lim = texto[:2000]
+        return self._gerar_embeddings_em_lote([texto])[0]
 
-                                                                         
-        model_id = getattr(Config, "SENTENCE_TRANSFORMER_MODEL", "default-model")
-        key_src = f"{model_id}||{texto_lim}".encode("utf-8", "ignore")
-        texto_hash = hashlib.md5(key_src).hexdigest()
-        cache_path = os.path.join(CACHE_DIR, f"{texto_hash}.pkl")
-
-                   
-        if os.path.exists(cache_path):
+    def _gerar_embeddings_em_lote(self, textos, modelo=None, model_id=None):
+        """
+        Embeddings de vários textos: os que estão no armazenamento mapeado
+        (embedding_store.py) saem de uma única consulta em lote, os demais
+        vão para UMA chamada encode() (em lotes de Config.EMBEDDING_BATCH_SIZE)
+        e são acrescentados ao armazenamento. Textos repetidos são
+        codificados uma vez só.
+        
+        Args:
+            textos (list): Textos
+            modelo: Modelo com encode() (padrão: o modelo grande)
+            model_id (str): Identificador do espaço de embeddings do modelo
+        
+        Os vetores são normalizados (norma 1) antes de ir para o
+        armazenamento e de novo na saída, o que cobre os gravados antes da
+        normalização; o cosseno entre eles é um produto escalar.
+        
+        Returns:
+            list: np.ndarray normalizados na ordem de `textos`
+        """
+        modelo = modelo or self.model
+        model_id = model_id or self.model_id
+        armazenamento = obter_armazenamento_embeddings(model_id)
+        embeddings = [None] * len(textos)
+
+        chaves = {}
+        for i, texto in enumerate(textos):
+            if not texto:
+                continue
+            texto_lim = texto[:2000]
+            chaves.setdefault(texto_lim, (chave_embedding(texto_lim, model_id), []))[1].append(i)
+
+        lote = list(chaves)
+        encontrados = armazenamento.obter_varios([chaves[t][0] for t in lote])
+
+        pendentes = []
+        for texto_lim, emb in zip(lote, encontrados):
+            if emb is None:
+                emb = self._ler_pickle_legado(chaves[texto_lim][0], armazenamento)
+            if emb is None:
+                pendentes.append(texto_lim)
+                continue
+            for i in chaves[texto_lim][1]:
+                embeddings[i] = emb
+
+        if pendentes:
+            vetores = normalizar_l2(modelo.encode(
+                pendentes,
+                batch_size=Config.EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True
+            ))
             try:
-                with open(cache_path, "rb") as f:
-                    emb = pickle.load(f)
-                if isinstance(emb, np.ndarray):
-                    return emb
-            except Exception:
-                pass                            
-
-                        
-        emb = self.model.encode(texto_lim, convert_to_numpy=True)
+                armazenamento.adicionar([chaves[t][0] for t in pendentes], vetores)
+            except (OSError, ValueError) as e:
+                print(f"  Erro ao gravar embeddings: {e}")
+            for texto_lim, emb in zip(pendentes, vetores):
+                for i in chaves[texto_lim][1]:
+                    embeddings[i] = emb
+
+        return self._empilhar_normalizados(embeddings)
+
+    def _empilhar_normalizados(self, embeddings):
+        """Lista de vetores → linhas normalizadas (vetor nulo para textos vazios)."""
+        if not embeddings:
+            return []
+        dimensao = next((len(emb) for emb in embeddings if emb is not None), 384)
+        matriz = np.zeros((len(embeddings), dimensao), dtype=np.float32)
+        for i, emb in enumerate(embeddings):
+            if emb is not None:
+                matriz[i] = emb
+        return list(normalizar_l2(matriz))
+
+    def _ler_pickle_legado(self, chave, armazenamento):
+        """Migra um embedding do cache antigo (.pkl por texto), se existir."""
+        cache_path = os.path.join(CACHE_DIR, f"{chave.hex()}.pkl")
+        if not os.path.exists(cache_path):
+            return None
         try:
-            with open(cache_path, "wb") as f:
-                pickle.dump(emb, f, protocol=pickle.HIGHEST_PROTOCOL)
+            with open(cache_path, "rb") as f:
+                emb = pickle.load(f)
+            if not isinstance(emb, np.ndarray):
+                return None
+            emb = normalizar_l2(emb)
+            armazenamento.adicionar([chave], [emb])
+            os.remove(cache_path)
+            return emb
         except Exception:
-            pass
-        return emb
+            return None
+
+    def _features_e_embeddings_em_lote(self, textos, extras=()):
+        """
+        Características e embedding de várias matérias.
+        
+        Matérias salvas pelo cache de scraping já têm o registro pronto
+        (article_features.py); na primeira análise ele ganha a referência
+        do embedding, e nas seguintes os vetores referenciados saem de uma
+        consulta em lote ao embedding_store.py. Textos sem registro são
+        processados na hora, sem gravar. Todos os embeddings que faltam
+        (mais os de `extras`, como o texto verificado) saem de um único
+        _gerar_embeddings_em_lote().
+        
+        Returns:
+            tuple: (lista de (features, np.ndarray), lista de embeddings de `extras`)
+        """
+        model_id = self.model_id
+        armazenamento = obter_armazenamento_features() if Config.ENABLE_ARTICLE_FEATURES else None
+
+        itens = []
+        referencias = {}
+        for n, texto in enumerate(textos):
+            chave = features = None
+            if armazenamento and texto:
+                chave = hash_conteudo(texto)
+                features = armazenamento.obter(chave)
+            if features is None:
+                itens.append([None, calcular_features(texto), None])
+                continue
+            itens.append([chave, features, None])
+            referencia = referencia_embedding(features, model_id)
+            if referencia:
+                referencias[n] = referencia
+
+        if referencias:
+            vetores = obter_armazenamento_embeddings(model_id).obter_varios(list(referencias.values()))
+            for n, vetor in zip(referencias, vetores):
+                if vetor is not None:
+                    itens[n][2] = normalizar_l2(vetor)
+
+        faltando = [i for i, item in enumerate(itens) if item[2] is None]
+        extras = list(extras)
+        gerados = self._gerar_embeddings_em_lote([textos[i] for i in faltando] + extras)
+
+        for i, embedding in zip(faltando, gerados):
+            chave, features, _ = itens[i]
+            if chave and i not in referencias:
+                try:
+                    features = armazenamento.anexar_embedding(
+                        chave, features, chave_embedding(textos[i][:2000], model_id), model_id
+                    )
+                except OSError as e:
+                    print(f"  Erro ao gravar embedding no registro da matéria: {e}")
+            itens[i] = [chave, features, embedding]
+
+        return [(features, embedding) for _, features, embedding in itens], gerados[len(faltando):]
+
+    def _features_e_embedding(self, texto):
+        """Características e embedding de uma matéria (ver _features_e_embeddings_em_lote)."""
+        return self._features_e_embeddings_em_lote([texto])[0][0]
+
+    def preparar_evidencias(self, textos, conteudos=None):
+        """
+        Garante registro de características e embedding para matérias já
+        salvas (usado pelo cache_warmer antes de qualquer verificação).
+        
+        Args:
+            textos (list): Textos das matérias
+            conteudos (list): Matérias (url, titulo, texto, fonte) a incluir
+                no índice de evidências locais
+        
+        Returns:
+            int: Quantidade de textos preparados
+        """
+        textos = [texto for texto in textos if texto]
+        self._features_e_embeddings_em_lote(textos)
+        if conteudos:
+            self.indexar_evidencias(conteudos)
+        return len(textos)
+
+    def _embeddings_em_cache(self, textos):
+        """Embeddings (modelo grande) já armazenados, sem codificar nada (None se ausente)."""
+        armazenamento = obter_armazenamento_embeddings(self.model_id)
+        return armazenamento.obter_varios([chave_embedding(texto[:2000], self.model_id) for texto in textos])
+
+    def indexar_evidencias(self, conteudos, codificar_agora=False):
+        """
+        Acrescenta ao índice de evidências (evidence_index.py) as matérias.
+        
+        As que já têm embedding do modelo grande entram na hora. As demais
+        (no modo cascata, as decididas só pelo modelo pequeno) são
+        codificadas pelo modelo grande numa tarefa de prioridade baixa do
+        agendador de scraping, fora do caminho da verificação.
+        
+        Args:
+            conteudos (list): Dicts com 'url', 'texto', 'titulo' e 'fonte'
+            codificar_agora (bool): Codifica as que faltam nesta chamada
+        
+        Returns:
+            int: Matérias novas no índice (sem contar as agendadas)
+        """
+        if not Config.ENABLE_EVIDENCE_INDEX:
+            return 0
+        conteudos = [c for c in conteudos if c.get('url') and c.get('texto')]
+        if not conteudos:
+            return 0
+        
+        embeddings = self._embeddings_em_cache([c['texto'] for c in conteudos])
+        faltantes = [c for c, emb in zip(conteudos, embeddings) if emb is None]
+        pares = [(c, emb) for c, emb in zip(conteudos, embeddings) if emb is not None]
+        if faltantes and codificar_agora:
+            pares += list(zip(faltantes, self._gerar_embeddings_em_lote([c['texto'] for c in faltantes])))
+        elif faltantes:
+            try:
+                obter_scrape_scheduler().submeter(
+                    self.indexar_evidencias, faltantes, codificar_agora=True,
+                    prioridade=Config.CACHE_REFRESH_PRIORITY
+                )
+            except RuntimeError:
+                pass
+        if not pares:
+            return 0
+        try:
+            return obter_indice_evidencias(self.model_id).adicionar(
+                [c for c, _ in pares], np.stack([emb for _, emb in pares])
+            )
+        except (OSError, ValueError) as e:
+            print(f"  Erro ao atualizar índice de evidências: {e}")
+            return 0
+
+    def buscar_evidencias_locais(self, texto, k=None, minimo=None):
+        """
+        Matérias já raspadas mais parecidas com o texto, pelo índice de
+        evidências, sem busca ao vivo.
+        
+        Args:
+            texto (str): Texto verificado
+            k (int): Quantidade (padrão Config.EVIDENCE_INDEX_TOP_K)
+            minimo (float): Similaridade mínima (padrão Config.EVIDENCE_INDEX_MIN_SIMILARITY)
+        
+        Returns:
+            list: Dicts (url, titulo, fonte, similaridade), do mais parecido ao menos
+        """
+        if minimo is None:
+            minimo = Config.EVIDENCE_INDEX_MIN_SIMILARITY
+        embedding = self._gerar_embeddings_em_lote([texto])[0]
+        return obter_indice_evidencias(self.model_id).buscar(embedding, k=k, minimo=minimo)
+
+    def _acrescentar_evidencias_locais(self, texto_original, conteudos_scraping):
+        """
+        Junta às matérias da busca as do índice local que ainda estão no
+        cache de scraping (marcadas com origem 'indice_local').
+        
+        Returns:
+            tuple: (conteúdos por fonte, matérias acrescentadas)
+        """
+        from modules.scraper import ScraperCache
+        
+        vistos = {
+            chave_url(conteudo.get('url', '')) or conteudo.get('url')
+            for fonte_nome, fonte_conteudos in conteudos_scraping.items()
+            if fonte_nome != 'metadata'
+            for conteudo in (fonte_conteudos or [])
+        }
+        
+        resultado = {fonte: list(itens or []) if fonte != 'metadata' else itens
+                     for fonte, itens in conteudos_scraping.items()}
+        cache = ScraperCache()
+        acrescentadas = 0
+        for evidencia in self.buscar_evidencias_locais(texto_original):
+            if evidencia['chave'] in vistos:
+                continue
+            conteudo = cache.obter(evidencia['url'])
+            if not conteudo or not conteudo.get('texto'):
+                continue
+            vistos.add(evidencia['chave'])
+            resultado.setdefault(evidencia['fonte'] or 'Índice local', []).append({
+                **conteudo,
+                'url': conteudo.get('url') or evidencia['url'],
+                'sucesso': True,
+                'erro': None,
+                'origem': 'indice_local'
+            })
+            acrescentadas += 1
+        return resultado, acrescentadas
+
+    def _decidido_pelo_pequeno(self, similaridade):
+        """
+        O modelo pequeno decide sozinho quando a similaridade está fora da
+        faixa incerta da sua própria escala: abaixo de
+        Config.CASCADE_SMALL_LOW (não relacionado) ou a partir de
+        Config.CASCADE_SMALL_HIGH (confirma forte).
+        """
+        return similaridade < Config.CASCADE_SMALL_LOW or similaridade >= Config.CASCADE_SMALL_HIGH
+
+    def _calibrar_pequeno(self, similaridade):
+        """
+        Leva uma similaridade decidida pelo modelo pequeno para a escala do
+        modelo grande, que é a dos limiares de _analisar_similaridade e de
+        detectar_contradicao_inteligente: [0, CASCADE_SMALL_LOW) vai para
+        [0, SIMILARITY_THRESHOLD_LOW) e [CASCADE_SMALL_HIGH, 1] para
+        [SIMILARITY_THRESHOLD_HIGH, 1], preservando o veredito.
+        """
+        if similaridade < Config.CASCADE_SMALL_LOW:
+            return Config.SIMILARITY_THRESHOLD_LOW * max(similaridade, 0.0) / Config.CASCADE_SMALL_LOW
+        fracao = (similaridade - Config.CASCADE_SMALL_HIGH) / max(1.0 - Config.CASCADE_SMALL_HIGH, 1e-9)
+        return Config.SIMILARITY_THRESHOLD_HIGH + (1.0 - Config.SIMILARITY_THRESHOLD_HIGH) * min(fracao, 1.0)
+
+    def _pontuar_fontes(self, texto_original, textos_fonte):
+        """
+        Similaridade do texto verificado com cada matéria.
+        
+        No modo cascata (Config.ENABLE_EMBEDDING_CASCADE) o modelo pequeno
+        pontua todos os pares e só os que caem na faixa incerta são
+        pontuados de novo pelo modelo grande; os demais recebem a
+        similaridade do pequeno calibrada para a escala do grande.
+        
+        Returns:
+            list: (features, similaridade, nivel) na ordem de `textos_fonte`,
+                  com nivel 'pequeno' ou 'grande' (modelo que decidiu)
+        """
+        if not self.cascata:
+            preparados, (embedding_original,) = self._features_e_embeddings_em_lote(
+                textos_fonte, extras=[texto_original]
+            )
+            pontuacoes = similaridades(embedding_original, [embedding for _, embedding in preparados])
+            return [
+                (features, float(similaridade), 'grande')
+                for (features, _), similaridade in zip(preparados, pontuacoes)
+            ]
+        
+        embeddings = self._gerar_embeddings_em_lote(
+            [texto_original] + list(textos_fonte), self.modelo_pequeno, self.modelo_pequeno_id
+        )
+        pontuacoes = [float(similaridade) for similaridade in similaridades(embeddings[0], embeddings[1:])]
+        pontuados = [
+            [None, self._calibrar_pequeno(similaridade), 'pequeno'] if self._decidido_pelo_pequeno(similaridade) else None
+            for similaridade in pontuacoes
+        ]
+        
+        incertos = [i for i, item in enumerate(pontuados) if item is None]
+        if incertos:
+            preparados, (embedding_original,) = self._features_e_embeddings_em_lote(
+                [textos_fonte[i] for i in incertos], extras=[texto_original]
+            )
+            pontuacoes = similaridades(embedding_original, [embedding for _, embedding in preparados])
+            for i, (features, _), similaridade in zip(incertos, preparados, pontuacoes):
+                pontuados[i] = [features, float(similaridade), 'grande']
+        
+        for item, texto in zip(pontuados, textos_fonte):
+            if item[0] is None:
+                item[0] = self._features_sem_embedding(texto)
+        return [tuple(item) for item in pontuados]
+
+    def _pontuar_passagens(self, texto_original, textos_fonte):
+        """
+        Similaridade por passagens (Config.ENABLE_PASSAGE_SCORING).
+        
+        As matérias são divididas em passagens (passages.py), o orçamento
+        Config.PASSAGE_BUDGET é repartido entre elas e todas as passagens
+        escolhidas, mais o texto verificado, saem de um único lote do modelo
+        grande. Cada matéria vale a sua melhor passagem, e as
+        Config.PASSAGE_TOP_K mais parecidas são as únicas usadas na
+        detecção de contradição.
+        
+        Returns:
+            list: (None, similaridade, 'grande', passagens mais parecidas)
+                  na ordem de `textos_fonte`
+        """
+        passagens = [dividir_passagens(texto) for texto in textos_fonte]
+        escolhidas = [
+            [todas[i] for i in indices]
+            for todas, indices in zip(passagens, selecionar_passagens([len(p) for p in passagens]))
+        ]
+        
+        embeddings = self._gerar_embeddings_em_lote(
+            [texto_original] + [passagem for lista in escolhidas for passagem in lista]
+        )
+        pontuacoes = similaridades(embeddings[0], embeddings[1:])
+        
+        pontuados = []
+        inicio = 0
+        for lista in escolhidas:
+            notas = pontuacoes[inicio:inicio + len(lista)]
+            inicio += len(lista)
+            ordem = np.argsort(-notas)[:Config.PASSAGE_TOP_K]
+            melhor = float(notas[ordem[0]]) if len(lista) else 0.0
+            pontuados.append((None, melhor, 'grande', [lista[i] for i in ordem]))
+        return pontuados
+
+    def _features_sem_embedding(self, texto):
+        """Registro de características (do cache, se houver) sem gerar embedding."""
+        if Config.ENABLE_ARTICLE_FEATURES and texto:
+            features = obter_armazenamento_features().obter(hash_conteudo(texto))
+            if features is not None:
+                return features
+        return calcular_features(texto)
 
     def analisar_noticias(self, texto_original, conteudos_scraping):
         """
@@ -231,8 +639,29 @@ class SemanticAnalyzer:
         """
         print(f"\n Iniciando análise semântica INTELIGENTE...")
         
+        evidencias_locais = 0
+        if Config.ENABLE_EVIDENCE_INDEX and Config.ENABLE_LOCAL_EVIDENCE:
+            conteudos_scraping, evidencias_locais = self._acrescentar_evidencias_locais(
+                texto_original, conteudos_scraping
+            )
+            if evidencias_locais:
+                print(f"   + {evidencias_locais} matéria(s) do índice local")
+        
                                                        
-        embedding_original = self._gerar_embedding_com_cache(texto_original)
+        textos_fonte = [
+            conteudo['texto']
+            for fonte_nome, fonte_conteudos in conteudos_scraping.items()
+            if fonte_nome != 'metadata'
+            for conteudo in (fonte_conteudos or [])
+            if conteudo['sucesso']
+        ]
+        if Config.ENABLE_PASSAGE_SCORING:
+            # Tem precedência sobre a cascata (ver Config.CASCADE_SMALL_LOW)
+            pontuados = self._pontuar_passagens(texto_original, textos_fonte)
+        else:
+            pontuados = [(*item, None) for item in self._pontuar_fontes(texto_original, textos_fonte)]
+        niveis = {'pequeno': 0, 'grande': 0}
+        pontuados_iter = iter(pontuados)
         
         resultados_analise = {}
         total_analisados = 0
@@ -268,17 +697,15 @@ class SemanticAnalyzer:
                     continue
                 
                                                                       
-                embedding_fonte = self._gerar_embedding_com_cache(conteudo['texto'])
-                similaridade = cosine_similarity(
-                    embedding_original.reshape(1, -1),
-                    embedding_fonte.reshape(1, -1)
-                )[0][0]
+                features_fonte, similaridade, nivel, trechos = next(pontuados_iter)
+                niveis[nivel] += 1
                 
                                                                            
                 contradicao = detectar_contradicao_inteligente(
                     texto_original, 
-                    conteudo['texto'],
-                    float(similaridade)
+                    "\n\n".join(trechos) if trechos else conteudo['texto'],
+                    float(similaridade),
+                    features_fonte
                 )
                 
                                  
@@ -287,6 +714,9 @@ class SemanticAnalyzer:
                     conteudo,
                     contradicao
                 )
+                analise['nivel_embedding'] = nivel
+                if trechos:
+                    analise['trechos_relevantes'] = trechos
                 
                 analises_fonte.append(analise)
                 total_analisados += 1
@@ -322,6 +752,14 @@ class SemanticAnalyzer:
         print(f"   ~ Apenas mencionam: {apenas_mencionam}")
         print(f"    Não relacionados: {nao_relacionados}")
         
+        self.indexar_evidencias([
+            {**conteudo, 'fonte': fonte_nome}
+            for fonte_nome, fonte_conteudos in conteudos_scraping.items()
+            if fonte_nome != 'metadata'
+            for conteudo in (fonte_conteudos or [])
+            if conteudo['sucesso'] and conteudo.get('origem') != 'indice_local'
+        ])
+        
         return {
             **resultados_analise,
             'metadata': {
@@ -330,7 +768,9 @@ class SemanticAnalyzer:
                 'confirmam_forte': confirmam_forte,
                 'confirmam_parcial': confirmam_parcial,
                 'apenas_mencionam': apenas_mencionam,
-                'nao_relacionados': nao_relacionados
+                'nao_relacionados': nao_relacionados,
+                'niveis_embedding': niveis,
+                'evidencias_locais': evidencias_locais
             }
         }
     
@@ -372,15 +812,32 @@ class SemanticAnalyzer:
         return self._gerar_embedding_com_cache(texto)
     
     
+    def matriz_similaridade(self, textos_verificados, textos_materias):
+        """
+        Similaridade de cada texto verificado com cada matéria (modo em lote).
+        
+        Todos os textos são codificados numa única chamada e a matriz sai de
+        um único produto entre as duas matrizes de embeddings normalizados.
+        
+        Args:
+            textos_verificados (list): Textos a verificar (linhas)
+            textos_materias (list): Matérias candidatas (colunas)
+        
+        Returns:
+            np.ndarray: (len(textos_verificados), len(textos_materias)) float32
+        """
+        textos_verificados = list(textos_verificados)
+        embeddings = self._gerar_embeddings_em_lote(textos_verificados + list(textos_materias))
+        if not textos_verificados or len(embeddings) == len(textos_verificados):
+            return np.zeros((len(textos_verificados), len(embeddings) - len(textos_verificados)), dtype=np.float32)
+        verificados = np.stack(embeddings[:len(textos_verificados)])
+        materias = np.stack(embeddings[len(textos_verificados):])
+        return verificados @ materias.T
+    
+    
     def comparar_dois_textos(self, texto1, texto2):
         """Compara dois textos."""
-        emb1 = self._gerar_embedding_com_cache(texto1)
-        emb2 = self._gerar_embedding_com_cache(texto2)
-        
-        similaridade = cosine_similarity(
-            emb1.reshape(1, -1),
-            emb2.reshape(1, -1)
-        )[0][0]
+        similaridade = self.matriz_similaridade([texto1], [texto2])[0][0]
         
         contradicao = detectar_contradicao_inteligente(texto1, texto2, float(similaridade))
         
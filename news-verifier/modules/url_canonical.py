@@ -0,0 +1,377 @@
+"""
+url_canonical.py - Normalização Canônica de URLs
+
+Responsabilidade:
+    A mesma matéria chega por várias URLs: com ?utm_source=..., com ou sem
+    barra final, http/https, variante AMP, redirecionamento do Google News.
+    Sem normalização, cada variante vira uma entrada de cache diferente e
+    a matéria pode ser analisada duas vezes na mesma verificação.
+
+    Este módulo define a identidade de uma URL:
+    - canonicalizar_url(): regras estáticas (esquema, host, caminho,
+      parâmetros de rastreamento, AMP, redirecionadores do Google)
+    - registrar_alias(): memoriza destinos de redirecionamento e o
+      <link rel="canonical"> das páginas baixadas
+    - chave_url(): forma canônica seguindo os aliases memorizados; usada
+      pelo cache de scraping, pela deduplicação da busca e pelos filtros
+
+    A URL original continua sendo a usada para baixar a página; a forma
+    canônica serve apenas como identidade.
+
+Autor: Projeto Acadêmico
+Data: 2025
+"""
+
+import atexit
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import Config
+from modules.embedding_store import trava_arquivo
+
+
+PARAMETROS_RASTREAMENTO = {
+    'fbclid', 'gclid', 'dclid', 'gclsrc', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', 'cmpid', 'ref', 'ref_src', 'ref_url', 'referrer',
+    'share', 'ito', 'xtor', '_ga', '_gl', 'amp', 'outputtype', 'fref', 'ocid'
+}
+
+PREFIXOS_RASTREAMENTO = ('utm_', 'hsa_', 'pk_', 'mtm_', 'at_')
+
+_REDIRECIONADORES = {
+    'google.com': ('url', 'q'),
+    'news.google.com': ('url',),
+    'l.facebook.com': ('u',),
+    'lm.facebook.com': ('u',),
+}
+
+_PREFIXOS_HOST = ('www.', 'amp.', 'm.', 'mobile.')
+_SUFIXOS_SEGUNDO_NIVEL = {'com', 'gov', 'org', 'net', 'edu', 'jus', 'leg', 'mil'}
+
+_LINK_CANONICO = re.compile(
+    r'<link\b[^>]*\brel\s*=\s*["\']?canonical["\']?[^>]*>', re.IGNORECASE
+)
+_META_OG_URL = re.compile(
+    r'<meta\b[^>]*\bproperty\s*=\s*["\']og:url["\'][^>]*>', re.IGNORECASE
+)
+_HREF = re.compile(r'\b(?:href|content)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def _host_sem_prefixos(host):
+    host = host.lower().rstrip('.')
+    alterado = True
+    while alterado:
+        alterado = False
+        for prefixo in _PREFIXOS_HOST:
+            if host.startswith(prefixo) and host.count('.') > 1:
+                host = host[len(prefixo):]
+                alterado = True
+    return host
+
+
+def dominio_base(host):
+    """
+    Domínio registrável aproximado (g1.globo.com → globo.com,
+    www1.folha.uol.com.br → uol.com.br).
+    """
+    partes = _host_sem_prefixos(host or '').split('.')
+    if len(partes) >= 3 and len(partes[-1]) == 2 and partes[-2] in _SUFIXOS_SEGUNDO_NIVEL:
+        return '.'.join(partes[-3:])
+    return '.'.join(partes[-2:])
+
+
+def _desembrulhar_redirecionador(partes):
+    """Extrai o destino de links de redirecionamento (Google, Facebook...)."""
+    host = _host_sem_prefixos(partes.hostname or '')
+    if host not in _REDIRECIONADORES:
+        return None
+    for chave, valor in parse_qsl(partes.query, keep_blank_values=False):
+        if chave.lower() in _REDIRECIONADORES[host] and valor.startswith('http'):
+            return valor
+    return None
+
+
+def _desembrulhar_ampproject(host, caminho):
+    """<site>.cdn.ampproject.org/c/s/<host>/<caminho> → <host>/<caminho>."""
+    if not host.endswith('.cdn.ampproject.org'):
+        return None
+    segmentos = [s for s in caminho.split('/') if s]
+    while segmentos and segmentos[0] in ('c', 'v', 's', 'i'):
+        segmentos.pop(0)
+    if not segmentos:
+        return None
+    return segmentos[0], '/' + '/'.join(segmentos[1:])
+
+
+def _caminho_sem_amp(caminho):
+    segmentos = [s for s in caminho.split('/') if s]
+    if segmentos[:2] == ['google', 'amp']:
+        segmentos = segmentos[2:]
+    segmentos = [s for s in segmentos if s.lower() != 'amp']
+    if segmentos:
+        ultimo = segmentos[-1]
+        for sufixo in ('.amp.html', '.amp.htm', '.amp'):
+            if ultimo.lower().endswith(sufixo):
+                extensao = '.html' if sufixo.endswith('.html') else '.htm' if sufixo.endswith('.htm') else ''
+                segmentos[-1] = ultimo[:-len(sufixo)] + extensao
+                break
+    return '/' + '/'.join(segmentos)
+
+
+def canonicalizar_url(url):
+    """
+    Forma canônica de uma URL, só com regras estáticas (sem rede).
+
+    Args:
+        url (str): URL como veio da busca
+
+    Returns:
+        str: URL canônica ('' para entrada vazia)
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+    if '://' not in url:
+        url = 'https://' + url.lstrip('/')
+
+    for _ in range(3):
+        partes = urlsplit(url)
+        destino = _desembrulhar_redirecionador(partes)
+        if not destino:
+            break
+        url = destino
+
+    partes = urlsplit(url)
+    host = (partes.hostname or '').lower()
+    caminho = partes.path or '/'
+
+    ampproject = _desembrulhar_ampproject(host, caminho)
+    if ampproject:
+        host, caminho = ampproject
+
+    host = _host_sem_prefixos(host)
+    porta = partes.port
+    if porta and porta not in (80, 443):
+        host = f"{host}:{porta}"
+
+    caminho = re.sub(r'/{2,}', '/', caminho)
+    caminho = _caminho_sem_amp(caminho)
+    if len(caminho) > 1:
+        caminho = caminho.rstrip('/')
+
+    parametros = sorted(
+        (chave, valor)
+        for chave, valor in parse_qsl(partes.query, keep_blank_values=True)
+        if chave.lower() not in PARAMETROS_RASTREAMENTO
+        and not chave.lower().startswith(PREFIXOS_RASTREAMENTO)
+    )
+
+    return urlunsplit(('https', host, caminho, urlencode(parametros), ''))
+
+
+def canonico_do_html(html, url_base=None):
+    """
+    Lê o <link rel="canonical"> (ou og:url) do início de uma página.
+
+    Returns:
+        str ou None: URL absoluta declarada pela página
+    """
+    if not html:
+        return None
+    cabecalho = html[:200_000]
+    for padrao in (_LINK_CANONICO, _META_OG_URL):
+        tag = padrao.search(cabecalho)
+        if not tag:
+            continue
+        href = _HREF.search(tag.group(0))
+        if not href:
+            continue
+        destino = href.group(1).strip()
+        if destino.startswith('//'):
+            destino = 'https:' + destino
+        elif destino.startswith('/') and url_base:
+            base = urlsplit(url_base)
+            destino = f"{base.scheme or 'https'}://{base.netloc}{destino}"
+        if destino.startswith('http'):
+            return destino
+    return None
+
+
+class RegistroAliases:
+    """
+    Mapa persistente URL canônica → URL canônica de destino (redirects e
+    rel=canonical). Limitado em tamanho; gravado em disco de tempos em
+    tempos e na saída do processo, mesclando com o que outros processos
+    gravaram no mesmo arquivo.
+    """
+
+    INTERVALO_GRAVACAO = 30
+
+    def __init__(self, arquivo=None, max_itens=None):
+        """
+        Args:
+            arquivo (str): JSON dos aliases (padrão Config.URL_ALIASES_FILE)
+            max_itens (int): Máximo de aliases (padrão Config.URL_ALIASES_MAX)
+        """
+        self.arquivo = arquivo or Config.URL_ALIASES_FILE
+        self.max_itens = max_itens or Config.URL_ALIASES_MAX
+        self._lock = threading.Lock()
+        self._aliases = self._carregar()
+        self._novos = {}
+        self._ultima_gravacao = time.monotonic()
+
+
+    def _carregar(self):
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            return dict(dados) if isinstance(dados, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+
+    def resolver(self, canonica):
+        """Segue a cadeia de aliases (no máximo 5 saltos)."""
+        with self._lock:
+            for _ in range(5):
+                destino = self._aliases.get(canonica)
+                if not destino or destino == canonica:
+                    break
+                canonica = destino
+        return canonica
+
+
+    def registrar(self, origem, destino):
+        """
+        Memoriza que `origem` leva a `destino`. Ignora destinos de outro
+        site e páginas de seção/home (redirect de matéria removida).
+
+        Returns:
+            bool: True se o alias foi registrado
+        """
+        origem = canonicalizar_url(origem)
+        destino = canonicalizar_url(destino)
+        if not origem or not destino or origem == destino:
+            return False
+
+        host_origem = urlsplit(origem).hostname or ''
+        partes_destino = urlsplit(destino)
+        if dominio_base(host_origem) != dominio_base(partes_destino.hostname or ''):
+            return False
+        if partes_destino.path.count('/') < 2 and len(partes_destino.path) < 12:
+            return False
+
+        with self._lock:
+            if self._aliases.get(origem) == destino:
+                return False
+            self._aliases.pop(origem, None)
+            self._aliases[origem] = destino
+            self._novos[origem] = destino
+            self._limitar(self._aliases)
+            gravar = time.monotonic() - self._ultima_gravacao > self.INTERVALO_GRAVACAO
+
+        if gravar:
+            self.salvar()
+        return True
+
+
+    def _limitar(self, aliases):
+        """Descarta os aliases mais antigos acima de max_itens."""
+        while len(aliases) > self.max_itens:
+            aliases.pop(next(iter(aliases)))
+
+
+    def salvar(self):
+        """
+        Grava os aliases no disco: sob trava, relê o arquivo, acrescenta os
+        aliases registrados aqui desde a última gravação e troca o arquivo
+        de forma atômica. O mapa em memória passa a ser o resultado.
+        """
+        with self._lock:
+            if not self._novos:
+                return
+            novos, self._novos = self._novos, {}
+            self._ultima_gravacao = time.monotonic()
+
+        try:
+            pasta = os.path.dirname(self.arquivo) or '.'
+            os.makedirs(pasta, exist_ok=True)
+            with trava_arquivo(f"{self.arquivo}.trava"):
+                dados = self._carregar()
+                for origem, destino in novos.items():
+                    dados.pop(origem, None)
+                    dados[origem] = destino
+                self._limitar(dados)
+                descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+                try:
+                    with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+                        json.dump(dados, f, ensure_ascii=False)
+                    os.replace(temporario, self.arquivo)
+                except OSError:
+                    if os.path.exists(temporario):
+                        os.remove(temporario)
+                    raise
+        except OSError as e:
+            print(f"  Erro ao salvar aliases de URL: {e}")
+            with self._lock:
+                self._novos = {**novos, **self._novos}
+            return
+
+        with self._lock:
+            for origem, destino in self._novos.items():
+                dados.pop(origem, None)
+                dados[origem] = destino
+            self._limitar(dados)
+            self._aliases = dados
+
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def obter_registro_aliases():
+    """Retorna o registro de aliases compartilhado do processo."""
+    global _registro
+
+    if _registro is None:
+        with _registro_lock:
+            if _registro is None:
+                _registro = RegistroAliases()
+                atexit.register(_registro.salvar)
+
+    return _registro
+
+
+def registrar_alias(origem, destino):
+    """Atalho para obter_registro_aliases().registrar()."""
+    if not destino:
+        return False
+    return obter_registro_aliases().registrar(origem, destino)
+
+
+def registrar_canonico_html(url, html):
+    """Registra o rel=canonical/og:url de uma página recém-baixada."""
+    return registrar_alias(url, canonico_do_html(html, url))
+
+
+def chave_url(url):
+    """
+    Identidade de uma URL: forma canônica seguindo redirects e
+    rel=canonical já observados.
+
+    Args:
+        url (str): URL original
+
+    Returns:
+        str: URL canônica final
+    """
+    canonica = canonicalizar_url(url)
+    if not canonica:
+        return ''
+    return obter_registro_aliases().resolver(canonica)
@@ -0,0 +1,102 @@
+"""
+Benchmark dos backends de embeddings (modules/embedding_backends.py).
+
+Codifica os artigos salvos em cache_scraping/ com cada backend (PyTorch
+fp32, ONNX e ONNX int8) e compara latência por lote, vazão e a
+concordância (cosseno) de cada vetor com a referência PyTorch fp32.
+
+Execute: python tests/benchmark_embedding_backends.py [--artigos 64] [--batch-size 16]
+         [--backends pytorch,onnx,onnx_int8]
+"""
+
+import argparse
+import glob
+import json
+import os
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.cache_storage import ArmazenamentoConteudo
+from modules.embedding_backends import BACKENDS, carregar_backend
+
+
+def carregar_artigos(quantidade):
+    """Textos dos artigos em cache (índices com texto embutido ou objeto)."""
+    objetos = ArmazenamentoConteudo(str(ROOT_DIR / 'cache_scraping' / 'objetos'))
+    textos = []
+    for caminho in sorted(glob.glob(str(ROOT_DIR / 'cache_scraping' / '*.json'))):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        texto = (dados.get('conteudo') or {}).get('texto')
+        if not texto and dados.get('texto_ref'):
+            texto = objetos.ler(dados['texto_ref'])
+        if texto:
+            textos.append(texto[:2000])
+    return [textos[i % len(textos)] for i in range(quantidade)] if textos else []
+
+
+def medir(modelo, textos, batch_size):
+    modelo.encode(textos[:batch_size], batch_size=batch_size, convert_to_numpy=True)
+
+    latencias = []
+    vetores = []
+    inicio = time.perf_counter()
+    for i in range(0, len(textos), batch_size):
+        t0 = time.perf_counter()
+        vetores.append(modelo.encode(textos[i:i + batch_size], batch_size=batch_size, convert_to_numpy=True))
+        latencias.append(time.perf_counter() - t0)
+    duracao = time.perf_counter() - inicio
+    return np.concatenate(vetores), duracao, latencias
+
+
+def cossenos(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--artigos', type=int, default=64)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--backends', default=",".join(BACKENDS))
+    args = parser.parse_args()
+
+    textos = carregar_artigos(args.artigos)
+    if not textos:
+        print("Nenhum artigo em cache_scraping/ para o benchmark.")
+        return
+
+    print("=" * 70)
+    print(f"BENCHMARK EMBEDDINGS - {len(textos)} textos, lote {args.batch_size}, {os.cpu_count()} CPUs")
+    print("=" * 70)
+
+    referencia = None
+    for backend in ['pytorch'] + [b for b in args.backends.split(',') if b.strip() and b != 'pytorch']:
+        modelo, efetivo = carregar_backend(backend=backend)
+        if efetivo != backend:
+            print(f"  {backend:<10} indisponível")
+            continue
+
+        vetores, duracao, latencias = medir(modelo, textos, args.batch_size)
+        if referencia is None:
+            referencia = vetores
+        concordancia = cossenos(vetores, referencia)
+
+        print(
+            f"  {backend:<10} {len(textos) / duracao:7.1f} textos/s"
+            f"   lote p50 {np.percentile(latencias, 50) * 1000:7.1f} ms"
+            f"   p95 {np.percentile(latencias, 95) * 1000:7.1f} ms"
+            f"   cos médio {concordancia.mean():.4f}   mín {concordancia.min():.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark dos micro-lotes de inferência (modules/inference_batcher.py).
+
+Dispara encode() de um texto por vez a partir de 1, 4, 16... threads, com
+o modelo direto e atrás do DespachanteInferencia, e compara a vazão.
+
+Execute: python tests/benchmark_inference_batcher.py [--pedidos 256] [--threads 1,4,16]
+"""
+
+import argparse
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmark_embedding_backends import carregar_artigos
+from modules.embedding_backends import carregar_backend
+from modules.inference_batcher import DespachanteInferencia
+
+
+def medir(modelo, textos, threads):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        inicio = time.perf_counter()
+        list(executor.map(lambda texto: modelo.encode([texto], convert_to_numpy=True), textos))
+        return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pedidos', type=int, default=256)
+    parser.add_argument('--threads', default="1,4,16")
+    args = parser.parse_args()
+
+    textos = [texto[:500] for texto in carregar_artigos(args.pedidos)]
+    if not textos:
+        print("Nenhum artigo em cache_scraping/ para o benchmark.")
+        return
+
+    modelo, backend = carregar_backend()
+    despachante = DespachanteInferencia(modelo)
+    modelo.encode(textos[:8], convert_to_numpy=True)
+
+    print("=" * 70)
+    print(f"BENCHMARK MICRO-LOTES - {len(textos)} pedidos de 1 texto, {backend}, {os.cpu_count()} CPUs")
+    print("=" * 70)
+
+    for threads in [int(t) for t in args.threads.split(',') if t.strip()]:
+        direto = medir(modelo, textos, threads)
+        em_lote = medir(despachante, textos, threads)
+        print(
+            f"  {threads:>3} threads   direto {len(textos) / direto:7.1f} textos/s"
+            f"   micro-lotes {len(textos) / em_lote:7.1f} textos/s"
+        )
+    print(f"  {despachante.estatisticas()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark do pool de processos de parsing (modules/parse_pool.py).
+
+Monta páginas HTML a partir dos artigos salvos em cache_scraping/ (com
+marcação extra para simular menus, scripts e comentários) e mede quantas
+páginas por segundo a cascata de extração processa com 1, 2, 4... workers.
+
+Execute: python tests/benchmark_parse_pool.py [--paginas 200] [--workers 1,2,4]
+"""
+
+import argparse
+import glob
+import json
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('ENABLE_EXTRACTION_TEMPLATES', 'False')
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.cache_storage import ArmazenamentoConteudo
+from modules.parse_pool import ParsePool
+
+
+RUIDO = "".join(
+    f'<div class="menu-item"><a href="/secao-{i}">Seção {i}</a><span>Chamada secundária {i}</span></div>'
+    for i in range(150)
+)
+
+
+def carregar_artigos():
+    """Artigos em cache (índices com texto embutido ou objeto)."""
+    objetos = ArmazenamentoConteudo(str(ROOT_DIR / 'cache_scraping' / 'objetos'))
+    artigos = []
+    for caminho in glob.glob(str(ROOT_DIR / 'cache_scraping' / '*.json')):
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        conteudo = dados.get('conteudo') or {}
+        if not conteudo.get('texto') and dados.get('texto_ref'):
+            conteudo = {**conteudo, 'texto': objetos.ler(dados['texto_ref'])}
+        if conteudo.get('texto'):
+            artigos.append({**conteudo, 'titulo': conteudo.get('titulo') or ''})
+    return artigos
+
+
+def montar_paginas(artigos, quantidade):
+    paginas = []
+    for i in range(quantidade):
+        artigo = artigos[i % len(artigos)]
+        paragrafos = "".join(f"<p>{p}</p>" for p in artigo['texto'].split('\n') if p.strip())
+        html = f"""<html><head><title>{artigo['titulo']}</title>
+        <script>var dados = {json.dumps(list(range(500)))};</script></head>
+        <body><header>{RUIDO}</header><h1>{artigo['titulo']}</h1>
+        <article>{paragrafos}</article><aside>{RUIDO}</aside></body></html>"""
+        paginas.append((f"https://exemplo{i}.com.br/noticia/{i}/materia-{i}.html", html))
+    return paginas
+
+
+def medir(paginas, workers):
+    pool = ParsePool(workers=workers)
+    try:
+        pool.extrair(*paginas[0])
+        inicio = time.perf_counter()
+        if workers <= 0:
+            resultados = [pool.extrair(url, html) for url, html in paginas]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as threads:
+                resultados = list(threads.map(lambda pagina: pool.extrair(*pagina), paginas))
+        duracao = time.perf_counter() - inicio
+    finally:
+        pool.encerrar()
+
+    sucessos = sum(1 for r in resultados if r['sucesso'])
+    return duracao, sucessos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paginas', type=int, default=120)
+    padrao_workers = sorted({1, 2, 4, os.cpu_count() or 1})
+    parser.add_argument('--workers', default=",".join(str(w) for w in padrao_workers))
+    args = parser.parse_args()
+
+    artigos = carregar_artigos()
+    if not artigos:
+        print("Nenhum artigo em cache_scraping/ para montar as páginas.")
+        return
+
+    paginas = montar_paginas(artigos, args.paginas)
+    print("=" * 70)
+    print(f"BENCHMARK PARSE POOL - {len(paginas)} páginas, {os.cpu_count()} CPUs")
+    print("=" * 70)
+
+    duracao_base, _ = medir(paginas, 0)
+    print(f"  inline (thread)    {len(paginas) / duracao_base:8.1f} páginas/s")
+
+    for workers in [int(w) for w in args.workers.split(',') if w.strip()]:
+        duracao, sucessos = medir(paginas, workers)
+        print(
+            f"  {workers:2d} worker(s)       {len(paginas) / duracao:8.1f} páginas/s"
+            f"   speedup {duracao_base / duracao:4.2f}x   sucessos {sucessos}/{len(paginas)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import pathlib
+import sys
+
+import numpy as np
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.article_features import (
+    ArmazenamentoFeatures,
+    calcular_features,
+    posicoes_termo,
+    referencia_embedding
+)
+from modules.cache_janitor import CacheEmDisco
+from modules.cache_storage import hash_conteudo
+from modules.embedding_store import ArmazenamentoEmbeddings, chave_embedding
+from modules.scraper import ScraperCache
+
+
+TEXTO = "É FALSO QUE a vacina custa R$ 1.631. Não há nenhuma evidência; não, nunca foi aprovada."
+
+
+def test_calcular_features():
+    features = calcular_features(TEXTO)
+
+    assert features['texto_normalizado'] == TEXTO.lower()
+    assert features['numeros'] == [1631.0]
+    assert features['desmentidos'] == ['é falso que', 'não há nenhuma evidência']
+    assert features['negacoes']['não'] == posicoes_termo(TEXTO.lower(), 'não')
+    assert len(features['negacoes']['não']) == 2
+    assert 'jamais' not in features['negacoes']
+    assert features['embedding'] is None
+
+
+def test_salvar_no_cache_grava_registro_e_embedding(tmp_path):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    url = "https://g1.globo.com/saude/vacina.ghtml"
+    cache.salvar(url, {'url': url, 'titulo': 'T', 'texto': TEXTO, 'sucesso': True})
+
+    armazenamento = ArmazenamentoFeatures(str(tmp_path / 'features'))
+    armazenamento.memoria.limpar()
+    chave = hash_conteudo(TEXTO)
+    features = armazenamento.obter(chave)
+    assert features['desmentidos'] == calcular_features(TEXTO)['desmentidos']
+
+    vetor = np.arange(4, dtype=np.float32)
+    embeddings = ArmazenamentoEmbeddings(str(tmp_path / 'embeddings'), dtype='float32')
+    embeddings.adicionar([chave_embedding(TEXTO, 'modelo-a')], [vetor])
+    armazenamento.anexar_embedding(chave, features, chave_embedding(TEXTO, 'modelo-a'), 'modelo-a')
+    armazenamento.memoria.limpar()
+    registro = armazenamento.obter(chave)
+
+    assert registro['embedding'] == {'modelo': 'modelo-a', 'chave': chave_embedding(TEXTO, 'modelo-a').hex()}
+    assert np.array_equal(embeddings.obter(referencia_embedding(registro, 'modelo-a')), vetor)
+    assert referencia_embedding(registro, 'modelo-b') is None
+    assert referencia_embedding({'embedding': {'modelo': 'modelo-a', 'vetor': 'AAAA'}}, 'modelo-a') is None
+
+
+def test_janitor_remove_registro_orfao(tmp_path):
+    armazenamento = ArmazenamentoFeatures(str(tmp_path / 'features'))
+    armazenamento.calcular_se_ausente("matéria sem índice " * 20)
+    for _, caminho in armazenamento.listar():
+        os.utime(caminho, (1, 1))
+
+    relatorio = CacheEmDisco('scraping', str(tmp_path), max_bytes=0).limpar()
+
+    assert relatorio['orfaos'] == 1
+    assert list(armazenamento.listar()) == []
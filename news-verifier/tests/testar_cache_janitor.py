@@ -0,0 +1,102 @@
+import json
+import os
+import pathlib
+import sys
+import time
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import numpy as np
+
+from config import Config
+from modules import cache_janitor
+from modules.cache_janitor import CacheEmDisco
+from modules.evidence_index import IndiceEvidencias
+from modules.scraper import ScraperCache
+
+
+def envelhecer(caminho, segundos):
+    instante = time.time() - segundos
+    os.utime(caminho, (instante, instante))
+
+
+def salvar(cache, url, texto, idade):
+    cache.salvar(url, {'url': url, 'titulo': 'T', 'texto': texto, 'sucesso': True})
+    indice = os.path.join(cache.cache_dir, f"{cache._gerar_chave(url)}.json")
+    envelhecer(indice, idade)
+    for _, caminho in cache.objetos.listar():
+        envelhecer(caminho, 3600)
+    return indice
+
+
+def test_remove_expirados_e_objetos_orfaos(tmp_path):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    indice = salvar(cache, "https://g1.globo.com/a", "texto antigo " * 100, idade=120)
+    with open(indice, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    dados['timestamp'] -= Config.CACHE_EXPIRATION + Config.CACHE_STALE_GRACE + 1
+    with open(indice, 'w', encoding='utf-8') as f:
+        json.dump(dados, f)
+    envelhecer(indice, 120)
+
+    relatorio = CacheEmDisco('scraping', str(tmp_path), max_bytes=0).limpar()
+
+    assert relatorio['expiradas'] == 1
+    assert relatorio['orfaos'] == 1
+    assert not os.path.exists(indice)
+    assert list(cache.objetos.listar()) == []
+
+
+def test_orcamento_despeja_o_menos_usado(tmp_path):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    antigo = salvar(cache, "https://g1.globo.com/antigo", "primeira matéria " * 400, idade=500)
+    recente = salvar(cache, "https://g1.globo.com/recente", "segunda matéria " * 400, idade=100)
+    janitor = CacheEmDisco('scraping', str(tmp_path), max_bytes=0)
+    total = janitor.status()['bytes']
+
+    relatorio = janitor.limpar(max_bytes=total - 1)
+
+    assert relatorio['lru'] == 1
+    assert not os.path.exists(antigo)
+    assert os.path.exists(recente)
+    assert cache.obter("https://g1.globo.com/recente")['texto'].startswith("segunda")
+    assert janitor.status()['objetos'] == 1
+
+
+def test_compactar_migra_entrada_legada(tmp_path):
+    url = "https://g1.globo.com/legado"
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    indice = os.path.join(str(tmp_path), f"{cache._gerar_chave(url)}.json")
+    with open(indice, 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'timestamp': time.time(),
+                   'conteudo': {'url': url, 'titulo': 'T', 'texto': 'corpo legado ' * 50, 'sucesso': True}}, f)
+
+    janitor = CacheEmDisco('scraping', str(tmp_path), max_bytes=0)
+    assert janitor.status()['legadas'] == 1
+
+    relatorio = janitor.compactar()
+
+    assert relatorio['migradas'] == 1
+    assert relatorio['orfaos'] == 0
+    assert janitor.status()['legadas'] == 0
+    assert cache.obter(url)['texto'].startswith('corpo legado')
+
+
+def test_indice_de_evidencias_perde_materias_fora_do_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'SCRAPE_CACHE_DIR', str(tmp_path / 'scraping'))
+    monkeypatch.setattr(cache_janitor, 'CARENCIA_SEGUNDOS', -1)
+    cache = ScraperCache(cache_dir=Config.SCRAPE_CACHE_DIR)
+    mantida, despejada = "https://g1.globo.com/mantida", "https://g1.globo.com/despejada"
+    cache.salvar(mantida, {'url': mantida, 'titulo': 'M', 'texto': 'corpo ' * 50, 'sucesso': True})
+    indice = IndiceEvidencias(str(tmp_path / 'evidencias' / 'modelo'), usar_hnsw=False)
+    indice.adicionar([{'url': mantida}, {'url': despejada}], np.eye(2, 8, dtype=np.float32))
+
+    janitor = CacheEmDisco('evidencias', str(tmp_path / 'evidencias'), max_bytes=0, tipo='evidencias')
+    assert janitor.status()['entradas'] == 2
+
+    relatorio = janitor.limpar()
+
+    assert relatorio['orfaos'] == 1
+    assert [r['url'] for r in indice.buscar(np.ones(8), k=5)] == [mantida]
@@ -0,0 +1,97 @@
+import json
+import pathlib
+import sys
+import threading
+import time
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from config import Config
+from modules import scraper, searcher
+from modules.cache_refresh import Revalidador
+from modules.scrape_scheduler import ScrapeScheduler
+
+
+def _envelhecer(arquivo, campo, segundos):
+    dados = json.loads(arquivo.read_text(encoding='utf-8'))
+    dados[campo] -= segundos
+    arquivo.write_text(json.dumps(dados), encoding='utf-8')
+
+
+def test_revalidador_deduplica_por_chave():
+    scheduler = ScrapeScheduler(max_workers=2, intervalo_host=0)
+    revalidador = Revalidador(scheduler=scheduler)
+    liberar = threading.Event()
+    chamadas = []
+
+    def atualizar():
+        chamadas.append(1)
+        liberar.wait(5)
+
+    try:
+        assert revalidador.agendar('busca:x', atualizar) is True
+        assert revalidador.agendar('busca:x', atualizar) is False
+        liberar.set()
+
+        for _ in range(100):
+            if revalidador.estatisticas()['em_andamento'] == 0:
+                break
+            time.sleep(0.01)
+
+        assert chamadas == [1]
+        assert revalidador.estatisticas()['ignoradas'] == 1
+        assert revalidador.agendar('busca:x', atualizar) is True
+    finally:
+        scheduler.encerrar()
+
+
+def test_scraper_cache_serve_obsoleto_e_agenda(tmp_path, monkeypatch):
+    agendadas = []
+    monkeypatch.setattr(scraper, 'agendar_revalidacao',
+                        lambda chave, funcao, host=None: agendadas.append((chave, host)))
+    cache = scraper.ScraperCache(cache_dir=str(tmp_path))
+    url = "https://g1.globo.com/politica/materia.ghtml"
+    cache.salvar(url, {'url': url, 'titulo': 'T', 'texto': 'corpo', 'sucesso': True})
+    arquivo = next(tmp_path.glob('*.json'))
+    _envelhecer(arquivo, 'timestamp', Config.CACHE_EXPIRATION + 10)
+    cache.memoria.limpar()
+
+    assert cache.obter(url) is None
+    assert arquivo.exists()
+
+    conteudo = cache.obter(url, atualizar=lambda: None)
+
+    assert conteudo['texto'] == 'corpo'
+    assert agendadas == [(f"scraping:{cache._gerar_chave(url)}", 'g1.globo.com')]
+
+
+def test_scraper_cache_bloqueia_apos_expiracao_definitiva(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper, 'agendar_revalidacao', lambda *a, **k: None)
+    cache = scraper.ScraperCache(cache_dir=str(tmp_path))
+    url = "https://g1.globo.com/politica/materia.ghtml"
+    cache.salvar(url, {'url': url, 'titulo': 'T', 'texto': 'corpo', 'sucesso': True})
+    arquivo = next(tmp_path.glob('*.json'))
+    _envelhecer(arquivo, 'timestamp', Config.CACHE_EXPIRATION + Config.CACHE_STALE_GRACE + 10)
+    cache.memoria.limpar()
+
+    assert cache.obter(url, atualizar=lambda: None) is None
+    assert not arquivo.exists()
+
+
+def test_cache_de_busca_obsoleto_so_com_atualizar(tmp_path, monkeypatch):
+    agendadas = []
+    monkeypatch.setattr(Config, 'SEARCH_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(searcher, 'agendar_revalidacao',
+                        lambda chave, funcao, host=None: agendadas.append(chave))
+    searcher.cache_set("vacina", "g1.globo.com", [{'url': 'https://g1.globo.com/a'}])
+    arquivo = next(tmp_path.glob('*.json'))
+    _envelhecer(arquivo, '_ts', Config.CACHE_EXPIRATION + 10)
+
+    assert searcher.cache_get("vacina", "g1.globo.com") is None
+    assert searcher.cache_get("vacina", "g1.globo.com", atualizar=lambda: None)[0]['url'].endswith('/a')
+    assert len(agendadas) == 1
+
+    _envelhecer(arquivo, '_ts', Config.CACHE_STALE_GRACE)
+    assert searcher.cache_get("vacina", "g1.globo.com", atualizar=lambda: None) is None
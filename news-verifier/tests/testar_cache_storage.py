@@ -0,0 +1,61 @@
+import os
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.cache_storage import ArmazenamentoConteudo, hash_conteudo
+from modules.scraper import ScraperCache
+
+
+TEXTO = "Reportagem sindicalizada publicada por várias afiliadas. " * 50
+
+
+def test_objeto_gzip_e_idempotente(tmp_path):
+    armazenamento = ArmazenamentoConteudo(str(tmp_path), compressao='gzip')
+
+    chave = armazenamento.guardar(TEXTO)
+
+    assert chave == hash_conteudo(TEXTO)
+    assert armazenamento.guardar(TEXTO) == chave
+    assert armazenamento.ler(chave) == TEXTO
+    assert [c for c, _ in armazenamento.listar()] == [chave]
+    assert armazenamento.localizar(chave).endswith('.gz')
+    assert pathlib.Path(armazenamento.localizar(chave)).stat().st_size < len(TEXTO.encode()) / 5
+
+
+def test_guardar_objeto_existente_renova_o_uso(tmp_path):
+    armazenamento = ArmazenamentoConteudo(str(tmp_path), compressao='gzip')
+    caminho = armazenamento.localizar(armazenamento.guardar(TEXTO))
+    os.utime(caminho, (1_000_000, 1_000_000))
+
+    armazenamento.guardar(TEXTO)
+
+    assert os.path.getmtime(caminho) > 1_000_000
+
+
+def test_urls_com_mesmo_texto_compartilham_objeto(tmp_path):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    urls = ["https://g1.globo.com/a.ghtml", "https://oglobo.globo.com/b.ghtml"]
+
+    for url in urls:
+        cache.salvar(url, {'url': url, 'titulo': 'T', 'texto': TEXTO, 'sucesso': True})
+
+    assert len(list(cache.objetos.listar())) == 1
+    for url in urls:
+        conteudo = cache.obter(url)
+        assert conteudo['url'] == url
+        assert conteudo['texto'] == TEXTO
+
+
+def test_indice_sem_objeto_vira_cache_miss(tmp_path):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    url = "https://g1.globo.com/a.ghtml"
+    cache.salvar(url, {'url': url, 'titulo': 'T', 'texto': TEXTO, 'sucesso': True})
+
+    cache.objetos.remover(hash_conteudo(TEXTO))
+    cache.memoria.limpar()
+
+    assert cache.obter(url) is None
@@ -0,0 +1,108 @@
+import pathlib
+import sys
+from concurrent.futures import Future
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.cache_warmer import AquecedorCache, extrair_links, parece_materia
+from modules.scraper import ScraperCache
+
+
+FONTE = {'nome': 'G1', 'dominio': 'g1.globo.com', 'url_base': 'https://g1.globo.com'}
+
+CAPA = """
+<a href="/politica/noticia/2025/05/10/camara-aprova-projeto.ghtml">Câmara aprova projeto</a>
+<a href="https://g1.globo.com/economia/noticia/2025/05/10/dolar-fecha-em-alta.ghtml">Dólar</a>
+<a href="https://g1.globo.com/economia/">Economia</a>
+<a href="https://g1.globo.com/busca/?q=x">Busca</a>
+<a href="https://www.uol.com.br/noticias/outra-materia-qualquer-aqui.html">Outro site</a>
+<a href="/mais-lidas/">Mais lidas</a>
+"""
+
+MAIS_LIDAS = """
+<a href="/saude/noticia/2025/05/10/surto-de-dengue-avanca.ghtml">Dengue</a>
+<a href="/politica/noticia/2025/05/10/camara-aprova-projeto.ghtml?utm_source=home">Câmara</a>
+"""
+
+
+class SchedulerFalso:
+    def __init__(self, paginas, pendentes=0):
+        self.paginas = paginas
+        self.pendentes = pendentes
+        self.baixadas = []
+
+    def estatisticas(self):
+        return {'pendentes': self.pendentes}
+
+    def submeter(self, funcao, url, host=None, prioridade=0, **kwargs):
+        self.baixadas.append((url, prioridade))
+        futuro = Future()
+        futuro.set_result(self.paginas[url])
+        return futuro
+
+
+class ScraperFalso:
+    def __init__(self, scheduler, cache):
+        self.scheduler = scheduler
+        self.cache = cache
+        self.lotes = []
+
+    def scrape_resultados_busca(self, lote, prioridade_base=0):
+        self.lotes.append((lote, prioridade_base))
+        return {nome: [{'sucesso': True, 'texto': f"texto {i['url']}"} for i in itens]
+                for nome, itens in lote.items()}
+
+
+class AnalisadorFalso:
+    def preparar_evidencias(self, textos, conteudos=None):
+        return len(textos)
+
+
+def test_parece_materia():
+    assert parece_materia("https://g1.globo.com/politica/noticia/x.ghtml", "g1.globo.com")
+    assert parece_materia("https://www.cnnbrasil.com.br/politica/governo-anuncia-novo-programa-social/", "cnnbrasil.com.br")
+    assert not parece_materia("https://g1.globo.com/economia/", "g1.globo.com")
+    assert not parece_materia("https://g1.globo.com/tag/eleicoes-municipais-de-2024/", "g1.globo.com")
+    assert not parece_materia("https://uol.com.br/noticia/x.html", "g1.globo.com")
+
+
+def test_extrair_links_da_capa():
+    materias, mais_lidas = extrair_links(CAPA, FONTE['url_base'], FONTE['dominio'])
+
+    assert [m['url'] for m in materias] == [
+        "https://g1.globo.com/politica/noticia/2025/05/10/camara-aprova-projeto.ghtml",
+        "https://g1.globo.com/economia/noticia/2025/05/10/dolar-fecha-em-alta.ghtml",
+    ]
+    assert mais_lidas == "https://g1.globo.com/mais-lidas/"
+
+
+def test_ciclo_prioriza_mais_lidas_pula_cache_e_respeita_orcamento(tmp_path):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    em_cache = "https://g1.globo.com/saude/noticia/2025/05/10/surto-de-dengue-avanca.ghtml"
+    cache.salvar(em_cache, {'url': em_cache, 'titulo': 'D', 'texto': 'dengue', 'sucesso': True})
+    scheduler = SchedulerFalso({
+        "https://g1.globo.com": CAPA,
+        "https://g1.globo.com/mais-lidas/": MAIS_LIDAS,
+    })
+    scraper = ScraperFalso(scheduler, cache)
+
+    relatorio = AquecedorCache(scraper, orcamento=3, analisador=AnalisadorFalso()).executar_ciclo([FONTE])
+
+    lote, prioridade = scraper.lotes[0]
+    assert [m['url'] for m in lote['G1']] == [
+        "https://g1.globo.com/politica/noticia/2025/05/10/camara-aprova-projeto.ghtml?utm_source=home"
+    ]
+    assert prioridade >= 100
+    assert relatorio == {'paginas': 2, 'materias': 1, 'sucessos': 1, 'embeddings': 1, 'adiado': False}
+
+
+def test_ciclo_adiado_com_fila(tmp_path):
+    scheduler = SchedulerFalso({}, pendentes=3)
+    scraper = ScraperFalso(scheduler, ScraperCache(cache_dir=str(tmp_path)))
+
+    relatorio = AquecedorCache(scraper, analisador=AnalisadorFalso()).executar_ciclo([FONTE])
+
+    assert relatorio['adiado'] is True
+    assert scheduler.baixadas == [] and scraper.lotes == []
@@ -0,0 +1,94 @@
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.dedup import (
+    agrupar_impressoes, colapsar_duplicatas, distancia_hamming, expandir_duplicatas, simhash
+)
+
+
+AGENCIA = (
+    "O Banco Central manteve nesta quarta-feira a taxa básica de juros em 10,5% ao ano, "
+    "na terceira reunião seguida sem alteração. Segundo o comunicado do Copom, o cenário "
+    "externo segue incerto e as expectativas de inflação continuam desancoradas, o que "
+    "exige cautela na condução da política monetária. A decisão foi unânime entre os "
+    "diretores e era esperada pela maioria dos analistas ouvidos pelo mercado financeiro. "
+    "O próximo encontro do comitê está marcado para o início do mês que vem em Brasília."
+)
+OUTRA = (
+    "A seleção brasileira venceu o Uruguai por dois a zero no Maracanã e assumiu a "
+    "liderança das eliminatórias. Os gols foram marcados no segundo tempo, depois de uma "
+    "primeira etapa equilibrada e com poucas chances claras para as duas equipes. O técnico "
+    "elogiou a atuação defensiva e disse que o time ainda precisa melhorar na criação de "
+    "jogadas. A próxima partida será fora de casa, contra a Colômbia, na semana que vem."
+)
+
+
+def _materia(url, texto):
+    return {'url': url, 'titulo': url, 'texto': texto, 'sucesso': True, 'erro': None}
+
+
+def test_simhash_aproxima_copias_e_separa_textos_diferentes():
+    copia = AGENCIA.replace("nesta quarta-feira", "nesta quarta") + " (Com Agência Brasil)"
+
+    assert distancia_hamming(simhash(AGENCIA), simhash(copia)) <= 12
+    assert distancia_hamming(simhash(AGENCIA), simhash(OUTRA)) > 12
+    assert simhash("") == 0
+
+
+def test_agrupamento_por_faixas_e_transitivo():
+    base = 0x0123456789ABCDEF
+    impressoes = [base, base ^ 0b111, base ^ 0b111 ^ (0b11 << 40), ~base & (2 ** 64 - 1), base ^ (0xF << 20)]
+
+    assert agrupar_impressoes(impressoes, limite=3) == [[0, 1, 2]]
+    assert agrupar_impressoes(impressoes, limite=4) == [[0, 1, 2, 4]]
+
+
+def test_colapsa_e_replica_por_fonte():
+    conteudos = {
+        'G1': [_materia('g1', AGENCIA), _materia('g1-curta', "Juros mantidos")],
+        'CNN Brasil': [_materia('cnn', AGENCIA + " Leia mais.")],
+        'UOL': [_materia('uol', AGENCIA), _materia('uol-2', OUTRA)],
+        'Folha': [{'url': 'folha', 'sucesso': False, 'erro': 'timeout', 'texto': None}],
+        'metadata': {'total_sucesso': 5}
+    }
+
+    unicos, grupos = colapsar_duplicatas(conteudos, limite=3)
+
+    assert [m['url'] for m in unicos['CNN Brasil']] == ['cnn']
+    assert [m['url'] for m in unicos['G1']] == ['g1-curta']
+    assert [m['url'] for m in unicos['UOL']] == ['uol-2']
+    assert unicos['Folha'] == conteudos['Folha'] and unicos['metadata'] == conteudos['metadata']
+    assert len(grupos) == 1 and grupos[0][:2] == ('CNN Brasil', 'cnn')
+
+    analise = {
+        'G1': [{**unicos['G1'][0], 'similaridade': 0.1, 'status': 'nao_relacionado'}],
+        'CNN Brasil': [{**unicos['CNN Brasil'][0], 'similaridade': 0.8, 'status': 'confirma_forte',
+                        'contradiz': False, 'confianca_contradicao': 0.0}],
+        'UOL': [{**unicos['UOL'][0], 'similaridade': 0.2, 'status': 'nao_relacionado'}],
+        'Folha': [],
+        'metadata': {'total_analisados': 3, 'confirmam_forte': 1, 'nao_relacionados': 2}
+    }
+
+    completo = expandir_duplicatas(analise, grupos)
+
+    uol = {a['url']: a for a in completo['UOL']}
+    assert uol['uol']['status'] == 'confirma_forte' and uol['uol']['duplicata_de'] == 'cnn'
+    assert uol['uol']['similaridade'] == 0.8 and uol['uol']['texto'] == AGENCIA
+    assert {a['url'] for a in completo['G1']} == {'g1', 'g1-curta'}
+    assert completo['metadata']['total_analisados'] == 5
+    assert completo['metadata']['confirmam_forte'] == 3
+    assert completo['metadata']['duplicatas_colapsadas'] == 2
+    assert analise['metadata']['total_analisados'] == 3
+
+
+def test_sem_duplicatas_nada_muda():
+    conteudos = {'G1': [_materia('a', AGENCIA)], 'UOL': [_materia('b', OUTRA)], 'metadata': {}}
+
+    unicos, grupos = colapsar_duplicatas(conteudos)
+
+    assert unicos is conteudos and grupos == []
+    assert expandir_duplicatas({'metadata': {}}, grupos) == {'metadata': {}}
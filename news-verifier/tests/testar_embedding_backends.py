@@ -0,0 +1,44 @@
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.embedding_backends import BackendONNX, carregar_backend, identificador_embeddings
+
+
+def test_identificador_separa_backends():
+    assert identificador_embeddings('mpnet', 'pytorch') == 'mpnet'
+    assert identificador_embeddings('mpnet', 'onnx') == 'mpnet@onnx'
+    assert identificador_embeddings('mpnet', 'onnx_int8') == 'mpnet@onnx_int8'
+
+
+def test_backend_desconhecido():
+    with pytest.raises(ValueError):
+        carregar_backend('mpnet', 'tensorrt')
+
+
+def test_mean_pooling_respeita_mascara():
+    class Sessao:
+        def run(self, _, alimentacao):
+            lote, tamanho = alimentacao['input_ids'].shape
+            return [np.arange(lote * tamanho * 2, dtype=np.float32).reshape(lote, tamanho, 2)]
+
+    def tokenizador(textos, **kwargs):
+        mascara = np.array([[1, 1, 0], [1, 1, 1]])[:len(textos)]
+        return {'input_ids': np.ones_like(mascara), 'attention_mask': mascara}
+
+    backend = BackendONNX.__new__(BackendONNX)
+    backend.sessao, backend.tokenizador = Sessao(), tokenizador
+    backend.entradas, backend.max_seq_length = {'input_ids', 'attention_mask'}, 128
+
+    vetores = backend.encode(['a', 'b'], batch_size=2)
+
+    assert vetores.shape == (2, 2)
+    assert np.allclose(vetores[0], [1, 2])
+    assert np.allclose(vetores[1], [8, 9])
+    assert backend.encode('a').shape == (2,)
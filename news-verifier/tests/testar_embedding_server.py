@@ -0,0 +1,112 @@
+import pathlib
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules import embedding_server
+from modules.embedding_server import ClienteEmbeddings, ErroProtocolo, ServidorEmbeddings, conectar_servidor
+
+pytestmark = pytest.mark.skipif(not embedding_server.SUPORTADO, reason="sem sockets Unix")
+
+
+class ModeloFalso:
+    def __init__(self, nome):
+        self.nome = nome
+        self.lotes = []
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True):
+        if 'falha' in textos:
+            raise RuntimeError("texto inválido")
+        self.lotes.append(list(textos))
+        return np.array([[len(t), len(self.nome), 0.5] for t in textos], dtype=np.float32)
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    carregados = {}
+
+    def carregar(nome):
+        carregados[nome] = ModeloFalso(nome)
+        return carregados[nome], 'pytorch'
+
+    caminho = str(tmp_path / 'emb.sock')
+    servidor = ServidorEmbeddings(caminho, carregar=carregar)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield caminho, carregados
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_encode_em_lote_pelo_socket(servidor):
+    caminho, carregados = servidor
+    cliente = ClienteEmbeddings(caminho, 'mpnet')
+
+    vetores = cliente.encode(['ab', 'ção', ''])
+    unico = cliente.encode('abcd')
+
+    np.testing.assert_array_equal(vetores, [[2, 5, 0.5], [3, 5, 0.5], [0, 5, 0.5]])
+    np.testing.assert_array_equal(unico, [4, 5, 0.5])
+    assert carregados['mpnet'].lotes == [['ab', 'ção', ''], ['abcd']]
+    assert cliente.encode([]).shape[0] == 0
+
+
+def test_modelos_separados_e_erro_propagado(servidor):
+    caminho, carregados = servidor
+    pequeno = ClienteEmbeddings(caminho, 'minilm')
+
+    assert pequeno.backend() == 'pytorch'
+    assert pequeno.encode(['x'])[0][1] == 6
+    with pytest.raises(ErroProtocolo, match="texto inválido"):
+        pequeno.encode(['falha'])
+    assert pequeno.encode(['y']).shape == (1, 3)
+    assert set(carregados) == {'minilm'}
+
+
+def test_conectar_servidor_indisponivel(tmp_path):
+    assert conectar_servidor('mpnet', str(tmp_path / 'nada.sock')) == (None, None)
+    assert conectar_servidor('mpnet', '') == (None, None)
+
+
+def test_servidor_caido_usa_modelo_local_e_reconecta(servidor, monkeypatch):
+    caminho, carregados = servidor
+    local = ModeloFalso('local-xyz')
+    pedidos = []
+    cliente, _ = conectar_servidor('mpnet', caminho, reserva=lambda backend: pedidos.append(backend) or (local, backend))
+    assert cliente.encode(['ab'])[0][1] == 5
+
+    monkeypatch.setattr(cliente, 'caminho', caminho + '.fora')
+    cliente.fechar()
+    assert cliente.encode(['ab'])[0][1] == len('local-xyz')
+    assert cliente.encode(['abc'])[0][1] == len('local-xyz')
+    assert local.lotes == [['ab'], ['abc']]
+    assert pedidos == ['pytorch']
+
+    monkeypatch.setattr(cliente, 'caminho', caminho)
+    cliente._servidor_fora_ate = 0.0
+    assert cliente.encode(['ab'])[0][1] == 5
+
+
+def test_sem_reserva_servidor_caido_levanta_connection_error(tmp_path):
+    cliente = ClienteEmbeddings(str(tmp_path / 'nada.sock'), 'mpnet')
+
+    with pytest.raises(ConnectionError):
+        cliente.encode(['x'])
+
+
+def test_reserva_em_outro_backend_e_recusada(servidor, monkeypatch):
+    caminho, _ = servidor
+    local = ModeloFalso('local')
+    cliente, _ = conectar_servidor('mpnet', caminho, reserva=lambda backend: (local, 'onnx'))
+    monkeypatch.setattr(cliente, 'caminho', caminho + '.fora')
+    cliente.fechar()
+
+    with pytest.raises(ConnectionError, match="indisponível localmente"):
+        cliente.encode(['ab'])
+    assert local.lotes == []
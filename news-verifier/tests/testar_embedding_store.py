@@ -0,0 +1,97 @@
+import multiprocessing
+import pathlib
+import sys
+
+import numpy as np
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.cache_janitor import CacheEmDisco
+from modules.embedding_store import ArmazenamentoEmbeddings, chave_embedding
+
+
+def _vetor(semente, dimensao=8):
+    return np.random.default_rng(semente).standard_normal(dimensao).astype(np.float32)
+
+
+def _acrescentar(diretorio, inicio):
+    armazenamento = ArmazenamentoEmbeddings(diretorio)
+    for n in range(inicio, inicio + 20):
+        armazenamento.adicionar([chave_embedding(f"texto {n}", 'm')], [_vetor(n)])
+
+
+def test_consulta_em_lote_e_dtype(tmp_path):
+    armazenamento = ArmazenamentoEmbeddings(str(tmp_path), dtype='float16')
+    chaves = [chave_embedding(f"texto {n}", 'm') for n in range(3)]
+    armazenamento.adicionar(chaves, [_vetor(n) for n in range(3)])
+
+    outro_processo = ArmazenamentoEmbeddings(str(tmp_path))
+    vetores = outro_processo.obter_varios([chaves[2], b'x' * 16, chaves[0]])
+
+    assert vetores[1] is None
+    assert vetores[0].dtype == np.float32
+    assert np.allclose(vetores[0], _vetor(2), atol=1e-2)
+    assert np.allclose(vetores[2], _vetor(0), atol=1e-2)
+    assert len(outro_processo) == 3
+
+
+def test_acrescimos_de_varios_processos(tmp_path):
+    contexto = multiprocessing.get_context('spawn')
+    processos = [contexto.Process(target=_acrescentar, args=(str(tmp_path), i * 20)) for i in range(3)]
+    for processo in processos:
+        processo.start()
+    for processo in processos:
+        processo.join(30)
+
+    armazenamento = ArmazenamentoEmbeddings(str(tmp_path))
+    chaves = [chave_embedding(f"texto {n}", 'm') for n in range(60)]
+    vetores = armazenamento.obter_varios(chaves)
+
+    assert all(np.allclose(v, _vetor(n), atol=1e-2) for n, v in enumerate(vetores))
+
+
+def test_escrita_interrompida_nao_desalinha_as_linhas(tmp_path):
+    armazenamento = ArmazenamentoEmbeddings(str(tmp_path), dtype='float32')
+    chaves = [chave_embedding(f"texto {n}", 'm') for n in range(3)]
+    armazenamento.adicionar(chaves[:1], [_vetor(0)])
+    for caminho in armazenamento._arquivos(0):
+        with open(caminho, 'ab') as f:
+            f.write(b'\x01' * 5)
+
+    armazenamento.adicionar(chaves[1:], [_vetor(1), _vetor(2)])
+
+    leitor = ArmazenamentoEmbeddings(str(tmp_path))
+    vetores = leitor.obter_varios(chaves)
+    assert all(np.array_equal(v, _vetor(n)) for n, v in enumerate(vetores))
+
+
+def test_compactar_mantem_os_mais_recentes(tmp_path):
+    armazenamento = ArmazenamentoEmbeddings(str(tmp_path), dtype='float32')
+    chaves = [chave_embedding(f"texto {n}", 'm') for n in range(10)]
+    armazenamento.adicionar(chaves, [_vetor(n) for n in range(10)])
+    leitor = ArmazenamentoEmbeddings(str(tmp_path))
+    assert leitor.obter(chaves[0]) is not None
+
+    relatorio = armazenamento.compactar(max_bytes=4 * (8 * 4 + 20))
+
+    assert relatorio['mantidos'] == 4 and relatorio['removidos'] == 6
+    assert np.array_equal(leitor.obter(chaves[1]), _vetor(1))
+    assert len(leitor) == 4
+    assert leitor.obter(chaves[1]) is None
+    assert np.array_equal(leitor.obter(chaves[9]), _vetor(9))
+
+
+def test_janitor_aplica_orcamento_nas_matrizes(tmp_path):
+    armazenamento = ArmazenamentoEmbeddings(str(tmp_path / 'modelo'), dtype='float32')
+    armazenamento.adicionar(
+        [chave_embedding(f"texto {n}", 'm') for n in range(100)],
+        [_vetor(n, 64) for n in range(100)]
+    )
+
+    relatorio = CacheEmDisco('embeddings', str(tmp_path), max_bytes=10_000, tipo='embeddings').limpar()
+
+    assert relatorio['lru'] > 0
+    assert relatorio['bytes'] <= 10_000
+    assert 0 < len(armazenamento) < 100
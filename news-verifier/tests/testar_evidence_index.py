@@ -0,0 +1,113 @@
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules import evidence_index
+from modules.evidence_index import IndiceEvidencias
+
+
+def _materias(n, inicio=0):
+    return [
+        {'url': f"https://g1.globo.com/politica/noticia/{i}.ghtml", 'titulo': f"Matéria {i}", 'fonte': 'G1'}
+        for i in range(inicio, inicio + n)
+    ]
+
+
+def _vetores(n, dimensao=16, semente=0):
+    return np.random.default_rng(semente).normal(size=(n, dimensao)).astype(np.float32)
+
+
+@pytest.mark.parametrize('usar_hnsw', [False, True])
+def test_busca_devolve_vizinhos_mais_proximos(tmp_path, usar_hnsw):
+    if usar_hnsw and not evidence_index.HNSWLIB_AVAILABLE:
+        pytest.skip("hnswlib não instalado")
+    indice = IndiceEvidencias(str(tmp_path), usar_hnsw=usar_hnsw)
+    vetores = _vetores(50)
+    assert indice.adicionar(_materias(50), vetores) == 50
+
+    consulta = vetores[7] + 0.01 * vetores[3]
+    resultados = indice.buscar(consulta, k=3)
+
+    exatas = (vetores / np.linalg.norm(vetores, axis=1, keepdims=True)) @ (consulta / np.linalg.norm(consulta))
+    assert [r['titulo'] for r in resultados] == [f"Matéria {i}" for i in np.argsort(-exatas)[:3]]
+    assert resultados[0]['similaridade'] == pytest.approx(exatas.max(), abs=1e-4)
+    assert indice.buscar(consulta, k=3, minimo=0.99)[0]['titulo'] == "Matéria 7"
+
+
+def test_urls_repetidas_e_variantes_sao_ignoradas(tmp_path):
+    indice = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    indice.adicionar(_materias(3), _vetores(3))
+
+    variante = [{'url': "https://g1.globo.com/politica/noticia/1.ghtml?utm_source=twitter", 'fonte': 'G1'}]
+    assert indice.adicionar(variante + _materias(1, inicio=3), _vetores(2, semente=1)) == 1
+    assert len(indice) == 4
+
+
+def test_outro_processo_ve_acrescimos_e_grafo_recupera_atraso(tmp_path):
+    primeiro = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    segundo = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    vetores = _vetores(10)
+
+    primeiro.adicionar(_materias(6), vetores[:6])
+    assert len(segundo) == 6
+    segundo.adicionar(_materias(4, inicio=6), vetores[6:])
+
+    assert primeiro.buscar(vetores[8], k=1)[0]['titulo'] == "Matéria 8"
+
+    if evidence_index.HNSWLIB_AVAILABLE:
+        com_grafo = IndiceEvidencias(str(tmp_path), usar_hnsw=True)
+        com_grafo.buscar(vetores[0], k=1)
+        com_grafo.salvar()
+        primeiro.adicionar(_materias(1, inicio=10), _vetores(1, semente=2))
+
+        reaberto = IndiceEvidencias(str(tmp_path), usar_hnsw=True)
+        novo = _vetores(1, semente=2)[0]
+        assert reaberto.buscar(novo, k=1)[0]['titulo'] == "Matéria 10"
+
+
+def test_escrita_interrompida_nao_desalinha(tmp_path):
+    indice = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    vetores = _vetores(3)
+    indice.adicionar(_materias(2), vetores[:2])
+    with open(tmp_path / 'vetores.bin', 'ab') as f:
+        f.write(np.ones(16, dtype=np.float32).tobytes())
+
+    outro = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    outro.adicionar(_materias(1, inicio=2), vetores[2:])
+
+    assert IndiceEvidencias(str(tmp_path), usar_hnsw=False).buscar(vetores[2], k=1)[0]['titulo'] == "Matéria 2"
+
+
+def test_compactar_remove_descartados_e_outro_processo_recarrega(tmp_path):
+    indice = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    outro = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    vetores = _vetores(6)
+    indice.adicionar(_materias(6), vetores)
+    assert len(outro) == 6
+    antes = indice.tamanho_bytes()
+
+    relatorio = indice.compactar(manter=lambda item: item['titulo'] != "Matéria 2")
+
+    assert relatorio['removidos'] == 1 and relatorio['bytes'] < antes
+    assert len(outro) == 5
+    assert outro.buscar(vetores[4], k=1)[0]['titulo'] == "Matéria 4"
+    assert "Matéria 2" not in [r['titulo'] for r in outro.buscar(vetores[2], k=5)]
+    outro.adicionar(_materias(1, inicio=6), _vetores(1, semente=3))
+    assert len(indice) == 6
+
+
+def test_compactar_aplica_orcamento_tirando_os_mais_antigos(tmp_path):
+    indice = IndiceEvidencias(str(tmp_path), usar_hnsw=False)
+    indice.adicionar(_materias(5), _vetores(5))
+    indice.adicionar(_materias(5, inicio=5), _vetores(5, semente=1))
+
+    relatorio = indice.compactar(max_bytes=indice.tamanho_bytes() // 2)
+
+    assert relatorio['lru'] >= 5
+    assert all(r['titulo'] in {f"Matéria {i}" for i in range(5, 10)} for r in indice.buscar(_vetores(1)[0], k=10))
@@ -0,0 +1,95 @@
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.extraction_templates import ExtractionTemplates, padrao_url
+
+
+PARAGRAFOS = [
+    f"Parágrafo {i} da matéria com texto suficiente para passar do limite mínimo de palavras."
+    for i in range(12)
+]
+
+
+def montar_pagina(titulo, paragrafos, data="2025-10-17T10:00:00"):
+    corpo = "".join(f"<p>{p}</p>" for p in paragrafos)
+    return f"""<html><head><title>{titulo} | G1</title>
+    <meta property="article:published_time" content="{data}"></head><body>
+    <div class="menu"><p>Links do menu lateral que não fazem parte da notícia</p></div>
+    <h1 class="content-head__title">{titulo}</h1>
+    <div class="mc-body theme"><article>{corpo}</article></div>
+    </body></html>"""
+
+
+def resultado_cascata(titulo, paragrafos):
+    return {
+        "sucesso": True,
+        "titulo": titulo,
+        "texto": "\n\n".join(paragrafos),
+        "data_publicacao": None,
+        "metodo_extracao": "trafilatura",
+    }
+
+
+def test_padrao_url_generaliza_datas_e_slug():
+    dominio, padrao = padrao_url(
+        "https://www.g1.globo.com/saude/noticia/2025/10/17/cancer-transplante-figado.ghtml"
+    )
+
+    assert dominio == "g1.globo.com"
+    assert padrao == "/saude/noticia/{n}/{n}/{n}/{slug}.ghtml"
+
+
+def test_template_aprendido_extrai_outra_materia_do_mesmo_portal(tmp_path):
+    templates = ExtractionTemplates(str(tmp_path))
+    url = "https://g1.globo.com/saude/noticia/2025/10/17/primeira-materia.ghtml"
+
+    aprendeu = templates.aprender(
+        url, montar_pagina("Primeira matéria", PARAGRAFOS), resultado_cascata("Primeira matéria", PARAGRAFOS)
+    )
+    resultado = templates.extrair(
+        "https://g1.globo.com/saude/noticia/2025/10/18/segunda-materia.ghtml",
+        montar_pagina("Segunda matéria", PARAGRAFOS[::-1], data="2025-10-18T08:00:00"),
+    )
+
+    assert aprendeu is True
+    assert resultado["metodo_extracao"] == "template"
+    assert resultado["titulo"] == "Segunda matéria"
+    assert resultado["data_publicacao"] == "2025-10-18"
+    assert "menu lateral" not in resultado["texto"]
+
+
+def test_template_descartado_apos_falhas_seguidas(tmp_path):
+    templates = ExtractionTemplates(str(tmp_path))
+    url = "https://g1.globo.com/saude/noticia/2025/10/17/primeira-materia.ghtml"
+    templates.aprender(
+        url, montar_pagina("Primeira matéria", PARAGRAFOS), resultado_cascata("Primeira matéria", PARAGRAFOS)
+    )
+
+    for _ in range(templates.max_falhas):
+        assert templates.extrair(url, "<html><body><p>layout novo</p></body></html>") is None
+
+    assert ExtractionTemplates(str(tmp_path))._templates["g1.globo.com"] == []
+
+
+def test_descarte_de_outro_processo_nao_e_ressuscitado(tmp_path):
+    url = "https://g1.globo.com/saude/noticia/2025/10/17/primeira-materia.ghtml"
+    primeiro = ExtractionTemplates(str(tmp_path))
+    primeiro.aprender(
+        url, montar_pagina("Primeira matéria", PARAGRAFOS), resultado_cascata("Primeira matéria", PARAGRAFOS)
+    )
+    segundo = ExtractionTemplates(str(tmp_path))
+    assert len(segundo._templates["g1.globo.com"]) == 1
+
+    for _ in range(primeiro.max_falhas):
+        primeiro.extrair(url, "<html><body><p>layout novo</p></body></html>")
+    segundo.aprender(
+        "https://g1.globo.com/economia/noticia/2025/10/18/outra-materia.ghtml",
+        montar_pagina("Outra matéria", PARAGRAFOS), resultado_cascata("Outra matéria", PARAGRAFOS)
+    )
+
+    padroes = [t['padrao'] for t in ExtractionTemplates(str(tmp_path))._templates["g1.globo.com"]]
+    assert padroes == ["/economia/noticia/{n}/{n}/{n}/{slug}.ghtml"]
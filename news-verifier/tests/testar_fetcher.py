@@ -0,0 +1,110 @@
+import pathlib
+import sys
+
+import pytest
+import requests
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules import fetcher
+from modules.fetcher import ConteudoNaoHTML, baixar_html
+from modules.retry_policy import classificar_erro
+
+
+class RespostaFalsa:
+    def __init__(self, corpo=b'', content_type='text/html', status=200, url=None, history=()):
+        self.corpo = corpo
+        self.headers = {'Content-Type': content_type} if content_type is not None else {}
+        self.status_code = status
+        self.url = url
+        self.history = list(history)
+        self.lidos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for inicio in range(0, len(self.corpo), chunk_size):
+            self.lidos += 1
+            yield self.corpo[inicio:inicio + chunk_size]
+
+
+class SessaoFalsa:
+    def __init__(self, resposta):
+        self.resposta = resposta
+        self.pedidos = []
+
+    def get(self, url, **kwargs):
+        self.pedidos.append((url, kwargs))
+        return self.resposta
+
+
+def _baixar(resposta, **kwargs):
+    return baixar_html("https://g1.globo.com/noticia.ghtml", session=SessaoFalsa(resposta), **kwargs)
+
+
+def test_charset_do_header_e_do_meta():
+    texto = "<html><p>Ação e reação</p></html>"
+
+    assert _baixar(RespostaFalsa(texto.encode('latin-1'), 'text/html; charset=ISO-8859-1')) == texto
+    com_meta = '<html><head><meta charset="iso-8859-1"></head><p>Ação</p></html>'
+    assert _baixar(RespostaFalsa(com_meta.encode('latin-1'))) == com_meta
+    assert _baixar(RespostaFalsa(texto.encode('utf-8'), 'text/html; charset=inexistente')) == texto
+
+
+def test_utf8_partido_entre_blocos(monkeypatch):
+    monkeypatch.setattr(fetcher, 'CHUNK_SIZE', 3)
+    texto = "<p>çãé</p>" * 20
+
+    assert _baixar(RespostaFalsa(texto.encode('utf-8'))) == texto
+
+
+def test_content_type_nao_html_aborta_sem_ler_o_corpo():
+    resposta = RespostaFalsa(b'%PDF-1.7 ...', 'application/pdf')
+
+    with pytest.raises(ConteudoNaoHTML) as erro:
+        _baixar(resposta)
+
+    assert resposta.lidos == 0
+    assert classificar_erro(erro.value) == 'nao_html'
+
+
+def test_assinatura_binaria_com_content_type_html():
+    with pytest.raises(ConteudoNaoHTML):
+        _baixar(RespostaFalsa(b'\x89PNG\r\n\x1a\n' + b'\x00' * 64))
+
+
+def test_limite_de_bytes_trunca(monkeypatch):
+    monkeypatch.setattr(fetcher, 'CHUNK_SIZE', 100)
+    resposta = RespostaFalsa(b'<p>' + b'a' * 10_000)
+
+    html = _baixar(resposta, max_bytes=250)
+
+    assert len(html) == 250
+    assert resposta.lidos == 3
+
+
+def test_status_http_de_erro_e_classificado():
+    with pytest.raises(requests.HTTPError) as erro:
+        _baixar(RespostaFalsa(b'', status=404))
+
+    assert classificar_erro(erro.value) == 'http_404'
+
+
+def test_redirect_registra_alias(monkeypatch):
+    registrados = []
+    monkeypatch.setattr(fetcher, 'registrar_alias', lambda origem, destino: registrados.append((origem, destino)))
+    destino = "https://g1.globo.com/politica/noticia/final.ghtml"
+
+    _baixar(RespostaFalsa(b'<p>ok</p>', url=destino, history=[object()]))
+
+    assert registrados == [("https://g1.globo.com/noticia.ghtml", destino)]
@@ -0,0 +1,95 @@
+import pathlib
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from config import Config
+from modules.inference_batcher import DespachanteInferencia, com_micro_lotes
+
+
+class ModeloLento:
+    def __init__(self, duracao=0.02):
+        self.duracao = duracao
+        self.lotes = []
+        self.dimensao = 2
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True):
+        if 'falha' in textos:
+            raise RuntimeError("falhou")
+        self.lotes.append(len(textos))
+        time.sleep(self.duracao)
+        return np.array([[len(t), i] for i, t in enumerate(textos)], dtype=np.float32)
+
+
+def _concorrente(despachante, pedidos):
+    resultados = [None] * len(pedidos)
+    barreira = threading.Barrier(len(pedidos))
+
+    def executar(i):
+        barreira.wait()
+        try:
+            resultados[i] = despachante.encode(pedidos[i])
+        except Exception as e:
+            resultados[i] = e
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(len(pedidos))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return resultados
+
+
+def test_pedidos_concorrentes_viram_poucos_lotes():
+    modelo = ModeloLento()
+    despachante = DespachanteInferencia(modelo, espera_ms=20, max_lote=64)
+    pedidos = [['x' * (i + 1)] * (i % 3 + 1) for i in range(12)]
+
+    resultados = _concorrente(despachante, pedidos)
+
+    for pedido, vetores in zip(pedidos, resultados):
+        assert vetores.shape == (len(pedido), 2)
+        assert (vetores[:, 0] == len(pedido[0])).all()
+    assert sum(modelo.lotes) == sum(len(p) for p in pedidos)
+    assert len(modelo.lotes) < len(pedidos)
+    assert despachante.estatisticas()['pedidos'] == len(pedidos)
+
+
+def test_lote_respeita_maximo_e_texto_unico():
+    modelo = ModeloLento(duracao=0)
+    despachante = DespachanteInferencia(modelo, espera_ms=30, max_lote=4)
+
+    _concorrente(despachante, [['a', 'b', 'c']] * 4)
+
+    assert max(modelo.lotes) <= 6
+    assert despachante.encode('abc').tolist() == [3, 0]
+    assert despachante.dimensao == 2
+
+
+def test_erro_fica_so_com_o_pedido_que_falhou():
+    modelo = ModeloLento(duracao=0)
+    despachante = DespachanteInferencia(modelo, espera_ms=30)
+
+    resultados = _concorrente(despachante, [['falha'], ['ok'], ['tudo', 'bem']])
+
+    assert isinstance(resultados[0], RuntimeError)
+    assert resultados[1].tolist() == [[2, 0]]
+    assert resultados[2].tolist() == [[4, 0], [3, 1]]
+    assert despachante.encode(['ok']).shape == (1, 2)
+
+
+def test_com_micro_lotes_respeita_configuracao(monkeypatch):
+    modelo = ModeloLento()
+    monkeypatch.setattr(Config, 'ENABLE_INFERENCE_BATCHER', False)
+    assert com_micro_lotes(modelo) is modelo
+
+    monkeypatch.setattr(Config, 'ENABLE_INFERENCE_BATCHER', True)
+    envolvido = com_micro_lotes(modelo)
+    assert isinstance(envolvido, DespachanteInferencia)
+    assert com_micro_lotes(envolvido) is envolvido
@@ -0,0 +1,81 @@
+import pathlib
+import sys
+import threading
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.memory_cache import CacheMemoria, tamanho_estimado
+from modules.scraper import ScraperCache
+
+
+def test_lru_por_entradas_e_contadores():
+    cache = CacheMemoria(max_entradas=2, max_bytes=10_000)
+    cache.guardar('a', {'texto': 'A'})
+    cache.guardar('b', {'texto': 'B'})
+    assert cache.obter('a')['texto'] == 'A'
+
+    cache.guardar('c', {'texto': 'C'})
+
+    assert cache.obter('b') is None
+    assert cache.obter('a') is not None
+    assert cache.obter('c') is not None
+    stats = cache.estatisticas()
+    assert (stats['entradas'], stats['acertos'], stats['faltas'], stats['despejos']) == (2, 3, 1, 1)
+
+
+def test_limite_de_bytes_e_item_grande_demais():
+    item = {'texto': 'x' * 1000}
+    cache = CacheMemoria(max_entradas=100, max_bytes=tamanho_estimado(item) * 2 + 10)
+
+    for chave in 'abc':
+        cache.guardar(chave, item)
+    cache.guardar('enorme', {'texto': 'x' * 10_000})
+
+    assert cache.obter('a') is None
+    assert cache.obter('enorme') is None
+    assert cache.estatisticas()['entradas'] == 2
+
+
+def test_expiracao_e_copia_defensiva():
+    cache = CacheMemoria(max_entradas=10, max_bytes=10_000)
+    cache.guardar('a', {'texto': 'original'}, expira_em=100)
+
+    recebido = cache.obter('a', agora=50)
+    recebido['texto'] = 'alterado'
+
+    assert cache.obter('a', agora=99)['texto'] == 'original'
+    assert cache.obter('a', agora=100) is None
+    assert cache.estatisticas()['expirados'] == 1
+
+
+def test_scraper_cache_serve_da_memoria_apos_gravar(tmp_path):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    url = "https://g1.globo.com/politica/x.ghtml"
+    cache.salvar(url, {'url': url, 'titulo': 'T', 'texto': 'corpo ' * 100, 'sucesso': True})
+
+    for arquivo in tmp_path.glob('*.json'):
+        arquivo.unlink()
+
+    assert cache.obter(url)['texto'].startswith('corpo')
+    assert ScraperCache(cache_dir=str(tmp_path)).memoria is cache.memoria
+
+
+def test_acesso_concorrente_mantem_contagem_de_bytes():
+    cache = CacheMemoria(max_entradas=50, max_bytes=50_000)
+
+    def trabalhar(base):
+        for i in range(200):
+            cache.guardar(f"{base}-{i % 70}", {'texto': 'y' * (i % 300)})
+            cache.obter(f"{base}-{(i * 7) % 70}")
+
+    threads = [threading.Thread(target=trabalhar, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.estatisticas()
+    assert stats['entradas'] <= 50
+    assert stats['bytes'] == sum(item[2] for item in cache._itens.values())
@@ -0,0 +1,72 @@
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from config import Config
+from modules import filters, negative_cache
+from modules.filters import ContentFilter
+from modules.negative_cache import CacheNegativo, ttl_falha
+from modules.scraper import ScraperCache
+
+
+URL = "https://g1.globo.com/politica/noticia/2025/10/17/materia-removida.ghtml"
+
+
+def test_ttl_por_classe_de_falha(monkeypatch):
+    monkeypatch.setattr(Config, "NEGATIVE_CACHE_TTL", {
+        'http_404': 100, 'http_4xx': 50, 'http_5xx': 10, 'timeout': 5, 'outro': 1
+    })
+
+    assert ttl_falha('http_404') == 100
+    assert ttl_falha('http_403') == 50
+    assert ttl_falha('http_503') == 10
+    assert ttl_falha('timeout') == 5
+    assert ttl_falha('dns') == 1
+
+
+def test_falha_expira_e_sucesso_limpa_entrada(tmp_path, monkeypatch):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    agora = [1_000_000.0]
+
+    class Relogio:
+        @staticmethod
+        def now():
+            return type("T", (), {"timestamp": lambda self: agora[0]})()
+
+    monkeypatch.setattr(negative_cache, "datetime", Relogio)
+    monkeypatch.setattr(Config, "NEGATIVE_CACHE_TTL", {'http_404': 60, 'outro': 0})
+
+    cache.salvar_falha(URL, {'erro': 'Não foi possível obter HTML', 'classe_falha': 'http_404'})
+    assert cache.obter_falha(URL)['classe_falha'] == 'http_404'
+
+    agora[0] += 61
+    assert cache.obter_falha(URL) is None
+
+    cache.salvar_falha(URL, {'erro': 'x', 'classe_falha': 'http_404'})
+    cache.salvar(URL, {'url': URL, 'sucesso': True, 'texto': 'ok'})
+    assert cache.obter_falha(URL) is None
+
+
+def test_classe_com_ttl_zero_nao_e_guardada(tmp_path, monkeypatch):
+    cache = ScraperCache(cache_dir=str(tmp_path))
+    monkeypatch.setattr(Config, "NEGATIVE_CACHE_TTL", {'http_429': 0, 'outro': 600})
+
+    cache.salvar_falha(URL, {'erro': 'x', 'classe_falha': 'http_429'})
+
+    assert cache.obter_falha(URL) is None
+
+
+def test_filtro_descarta_url_com_falha_recente(tmp_path, monkeypatch):
+    falhas = CacheNegativo(cache_dir=str(tmp_path))
+    monkeypatch.setattr(filters, "obter_cache_negativo", lambda: falhas)
+    filtro = ContentFilter()
+    resultado = {'url': URL, 'title': 'Senado aprova reforma tributária em segundo turno', 'snippet': ''}
+
+    assert filtro._validar_resultado_busca(resultado, 'G1') is True
+
+    ScraperCache(cache_dir=str(tmp_path)).salvar_falha(URL, {'erro': 'x', 'classe_falha': 'http_404'})
+
+    assert filtro._validar_resultado_busca(resultado, 'G1') is False
@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from config import Config
+from modules import parse_pool as pp
+from modules.extractor import ContentExtractor
+
+
+def _dormir(url, html):
+    time.sleep(float(html))
+    return {'url': url, 'sucesso': True, 'pid': os.getpid()}
+
+
+def _quebrar(url, html):
+    raise ValueError("html quebrado")
+
+
+def _morrer_no_worker(url, html):
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return {'url': url, 'sucesso': True, 'local': True}
+
+
+@pytest.fixture
+def pool():
+    pool = pp.ParsePool(workers=2)
+    yield pool
+    pool.encerrar()
+
+
+def test_timeout_mata_so_o_worker_travado(pool, monkeypatch):
+    monkeypatch.setattr(Config, 'ANALYSIS_TIMEOUT', 1)
+    with ThreadPoolExecutor(max_workers=2) as threads:
+        travado = threads.submit(pool._executar, _dormir, 'https://a.com/lento', '30')
+        time.sleep(0.7)
+        rapido = threads.submit(pool._executar, _dormir, 'https://a.com/rapido', '0.6')
+        resultado = travado.result()
+        assert resultado['sucesso'] is False and resultado['classe_falha'] == 'timeout'
+        assert rapido.result()['sucesso'] is True
+
+    assert all(w.processo.is_alive() for w in pool._ativos)
+    assert pool._executar(_dormir, 'https://a.com/x', '0')['sucesso'] is True
+
+
+def test_tempo_na_fila_nao_conta_no_timeout(monkeypatch):
+    monkeypatch.setattr(Config, 'ANALYSIS_TIMEOUT', 1)
+    pool = pp.ParsePool(workers=1)
+    try:
+        pool._executar(_dormir, 'https://a.com/aquecer', '0')
+        with ThreadPoolExecutor(max_workers=3) as threads:
+            resultados = list(threads.map(lambda i: pool._executar(_dormir, f'https://a.com/{i}', '0.6'), range(3)))
+    finally:
+        pool.encerrar()
+
+    assert all(r['sucesso'] for r in resultados)
+
+
+def test_excecao_no_worker_vira_falha_de_extracao(pool):
+    resultado = pool._executar(_quebrar, 'https://a.com/x', '<html></html>')
+
+    assert resultado['sucesso'] is False and resultado['classe_falha'] == 'extracao'
+    assert 'html quebrado' in resultado['erro']
+
+
+def test_worker_morto_usa_extracao_local_e_e_substituido(pool):
+    resultado = pool._executar(_morrer_no_worker, 'https://a.com/x', '')
+
+    assert resultado == {'url': 'https://a.com/x', 'sucesso': True, 'local': True}
+    assert len(pool._ativos) == 2 and all(w.processo.is_alive() for w in pool._ativos)
+
+
+def test_amp_e_baixado_pela_thread(monkeypatch):
+    class PoolFalso:
+        def __init__(self):
+            self.amp = []
+
+        def extrair(self, url, html):
+            return {'url': url, 'sucesso': True, 'texto': 'curto ' * 30, 'amp_url': 'https://a.com/x/amp'}
+
+        def extrair_amp(self, url, html):
+            self.amp.append((url, html))
+            return {'url': url, 'sucesso': True, 'texto': 'longo ' * 120}
+
+    pool_falso = PoolFalso()
+    extrator = ContentExtractor(parse_pool=pool_falso)
+    baixados = []
+    monkeypatch.setattr(extrator, '_obter_html_classificado', lambda url: ('<html></html>', None))
+    monkeypatch.setattr(extrator, '_obter_html', lambda url: baixados.append(url) or '<html>amp</html>')
+
+    resultado = extrator.extract('https://a.com/x')
+
+    assert baixados == ['https://a.com/x/amp']
+    assert pool_falso.amp == [('https://a.com/x/amp', '<html>amp</html>')]
+    assert resultado['url'] == 'https://a.com/x/amp' and 'amp_url' not in resultado
+
+
+def test_worker_nao_baixa_amp(monkeypatch):
+    extrator = ContentExtractor(baixar_amp=False)
+    monkeypatch.setattr(extrator, '_obter_html', lambda url: pytest.fail("download no worker"))
+    html = '<html><head><link rel="amphtml" href="/x/amp"></head><body><p>oi</p></body></html>'
+
+    resultado = extrator._extrair_cascata('https://a.com/x', html)
+
+    assert resultado['amp_url'] == 'https://a.com/x/amp'
+
+
+def test_workers_nao_usam_fork():
+    assert pp._contexto_processos().get_start_method() in ('forkserver', 'spawn')
@@ -0,0 +1,39 @@
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.passages import dividir_passagens, selecionar_passagens
+
+
+def test_junta_paragrafos_curtos_e_quebra_longos():
+    texto = "Primeiro parágrafo.\n\nSegundo.\n" + "Frase longa de teste. " * 20 + "\nFim."
+
+    passagens = dividir_passagens(texto, tamanho=100)
+
+    assert passagens[0].startswith("Primeiro parágrafo. Segundo.")
+    assert all(len(p) <= 100 for p in passagens)
+    assert passagens[-1].endswith("Fim.")
+    assert " ".join(passagens).split() == texto.split()
+
+
+def test_palavra_gigante_e_texto_vazio():
+    assert dividir_passagens("x" * 250, tamanho=100) == ["x" * 100, "x" * 100, "x" * 50]
+    assert dividir_passagens("", tamanho=100) == []
+    assert dividir_passagens(None) == []
+
+
+def test_orcamento_repartido_e_espalhado():
+    escolhidas = selecionar_passagens([20, 3, 0, 1], orcamento=10, por_materia=8)
+
+    assert escolhidas[1:] == [[0, 1, 2], [], [0]]
+    assert len(escolhidas[0]) == 6
+    assert escolhidas[0][0] == 0 and escolhidas[0][-1] == 19
+
+
+def test_toda_materia_recebe_ao_menos_uma_passagem():
+    escolhidas = selecionar_passagens([5, 5, 5], orcamento=1, por_materia=8)
+
+    assert escolhidas == [[0], [0], [0]]
@@ -0,0 +1,85 @@
+import pathlib
+import sys
+
+import pytest
+import requests
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+import modules.retry_policy as retry_policy
+from modules.retry_policy import RetryPolicy, classificar_erro
+
+
+def erro_http(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(f"{status}", response=response)
+
+
+class FuncaoQueFalha:
+    def __init__(self, *erros):
+        self.erros = list(erros)
+        self.chamadas = 0
+
+    def __call__(self):
+        self.chamadas += 1
+        if self.erros:
+            raise self.erros.pop(0)
+        return "<html>ok</html>"
+
+
+@pytest.fixture
+def esperas(monkeypatch):
+    registradas = []
+    monkeypatch.setattr(retry_policy.time, "sleep", registradas.append)
+    return registradas
+
+
+@pytest.mark.parametrize("status", [403, 404, 410])
+def test_erros_4xx_definitivos_nao_sao_repetidos(status, esperas):
+    funcao = FuncaoQueFalha(erro_http(status))
+
+    with pytest.raises(requests.HTTPError):
+        RetryPolicy(max_tentativas=3).executar(funcao)
+
+    assert funcao.chamadas == 1
+    assert esperas == []
+
+
+def test_erro_dns_nao_e_repetido(esperas):
+    erro = requests.ConnectionError("Failed to resolve 'x.invalid' ([Errno -2] Name or service not known)")
+    funcao = FuncaoQueFalha(erro)
+
+    with pytest.raises(requests.ConnectionError):
+        RetryPolicy(max_tentativas=3).executar(funcao)
+
+    assert classificar_erro(erro) == "dns"
+    assert funcao.chamadas == 1
+
+
+def test_429_respeita_retry_after(esperas):
+    funcao = FuncaoQueFalha(erro_http(429, {"Retry-After": "2"}))
+
+    assert RetryPolicy(max_tentativas=3, orcamento=10).executar(funcao) == "<html>ok</html>"
+    assert esperas == [2.0]
+
+
+def test_backoff_exponencial_com_jitter_limitado(esperas):
+    funcao = FuncaoQueFalha(erro_http(503), requests.Timeout(), erro_http(502))
+
+    RetryPolicy(max_tentativas=4, atraso_base=0.5, atraso_max=1.5, orcamento=60).executar(funcao)
+
+    assert funcao.chamadas == 4
+    assert [0 <= e <= teto for e, teto in zip(esperas, [0.5, 1.0, 1.5])] == [True, True, True]
+
+
+def test_nao_espera_alem_do_orcamento(esperas):
+    funcao = FuncaoQueFalha(erro_http(503, {"Retry-After": "30"}))
+
+    with pytest.raises(requests.HTTPError):
+        RetryPolicy(max_tentativas=3, orcamento=5).executar(funcao)
+
+    assert esperas == []
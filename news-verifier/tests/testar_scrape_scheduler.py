@@ -0,0 +1,108 @@
+import pathlib
+import sys
+import threading
+import time
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.scrape_scheduler import ScrapeScheduler, host_da_url
+
+
+def test_host_da_url_normaliza_www_e_esquema():
+    assert host_da_url("https://WWW.G1.Globo.com/politica/x.ghtml") == "g1.globo.com"
+    assert host_da_url("noticias.uol.com.br/x") == "noticias.uol.com.br"
+    assert host_da_url("") == ""
+
+
+def test_respeita_limite_por_host_e_global():
+    scheduler = ScrapeScheduler(max_workers=4, max_por_host=1, limites_host={}, intervalo_host=0)
+    lock = threading.Lock()
+    ativos = {}
+    picos = {}
+
+    def tarefa(host):
+        with lock:
+            ativos[host] = ativos.get(host, 0) + 1
+            picos[host] = max(picos.get(host, 0), ativos[host])
+            picos['total'] = max(picos.get('total', 0), sum(ativos.values()))
+        time.sleep(0.02)
+        with lock:
+            ativos[host] -= 1
+        return host
+
+    try:
+        futuros = [
+            scheduler.submeter(tarefa, host, host=host)
+            for host in ["g1.globo.com", "uol.com.br", "bbc.com"] * 4
+        ]
+        assert [f.result(timeout=5) for f in futuros] == ["g1.globo.com", "uol.com.br", "bbc.com"] * 4
+    finally:
+        scheduler.encerrar()
+
+    assert picos["g1.globo.com"] == 1
+    assert picos["uol.com.br"] == 1
+    assert picos["total"] <= 3
+
+
+def test_prioridade_menor_sai_primeiro():
+    scheduler = ScrapeScheduler(max_workers=1, max_por_host=1, limites_host={}, intervalo_host=0)
+    liberar = threading.Event()
+    ordem = []
+
+    try:
+        bloqueio = scheduler.submeter(liberar.wait, 5)
+        futuros = [
+            scheduler.submeter(ordem.append, nome, prioridade=prioridade)
+            for nome, prioridade in [("terceiro", 2), ("primeiro", 0), ("segundo", 1)]
+        ]
+        liberar.set()
+        bloqueio.result(timeout=5)
+        for futuro in futuros:
+            futuro.result(timeout=5)
+    finally:
+        scheduler.encerrar()
+
+    assert ordem == ["primeiro", "segundo", "terceiro"]
+
+
+def test_excecao_vai_para_o_futuro_e_libera_a_vaga():
+    scheduler = ScrapeScheduler(max_workers=1, max_por_host=1, limites_host={}, intervalo_host=0)
+
+    def falhar():
+        raise ValueError("boom")
+
+    try:
+        erro = scheduler.submeter(falhar, host="g1.globo.com")
+        ok = scheduler.submeter(lambda: "ok", host="g1.globo.com")
+        assert isinstance(erro.exception(timeout=5), ValueError)
+        assert ok.result(timeout=5) == "ok"
+    finally:
+        scheduler.encerrar()
+
+
+def test_intervalo_minimo_so_atrasa_o_mesmo_host():
+    scheduler = ScrapeScheduler(max_workers=4, max_por_host=2, limites_host={}, intervalo_host=0.2)
+    inicios = {}
+    lock = threading.Lock()
+
+    def registrar(nome):
+        with lock:
+            inicios[nome] = time.monotonic()
+
+    try:
+        inicio = time.monotonic()
+        futuros = [
+            scheduler.submeter(registrar, nome, host=host)
+            for nome, host in [("g1_a", "g1.globo.com"), ("uol", "uol.com.br"),
+                               ("bbc", "bbc.com"), ("g1_b", "g1.globo.com")]
+        ]
+        for futuro in futuros:
+            futuro.result(timeout=5)
+    finally:
+        scheduler.encerrar()
+
+    assert inicios["uol"] - inicio < 0.1
+    assert inicios["bbc"] - inicio < 0.1
+    assert inicios["g1_b"] - inicios["g1_a"] >= 0.19
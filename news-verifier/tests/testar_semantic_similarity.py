@@ -0,0 +1,248 @@
+import importlib
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from config import Config
+from modules import embedding_store, evidence_index
+from modules.article_features import ArmazenamentoFeatures
+
+
+class ModeloFalso:
+    VETORES = {
+        'claim': [3.0, 4.0, 0.0],
+        'igual': [6.0, 8.0, 0.0],
+        'ortogonal': [0.0, 0.0, 2.0],
+        'meio': [3.0, 4.0, 5.0],
+    }
+
+    def __init__(self):
+        self.chamadas = []
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True):
+        self.chamadas.append(list(textos))
+        return np.array([self.VETORES[t] for t in textos], dtype=np.float32)
+
+
+@pytest.fixture
+def analisador(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'EMBEDDING_CACHE_DIR', str(tmp_path / 'embeddings'))
+    monkeypatch.setattr(Config, 'ENABLE_ARTICLE_FEATURES', False)
+    monkeypatch.setattr(Config, 'ENABLE_EMBEDDING_CASCADE', False)
+    monkeypatch.setattr(Config, 'EVIDENCE_INDEX_DIR', str(tmp_path / 'evidencias'))
+    monkeypatch.setattr(Config, 'SCRAPE_CACHE_DIR', str(tmp_path / 'scraping'))
+    monkeypatch.setattr(embedding_store, '_armazenamentos', {})
+    monkeypatch.setattr(evidence_index, '_indices', {})
+
+    semantic_analyzer = importlib.import_module('modules.semantic_analyzer')
+    monkeypatch.setattr(semantic_analyzer, 'CACHE_DIR', str(tmp_path / 'embeddings'))
+    modelo = ModeloFalso()
+    monkeypatch.setattr(semantic_analyzer, '_carregar_modelo', lambda nome=None: (modelo, 'falso'))
+    return semantic_analyzer.SemanticAnalyzer()
+
+
+def test_embeddings_normalizados_no_armazenamento(analisador):
+    emb_igual, emb_vazio = analisador._gerar_embeddings_em_lote(['igual', ''])
+
+    np.testing.assert_allclose(emb_igual, [0.6, 0.8, 0.0], atol=1e-6)
+    assert not emb_vazio.any() and emb_vazio.shape == (3,)
+
+    guardado = embedding_store.obter_armazenamento_embeddings('falso').obter(
+        embedding_store.chave_embedding('igual', 'falso')
+    )
+    assert np.linalg.norm(guardado) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_matriz_similaridade_em_uma_codificacao(analisador):
+    matriz = analisador.matriz_similaridade(['claim', 'ortogonal'], ['igual', 'ortogonal', 'meio'])
+
+    np.testing.assert_allclose(matriz, [
+        [1.0, 0.0, 5 / np.sqrt(50)],
+        [0.0, 1.0, 5 / np.sqrt(50)],
+    ], atol=1e-3)
+    assert analisador.model.chamadas == [['claim', 'ortogonal', 'igual', 'meio']]
+
+
+def test_analise_usa_similaridade_vetorizada(analisador):
+    conteudos = {
+        'G1': [{'url': 'a', 'titulo': 'A', 'texto': 'igual', 'sucesso': True, 'erro': None}],
+        'CNN': [{'url': 'b', 'titulo': 'B', 'texto': 'ortogonal', 'sucesso': True, 'erro': None}],
+        'metadata': {}
+    }
+
+    resultado = analisador.analisar_noticias('claim', conteudos)
+
+    assert resultado['G1'][0]['similaridade'] == pytest.approx(1.0, abs=1e-3)
+    assert resultado['CNN'][0]['similaridade'] == pytest.approx(0.0, abs=1e-3)
+    assert resultado['metadata']['niveis_embedding'] == {'pequeno': 0, 'grande': 2}
+
+
+def test_evidencias_locais_entram_na_analise(analisador, monkeypatch):
+    from modules.scraper import ScraperCache
+
+    url = 'https://g1.globo.com/politica/noticia/2025/05/10/igual.ghtml'
+    ScraperCache().salvar(url, {'url': url, 'titulo': 'Igual', 'texto': 'igual', 'sucesso': True})
+    primeira = {
+        'G1': [{'url': url, 'titulo': 'Igual', 'texto': 'igual', 'sucesso': True, 'erro': None}],
+        'metadata': {}
+    }
+    analisador.analisar_noticias('claim', primeira)
+
+    monkeypatch.setattr(Config, 'ENABLE_LOCAL_EVIDENCE', True)
+    assert [e['url'] for e in analisador.buscar_evidencias_locais('claim')] == [url]
+
+    resultado = analisador.analisar_noticias('claim', {'CNN': [], 'metadata': {}})
+
+    assert resultado['metadata']['evidencias_locais'] == 1
+    assert resultado['G1'][0]['origem'] == 'indice_local'
+    assert resultado['G1'][0]['similaridade'] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_pontuacao_por_passagens_em_um_lote(analisador, monkeypatch):
+    monkeypatch.setattr(Config, 'ENABLE_PASSAGE_SCORING', True)
+    monkeypatch.setattr(Config, 'PASSAGE_MAX_CHARS', 10)
+    monkeypatch.setattr(Config, 'ENABLE_EVIDENCE_INDEX', False)
+    conteudos = {
+        'G1': [{'url': 'a', 'titulo': 'A', 'texto': 'ortogonal\n\nigual', 'sucesso': True, 'erro': None}],
+        'CNN': [{'url': 'b', 'titulo': 'B', 'texto': 'meio', 'sucesso': True, 'erro': None}],
+        'metadata': {}
+    }
+
+    resultado = analisador.analisar_noticias('claim', conteudos)
+
+    assert resultado['G1'][0]['similaridade'] == pytest.approx(1.0, abs=1e-3)
+    assert resultado['G1'][0]['trechos_relevantes'] == ['igual', 'ortogonal']
+    assert resultado['CNN'][0]['similaridade'] == pytest.approx(5 / np.sqrt(50), abs=1e-3)
+    assert analisador.model.chamadas == [['claim', 'ortogonal', 'igual', 'meio']]
+
+
+class ModeloCascata:
+    def __init__(self, vetores):
+        self.vetores = vetores
+        self.chamadas = []
+
+    def encode(self, textos, batch_size=32, convert_to_numpy=True):
+        self.chamadas.append(list(textos))
+        return np.array([self.vetores[t] for t in textos], dtype=np.float32)
+
+
+def test_cascada_decide_nas_pontas_e_repontua_a_faixa_incerta(analisador, monkeypatch):
+    semantic_analyzer = importlib.import_module('modules.semantic_analyzer')
+    pequeno = ModeloCascata({
+        'claim': [1.0, 0.0], 'longe': [0.0, 1.0], 'perto': [0.95, 0.05], 'incerto': [0.6, 0.8]
+    })
+    grande = ModeloCascata({'claim': [3.0, 4.0, 0.0], 'incerto': [3.0, 4.0, 5.0]})
+    modelos = {Config.CASCADE_SMALL_MODEL: (pequeno, 'pequeno')}
+    monkeypatch.setattr(semantic_analyzer, '_carregar_modelo', lambda nome=None: modelos.get(nome, (grande, 'grande')))
+    monkeypatch.setattr(Config, 'ENABLE_EMBEDDING_CASCADE', True)
+    monkeypatch.setattr(Config, 'CASCADE_SMALL_LOW', 0.2)
+    monkeypatch.setattr(Config, 'CASCADE_SMALL_HIGH', 0.9)
+    monkeypatch.setattr(Config, 'ENABLE_EVIDENCE_INDEX', False)
+    conteudos = {
+        'G1': [{'url': u, 'titulo': u, 'texto': u, 'sucesso': True, 'erro': None} for u in ('longe', 'perto', 'incerto')],
+        'metadata': {}
+    }
+
+    resultado = semantic_analyzer.SemanticAnalyzer().analisar_noticias('claim', conteudos)
+
+    longe, perto, incerto = resultado['G1']
+    assert (longe['nivel_embedding'], longe['status']) == ('pequeno', 'nao_relacionado')
+    assert longe['similaridade'] < Config.SIMILARITY_THRESHOLD_LOW
+    assert (perto['nivel_embedding'], perto['status']) == ('pequeno', 'confirma_forte')
+    assert perto['similaridade'] >= Config.SIMILARITY_THRESHOLD_HIGH
+    assert incerto['nivel_embedding'] == 'grande'
+    assert incerto['similaridade'] == pytest.approx(5 / np.sqrt(50), abs=1e-3)
+    assert grande.chamadas == [['incerto', 'claim']]
+    assert resultado['metadata']['niveis_embedding'] == {'pequeno': 2, 'grande': 1}
+
+
+def test_passagens_tem_precedencia_e_nao_carregam_o_modelo_pequeno(analisador, monkeypatch):
+    semantic_analyzer = importlib.import_module('modules.semantic_analyzer')
+    carregados = []
+    monkeypatch.setattr(semantic_analyzer, '_carregar_modelo',
+                        lambda nome=None: carregados.append(nome) or (ModeloFalso(), 'falso'))
+    monkeypatch.setattr(Config, 'ENABLE_EMBEDDING_CASCADE', True)
+    monkeypatch.setattr(Config, 'ENABLE_PASSAGE_SCORING', True)
+
+    assert semantic_analyzer.SemanticAnalyzer().cascata is False
+    assert carregados == [None]
+
+
+def test_materias_decididas_pelo_pequeno_entram_no_indice_em_segundo_plano(analisador, monkeypatch):
+    semantic_analyzer = importlib.import_module('modules.semantic_analyzer')
+    pequeno = ModeloCascata({'claim': [1.0, 0.0], 'longe': [0.0, 1.0], 'incerto': [0.6, 0.8]})
+    grande = ModeloCascata({'claim': [3.0, 4.0, 0.0], 'longe': [0.0, 0.0, 2.0], 'incerto': [3.0, 4.0, 5.0]})
+    monkeypatch.setattr(semantic_analyzer, '_carregar_modelo',
+                        lambda nome=None: (pequeno, 'pequeno') if nome == Config.CASCADE_SMALL_MODEL else (grande, 'grande'))
+    monkeypatch.setattr(Config, 'ENABLE_EMBEDDING_CASCADE', True)
+    agendadas = []
+
+    class AgendadorFalso:
+        def submeter(self, funcao, *args, prioridade=0, **kwargs):
+            agendadas.append(prioridade)
+            return funcao(*args, **kwargs)
+
+    monkeypatch.setattr(semantic_analyzer, 'obter_scrape_scheduler', AgendadorFalso)
+    conteudos = {
+        'G1': [{'url': f'https://g1.globo.com/{u}', 'titulo': u, 'texto': u, 'sucesso': True, 'erro': None}
+               for u in ('longe', 'incerto')],
+        'metadata': {}
+    }
+
+    semantic_analyzer.SemanticAnalyzer().analisar_noticias('claim', conteudos)
+
+    assert agendadas == [Config.CACHE_REFRESH_PRIORITY]
+    assert grande.chamadas[-1] == ['longe']
+    assert len(evidence_index.obter_indice_evidencias('grande')) == 2
+
+
+def test_analise_codifica_todas_as_materias_num_unico_encode(analisador):
+    conteudos = {
+        'G1': [
+            {'url': 'a', 'titulo': 'A', 'texto': 'igual', 'sucesso': True, 'erro': None},
+            {'url': 'b', 'titulo': 'B', 'texto': 'meio', 'sucesso': True, 'erro': None},
+            {'url': 'c', 'titulo': 'C', 'texto': None, 'sucesso': False, 'erro': 'timeout'},
+        ],
+        'CNN': [
+            {'url': 'd', 'titulo': 'D', 'texto': 'ortogonal', 'sucesso': True, 'erro': None},
+            {'url': 'e', 'titulo': 'E', 'texto': 'igual', 'sucesso': True, 'erro': None},
+        ],
+        'metadata': {}
+    }
+
+    primeira = analisador.analisar_noticias('claim', conteudos)
+
+    assert analisador.model.chamadas == [['igual', 'meio', 'ortogonal', 'claim']]
+    assert [a['status'] for a in primeira['G1']][-1] == 'erro_extracao'
+    assert primeira['CNN'][1]['similaridade'] == pytest.approx(1.0, abs=1e-3)
+
+    analisador.analisar_noticias('claim', conteudos)
+
+    assert len(analisador.model.chamadas) == 1
+
+
+def test_registro_guarda_referencia_e_le_o_vetor_do_armazenamento(analisador, monkeypatch, tmp_path):
+    semantic_analyzer = importlib.import_module('modules.semantic_analyzer')
+    monkeypatch.setattr(Config, 'ENABLE_ARTICLE_FEATURES', True)
+    registros = ArmazenamentoFeatures(str(tmp_path / 'features'))
+    monkeypatch.setattr(semantic_analyzer, 'obter_armazenamento_features', lambda: registros)
+    chave, _ = registros.calcular_se_ausente('igual')
+
+    primeiro, _ = analisador._features_e_embeddings_em_lote(['igual'])
+    registro = registros.obter(chave)
+    gravacoes = []
+    monkeypatch.setattr(registros, 'guardar', lambda *args: gravacoes.append(args))
+    segundo, _ = analisador._features_e_embeddings_em_lote(['igual'])
+
+    assert registro['embedding'] == {
+        'modelo': 'falso', 'chave': embedding_store.chave_embedding('igual', 'falso').hex()
+    }
+    np.testing.assert_allclose(segundo[0][1], primeiro[0][1], atol=1e-3)
+    assert analisador.model.chamadas == [['igual']]
+    assert gravacoes == []
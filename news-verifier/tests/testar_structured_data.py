@@ -0,0 +1,66 @@
+import json
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.structured_data import extrair_dados_estruturados, resultado_estruturado
+
+
+CORPO = " ".join(f"Frase {i} do corpo completo da reportagem publicada pelo jornal." for i in range(20))
+
+
+def montar_html(json_ld, metas=""):
+    return f"""<html><head>{metas}
+    <script type="application/ld+json">{json.dumps(json_ld, ensure_ascii=False)}</script>
+    </head><body><div class="paywall">Assine para continuar lendo</div></body></html>"""
+
+
+def test_le_news_article_dentro_de_graph():
+    html = montar_html({
+        "@context": "https://schema.org",
+        "@graph": [
+            {"@type": "WebSite", "name": "Folha"},
+            {
+                "@type": ["NewsArticle"],
+                "headline": "Governo anuncia reajuste do salário mínimo",
+                "datePublished": "2025-10-17T09:30:00-03:00",
+                "author": [{"@type": "Person", "name": "Maria Silva"}],
+                "articleBody": CORPO,
+                "isAccessibleForFree": "False",
+            },
+        ],
+    })
+
+    resultado = resultado_estruturado("https://www1.folha.uol.com.br/mercado/2025/10/x.shtml", html)
+
+    assert resultado["metodo_extracao"] == "json_ld"
+    assert resultado["titulo"] == "Governo anuncia reajuste do salário mínimo"
+    assert resultado["data_publicacao"] == "2025-10-17"
+    assert resultado["autor"] == "Maria Silva"
+    assert resultado["texto"].startswith("Frase 0")
+
+
+def test_sem_article_body_usa_opengraph_como_descricao():
+    html = montar_html(
+        {"@type": "NewsArticle", "headline": "Título &amp; notícia"},
+        metas='<meta property="og:description" content="Resumo da matéria vindo do OpenGraph">',
+    )
+
+    dados = extrair_dados_estruturados(html)
+
+    assert dados["titulo"] == "Título & notícia"
+    assert dados["texto"] is None
+    assert dados["descricao"] == "Resumo da matéria vindo do OpenGraph"
+    assert resultado_estruturado("https://www.estadao.com.br/x", html) is None
+
+
+def test_json_ld_invalido_e_ignorado():
+    html = '<script type="application/ld+json">{quebrado</script><meta name="description" content="Descrição">'
+
+    dados = extrair_dados_estruturados(html)
+
+    assert dados["titulo"] is None
+    assert dados["descricao"] == "Descrição"
@@ -0,0 +1,102 @@
+import pathlib
+import sys
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from modules.url_canonical import RegistroAliases, canonicalizar_url, canonico_do_html, dominio_base
+
+
+G1 = "https://g1.globo.com/politica/noticia/2025/10/17/senado-aprova-reforma.ghtml"
+
+
+def test_variantes_da_mesma_materia_tem_a_mesma_forma_canonica():
+    variantes = [
+        G1,
+        G1 + "?utm_source=twitter&utm_medium=social&fbclid=abc",
+        G1.replace("https://", "http://www."),
+        G1 + "/",
+        G1 + "#comentarios",
+        "https://g1.globo.com/google/amp/politica/noticia/2025/10/17/senado-aprova-reforma.ghtml",
+        "https://g1-globo-com.cdn.ampproject.org/c/s/g1.globo.com/politica/noticia/2025/10/17/senado-aprova-reforma.ghtml",
+        "https://www.google.com/url?q=" + G1 + "&sa=U&ved=xyz",
+    ]
+
+    assert {canonicalizar_url(v) for v in variantes} == {G1}
+
+
+def test_mantem_parametros_relevantes_em_ordem():
+    url = "https://www.estadao.com.br/busca?q=reforma&page=2&utm_campaign=x"
+
+    assert canonicalizar_url(url) == "https://estadao.com.br/busca?page=2&q=reforma"
+
+
+def test_sufixo_amp_e_dominio_base():
+    assert canonicalizar_url("https://www.cnnbrasil.com.br/politica/materia.amp.html") == \
+        "https://cnnbrasil.com.br/politica/materia.html"
+    assert dominio_base("www1.folha.uol.com.br") == "uol.com.br"
+    assert dominio_base("g1.globo.com") == "globo.com"
+
+
+def test_canonico_do_html_relativo():
+    html = '<html><head><link href="/politica/noticia/x.ghtml" rel="canonical"></head>'
+
+    assert canonico_do_html(html, "https://g1.globo.com/amp/x") == "https://g1.globo.com/politica/noticia/x.ghtml"
+
+
+def test_registro_segue_alias_e_recusa_outro_site_ou_home(tmp_path):
+    registro = RegistroAliases(arquivo=str(tmp_path / "aliases.json"), max_itens=10)
+    curta = "https://glo.bo/3abc"
+
+    assert registro.registrar("https://g1.globo.com/r/3abc", G1) is True
+    assert registro.registrar(curta, G1) is False
+    assert registro.registrar("https://g1.globo.com/politica/noticia/removida.ghtml", "https://g1.globo.com/") is False
+    assert registro.resolver(canonicalizar_url("https://g1.globo.com/r/3abc")) == G1
+
+    registro.salvar()
+    recarregado = RegistroAliases(arquivo=str(tmp_path / "aliases.json"))
+    assert recarregado.resolver("https://g1.globo.com/r/3abc") == G1
+
+
+def test_gravacoes_de_dois_processos_se_somam(tmp_path):
+    arquivo = str(tmp_path / "aliases.json")
+    primeiro = RegistroAliases(arquivo=arquivo, max_itens=10)
+    segundo = RegistroAliases(arquivo=arquivo, max_itens=10)
+    outra = "https://g1.globo.com/economia/noticia/2025/10/17/outra-materia.ghtml"
+
+    primeiro.registrar("https://g1.globo.com/r/3abc", G1)
+    segundo.registrar("https://g1.globo.com/r/9xyz", outra)
+    primeiro.salvar()
+    segundo.salvar()
+
+    recarregado = RegistroAliases(arquivo=arquivo)
+    assert recarregado.resolver("https://g1.globo.com/r/3abc") == G1
+    assert recarregado.resolver("https://g1.globo.com/r/9xyz") == outra
+    assert segundo.resolver("https://g1.globo.com/r/3abc") == G1
+
+
+def test_filtro_descarta_variante_da_mesma_materia():
+    from modules.filters import ContentFilter
+
+    titulo = "Senado aprova reforma tributária em segundo turno"
+    resultados = {
+        'G1': [{'url': G1, 'title': titulo, 'snippet': ''}],
+        'Agregador': [{'url': G1 + "?utm_source=agregador", 'title': titulo, 'snippet': ''}],
+        'metadata': {},
+    }
+
+    filtrados = ContentFilter().filtrar_resultados_busca(resultados)
+
+    assert len(filtrados['G1']) == 1
+    assert filtrados['Agregador'] == []
+    assert filtrados['metadata']['total_filtrados'] == 1
+
+
+def test_filtros_nao_importam_o_scraper():
+    import subprocess
+
+    codigo = "import sys; import modules.filters; print('modules.scraper' in sys.modules)"
+    saida = subprocess.run([sys.executable, '-c', codigo], cwd=str(ROOT_DIR), capture_output=True, text=True)
+
+    assert saida.stdout.strip().splitlines()[-1] == 'False'